@@ -0,0 +1,99 @@
+#!/usr/bin/env python
+"""
+Benchmark: native date normalizer vs. dateutil.
+
+Times DateExtractor.normalize_date() against calling dateutil directly on
+the same date-dense input, and checks both give identical results.
+
+    cold  — memo cache cleared before every round (pure parsing speed)
+    warm  — memo cache left in place (repeated strings, as in real text)
+
+Run from the repo root:
+    python benchmarks/bench_normalize.py [number_of_dates]
+"""
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import dateExtractor
+from dateExtractor import DateExtractor
+
+MONTHS = ['Jan', 'February', 'MAR', 'April', 'may', 'June', 'Jul', 'August', 'Sept', 'October', 'Nov', 'December']
+
+
+def make_dates(n, seed=42):
+    """Date strings in every shape date_patterns produces"""
+    rng = random.Random(seed)
+    out = []
+    for _ in range(n):
+        y, m, d = rng.randint(1990, 2030), rng.randint(1, 12), rng.randint(1, 28)
+        month = MONTHS[m - 1]
+        out.append(rng.choice([
+            f"{m:02d}/{d:02d}/{y}",
+            f"{d}/{m}/{y % 100:02d}",
+            f"{y}-{m:02d}-{d:02d}",
+            f"{month} {d}, {y}",
+            f"{d} {month} {y}",
+            f"{d}th of {month} {y}",
+        ]))
+    return out
+
+
+def dateutil_normalize(date_str):
+    try:
+        return dateExtractor.date_parser.parse(date_str, fuzzy=False).strftime('%Y-%m-%d')
+    except (ValueError, OverflowError, TypeError):
+        return None
+
+
+def best_of(rounds, fn):
+    best = float('inf')
+    for _ in range(rounds):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    if not dateExtractor.DATEUTIL_AVAILABLE:
+        print("dateutil is not installed — nothing to compare against")
+        sys.exit(1)
+
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    dates = make_dates(n)
+    extractor = DateExtractor()
+
+    mismatches = [d for d in dates if extractor.normalize_date(d) != dateutil_normalize(d)]
+    if mismatches:
+        print(f"{len(mismatches)} results differ from dateutil, e.g. {mismatches[:5]}")
+        sys.exit(1)
+
+    def run_dateutil():
+        for d in dates:
+            dateutil_normalize(d)
+
+    def run_native_cold():
+        dateExtractor._normalize_date.cache_clear()
+        for d in dates:
+            extractor.normalize_date(d)
+
+    def run_native_warm():
+        for d in dates:
+            extractor.normalize_date(d)
+
+    t_dateutil = best_of(3, run_dateutil)
+    t_cold = best_of(3, run_native_cold)
+    t_warm = best_of(3, run_native_warm)
+
+    print(f"{n} dates, {len(set(dates))} distinct")
+    print(f"  dateutil      : {t_dateutil * 1000:8.1f} ms  ({n / t_dateutil:10.0f} dates/s)")
+    print(f"  native (cold) : {t_cold * 1000:8.1f} ms  ({n / t_cold:10.0f} dates/s)  {t_dateutil / t_cold:5.1f}x")
+    print(f"  native (warm) : {t_warm * 1000:8.1f} ms  ({n / t_warm:10.0f} dates/s)  {t_dateutil / t_warm:5.1f}x")
+
+
+if __name__ == "__main__":
+    main()
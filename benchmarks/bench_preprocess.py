@@ -0,0 +1,103 @@
+#!/usr/bin/env python
+"""
+Benchmark: image preprocessing before OCR — latency vs. accuracy.
+
+Each image is OCR'd as is, then once per preprocessing spec. For every run
+it reports the pixels Tesseract saw, the time spent (preprocessing + OCR),
+and how much of the unprocessed result survived:
+
+    words  — share of the baseline's words also found (case-insensitive)
+    dates  — share of the baseline's dates also found
+    extra  — dates found that the baseline missed
+
+No OCR cache is used, so every round really runs Tesseract.
+
+Run from the repo root (needs Tesseract):
+    python benchmarks/bench_preprocess.py [image ...] [--rounds N] [--backend auto|tesserocr|subprocess]
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+import dateExtractor
+from dateExtractor import DateExtractor
+from imagePreprocess import Preprocessor
+
+DEFAULT_IMAGES = [ROOT / 'data_for_timely_page-0001.jpg', ROOT / 'changed_colour.png']
+
+SPECS = [
+    'gray',
+    'gray,max=2000',
+    'gray,max=1400',
+    'gray,max=1000',
+    'gray,dpi=300',
+    'gray,crop',
+    'gray,binarize',
+    'gray,max=1400,crop,binarize',
+]
+
+
+def run(extractor, image_path, rounds):
+    """Best OCR time over the rounds, plus the words and dates of the last run"""
+    best = float('inf')
+    ocr = None
+    for _ in range(rounds):
+        start = time.perf_counter()
+        ocr = extractor.run_ocr(image_path)
+        best = min(best, time.perf_counter() - start)
+    if ocr is None:
+        return best, set(), []
+    words = {w['text'].lower() for w in ocr.words}
+    text = ocr.text_by_fontsize() or ocr.plain_text()
+    return best, words, extractor.extract_dates_from_text(text)
+
+
+def pixels(image_path, preprocessor):
+    with dateExtractor.Image.open(image_path) as image:
+        if preprocessor is not None:
+            image = preprocessor.apply(image)
+        return image.width * image.height
+
+
+def share(found, expected):
+    if not expected:
+        return 1.0
+    return len(set(found) & set(expected)) / len(set(expected))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('images', nargs='*', type=Path, default=DEFAULT_IMAGES)
+    parser.add_argument('--rounds', type=int, default=3)
+    parser.add_argument('--backend', default='auto')
+    args = parser.parse_args()
+
+    if not dateExtractor.OCR_AVAILABLE or dateExtractor.tesseract_version() == 'unknown':
+        print("Tesseract is not available — nothing to benchmark")
+        sys.exit(1)
+
+    baseline_extractor = DateExtractor(output_file=None, ocr_backend=args.backend)
+    print(f"OCR backend: {baseline_extractor.ocr_engine.name} ({baseline_extractor.ocr_engine.version()})")
+
+    for image_path in args.images:
+        base_time, base_words, base_dates = run(baseline_extractor, image_path, args.rounds)
+        base_pixels = pixels(image_path, None)
+        print(f"\n{image_path.name}: {base_pixels / 1e6:.2f} MP, {len(base_words)} words, dates {base_dates}")
+        print(f"  {'spec':<30} {'MP':>6} {'ms':>8} {'speedup':>8} {'words':>6} {'dates':>6}  extra")
+        print(f"  {'(none)':<30} {base_pixels / 1e6:6.2f} {base_time * 1000:8.0f} {1.0:7.2f}x {1.0:6.0%} {1.0:6.0%}")
+
+        for spec in SPECS:
+            extractor = DateExtractor(output_file=None, ocr_backend=args.backend, preprocess=spec)
+            t, words, dates = run(extractor, image_path, args.rounds)
+            extra = sorted(set(dates) - set(base_dates))
+            print(f"  {spec:<30} {pixels(image_path, Preprocessor.from_spec(spec)) / 1e6:6.2f} "
+                  f"{t * 1000:8.0f} {base_time / t:7.2f}x {share(words, base_words):6.0%} "
+                  f"{share(dates, base_dates):6.0%}  {', '.join(extra)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+#!/usr/bin/env python
+"""
+Benchmark: interpreter start-up and import time.
+
+main.py is run from cron many times a day, so most of what a short run
+costs is importing things. This runs `python -X importtime` in a fresh
+process for each target several times and reports:
+
+    import ms   median cumulative import time of the target module
+    run ms      median wall time of the whole process (start-up included)
+    heavy       optional backends (PIL, PyPDF2, dateutil, ...) that got
+                imported; these should only load when a file needs them
+
+and the modules that took longest in the last run. Bytecode is compiled
+first, so a stale __pycache__ doesn't count as start-up time.
+
+Exits 1 if a heavy backend is imported at start-up or, with --max-ms,
+if `import main` takes longer than that.
+
+Run from the repo root:
+    python benchmarks/bench_startup.py [--runs N] [--top N] [--max-ms MS]
+"""
+import argparse
+import compileall
+import os
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# Importing any of these must not create or change files: bot.py opens its
+# SQLite stores (and migrates saved_dates.json) in main(), not on import
+TARGETS = ['dateExtractor', 'main', 'bot', 'service']
+
+# Imported lazily by dateExtractor; none of these should appear at start-up
+HEAVY = ['PIL', 'pytesseract', 'PyPDF2', 'pdf2image', 'tesserocr', 'dateutil', 'email.policy']
+
+
+def parse_importtime(stderr):
+    """[(module, self_us, cumulative_us, depth)] from -X importtime output"""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        depth = (len(name) - len(name.lstrip(' '))) // 2
+        rows.append((name.strip(), int(self_us), int(cumulative_us), depth))
+    return rows
+
+
+def run_target(target):
+    """(rows, wall seconds) for one fresh `python -X importtime -c 'import target'`"""
+    env = dict(os.environ)
+    env.pop('PYTHONDONTWRITEBYTECODE', None)
+    start = time.perf_counter()
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {target}'],
+                            cwd=ROOT, env=env, capture_output=True, text=True)
+    wall = time.perf_counter() - start
+    if result.returncode != 0:
+        return None, wall
+    return parse_importtime(result.stderr), wall
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('targets', nargs='*', default=TARGETS, help=f"modules to import (default: {' '.join(TARGETS)})")
+    parser.add_argument('--runs', type=int, default=7, help="fresh processes per target (default: 7)")
+    parser.add_argument('--top', type=int, default=10, help="slowest imports to list per target (default: 10)")
+    parser.add_argument('--max-ms', type=float, help="fail if `import main` takes longer than this (median)")
+    args = parser.parse_args()
+
+    compileall.compile_dir(str(ROOT), quiet=1, maxlevels=0)
+
+    failed = False
+    print(f"{'target':<16} {'import ms':>10} {'run ms':>8}  heavy")
+    slowest = {}
+    for target in args.targets:
+        imports = []
+        walls = []
+        rows = None
+        for _ in range(args.runs):
+            rows, wall = run_target(target)
+            if rows is None:
+                break
+            imports.append(next(cum for name, _, cum, depth in rows if name == target and depth == 0))
+            walls.append(wall)
+        if rows is None:
+            print(f"{target:<16} {'-':>10} {'-':>8}  (import failed; missing dependency?)")
+            continue
+
+        loaded = {name for name, _, _, _ in rows}
+        heavy = [module for module in HEAVY if module in loaded]
+        import_ms = statistics.median(imports) / 1000
+        print(f"{target:<16} {import_ms:10.1f} {statistics.median(walls) * 1000:8.1f}  {', '.join(heavy) or '-'}")
+        slowest[target] = sorted((r for r in rows if r[0] != target), key=lambda r: -r[2])[:args.top]
+        if heavy:
+            failed = True
+        if args.max_ms is not None and target == 'main' and import_ms > args.max_ms:
+            print(f"  `import main` took {import_ms:.1f} ms, more than --max-ms {args.max_ms:g}")
+            failed = True
+
+    for target, rows in slowest.items():
+        print(f"\nSlowest imports under {target} (cumulative ms, last run):")
+        for name, self_us, cumulative_us, depth in rows:
+            print(f"  {cumulative_us / 1000:8.1f}  {'  ' * depth}{name}")
+
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,256 @@
+#!/usr/bin/env python
+"""
+Benchmark suite for the extraction hot paths.
+
+Cases:
+    corpus/*      extract_dates_from_text over date_corpus.json (also checked for correctness)
+    text/*        extract_dates_from_text on synthetic text (1 KB – 1 MB, no / sparse / dense dates)
+    messages/*    many short strings: a loop over extract_dates_from_text vs. extract_dates_batch
+    normalize     normalize_date, memo cache cleared before every round
+    multiday      expand_multiday_dates
+    dash_range    expand_daterange_with_dash
+    pdf/*         extract_from_pdf on generated PDFs (needs PyPDF2)
+    ocr/*         run_ocr on the bundled images, no OCR cache (needs Tesseract)
+
+For each case it reports latency percentiles per call, throughput (MB/s of
+input, dates/s of output) and peak traced memory of one call.
+
+Baselines:
+    python benchmarks/bench_suite.py --save           # on main: write benchmarks/baselines.json
+    python benchmarks/bench_suite.py --compare        # on a branch: exit 1 if any case's
+                                                      # median got slower than --threshold
+Baselines only mean something on the machine that recorded them, so the
+file isn't committed.
+
+Run from the repo root:
+    python benchmarks/bench_suite.py [--quick] [--only PREFIX] [--save | --compare] [--threshold 0.25]
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+HERE = Path(__file__).resolve().parent
+sys.path.insert(0, str(HERE.parent))
+
+import dateExtractor
+from dateExtractor import DateExtractor
+import synthetic
+
+CORPUS_FILE = HERE.parent / 'tests' / 'date_corpus.json'
+BASELINE_FILE = HERE / 'baselines.json'
+IMAGES = [HERE.parent / 'data_for_timely_page-0001.jpg', HERE.parent / 'changed_colour.png']
+
+TEXT_SIZES = [('1KB', 1024), ('64KB', 64 * 1024), ('1MB', 1024 * 1024)]
+TEXT_DENSITIES = [('none', 0), ('sparse', 200), ('dense', 8)]
+
+
+class Case:
+    """
+    One benchmark: fn(item) is called once per item in each round.
+    nbytes is the input size of one round (for MB/s).
+    """
+    def __init__(self, name, fn, items, nbytes=0, rounds=5):
+        self.name = name
+        self.fn = fn
+        self.items = items
+        self.nbytes = nbytes
+        self.rounds = rounds
+        self.setup = None   # called before every round (e.g. to clear a cache)
+
+
+def quiet(fn):
+    """fn with its progress prints swallowed"""
+    def call(item):
+        with contextlib.redirect_stdout(io.StringIO()):
+            return fn(item)
+    return call
+
+
+def run_case(case):
+    latencies = []
+    round_times = []
+    dates = 0
+    for _ in range(case.rounds):
+        if case.setup:
+            case.setup()
+        dates = 0
+        round_start = time.perf_counter()
+        for item in case.items:
+            start = time.perf_counter()
+            result = case.fn(item)
+            latencies.append(time.perf_counter() - start)
+            dates += len(result) if result else 0
+        round_times.append(time.perf_counter() - round_start)
+
+    # Peak memory of a single call, measured separately so tracing doesn't skew the timings
+    if case.setup:
+        case.setup()
+    tracemalloc.start()
+    case.fn(case.items[0])
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    best_round = min(round_times)
+    quantiles = statistics.quantiles(latencies, n=100) if len(latencies) > 1 else latencies * 99
+    return {
+        'calls': len(latencies),
+        'p50_ms': statistics.median(latencies) * 1000,
+        'p90_ms': quantiles[89] * 1000,
+        'p99_ms': quantiles[98] * 1000,
+        'mb_per_s': case.nbytes / best_round / 1e6 if case.nbytes else None,
+        'dates_per_s': dates / best_round,
+        'peak_kb': peak / 1024,
+    }
+
+
+def build_cases(quick, workdir):
+    extractor = DateExtractor(output_file=None)
+    cases = []
+
+    with open(CORPUS_FILE, 'r', encoding='utf-8') as f:
+        corpus = json.load(f)
+    texts = [c['text'] for c in corpus]
+    cases.append(Case('corpus/all', extractor.extract_dates_from_text, texts,
+                      nbytes=sum(len(t.encode('utf-8')) for t in texts), rounds=20))
+
+    for size_name, size in TEXT_SIZES:
+        if quick and size > 64 * 1024:
+            continue
+        for density_name, density in TEXT_DENSITIES:
+            text = synthetic.make_text(size, density)
+            repeats = max(1, (256 * 1024) // size)
+            case = Case(f'text/{size_name}/{density_name}', extractor.extract_dates_from_text,
+                        [text] * repeats, nbytes=len(text.encode('utf-8')) * repeats,
+                        rounds=3 if size >= 1024 * 1024 else 5)
+            case.setup = dateExtractor._normalize_date.cache_clear
+            cases.append(case)
+
+    messages = synthetic.make_messages(5000 if quick else 50000)
+    nbytes = sum(len(m.encode('utf-8')) for m in messages)
+    for name, fn in (('messages/loop', lambda ms: [d for m in ms for d in extractor.extract_dates_from_text(m)]),
+                     ('messages/batch', lambda ms: [d for ds in extractor.extract_dates_batch(ms) for d in ds])):
+        case = Case(name, fn, [messages], nbytes=nbytes, rounds=3)
+        case.setup = dateExtractor._normalize_date.cache_clear
+        cases.append(case)
+
+    n = 2000 if quick else 20000
+    dates = synthetic.make_dates(n)
+    case = Case('normalize', lambda d: [extractor.normalize_date(d)], dates,
+                nbytes=sum(len(d) for d in dates))
+    case.setup = dateExtractor._normalize_date.cache_clear
+    cases.append(case)
+
+    multiday = synthetic.make_multiday(n // 4)
+    cases.append(Case('multiday', extractor.expand_multiday_dates, multiday,
+                      nbytes=sum(len(s) for s in multiday)))
+    ranges = synthetic.make_dash_ranges(n // 4)
+    cases.append(Case('dash_range', extractor.expand_daterange_with_dash, ranges,
+                      nbytes=sum(len(s) for s in ranges)))
+
+    if dateExtractor.PDF_AVAILABLE:
+        for pages in ([10] if quick else [10, 100]):
+            path = os.path.join(workdir, f'synthetic_{pages}.pdf')
+            page_texts = [synthetic.make_text(1500, 40, seed=page).replace('\n', ' ') for page in range(pages)]
+            synthetic.make_pdf(path, page_texts)
+            cases.append(Case(f'pdf/{pages}pages', quiet(extractor.extract_from_pdf), [path],
+                              nbytes=os.path.getsize(path), rounds=3))
+
+    if dateExtractor.OCR_AVAILABLE and dateExtractor.tesseract_version() != 'unknown':
+        for image in IMAGES:
+            if image.exists():
+                cases.append(Case(f'ocr/{image.stem}', lambda p: extractor.run_ocr(p).words, [image],
+                                  nbytes=image.stat().st_size, rounds=1 if quick else 3))
+    return cases
+
+
+def check_corpus():
+    """The benchmarks are only meaningful if the output is still right"""
+    with open(CORPUS_FILE, 'r', encoding='utf-8') as f:
+        corpus = json.load(f)
+    extractor = DateExtractor(output_file=None)
+    return [c['text'] for c in corpus if extractor.extract_dates_from_text(c['text']) != c['expected']]
+
+
+def format_row(name, r):
+    mb = f"{r['mb_per_s']:8.2f}" if r['mb_per_s'] is not None else ' ' * 8
+    return (f"{name:<24} {r['calls']:>6} {r['p50_ms']:9.3f} {r['p90_ms']:9.3f} {r['p99_ms']:9.3f} "
+            f"{mb} {r['dates_per_s']:11.0f} {r['peak_kb']:9.1f}")
+
+
+def compare(results, baseline, threshold):
+    """Names of cases whose median latency is more than threshold slower than the baseline"""
+    regressions = []
+    print(f"\nAgainst baseline ({baseline['recorded']}, {baseline['machine']}), threshold {threshold:.0%}:")
+    for name, r in results.items():
+        base = baseline['results'].get(name)
+        if base is None:
+            print(f"  {name:<24} (new case)")
+            continue
+        change = r['p50_ms'] / base['p50_ms'] - 1 if base['p50_ms'] else 0.0
+        flag = 'REGRESSION' if change > threshold else ''
+        print(f"  {name:<24} {base['p50_ms']:9.3f} → {r['p50_ms']:9.3f} ms  {change:+7.1%}  {flag}")
+        if flag:
+            regressions.append(name)
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--quick', action='store_true', help="smaller inputs, fewer rounds")
+    parser.add_argument('--only', help="only run cases whose name starts with this")
+    parser.add_argument('--save', action='store_true', help=f"save results as the baseline ({BASELINE_FILE.name})")
+    parser.add_argument('--compare', action='store_true', help="compare against the saved baseline")
+    parser.add_argument('--baseline', type=Path, default=BASELINE_FILE)
+    parser.add_argument('--threshold', type=float, default=0.25,
+                        help="allowed slowdown of the median before a case counts as a regression (default: 0.25)")
+    args = parser.parse_args()
+
+    wrong = check_corpus()
+    if wrong:
+        print(f"{len(wrong)} corpus cases give different dates, fix that first (see tests/test_corpus.py)")
+        sys.exit(1)
+
+    results = {}
+    with tempfile.TemporaryDirectory() as workdir:
+        cases = build_cases(args.quick, workdir)
+        if args.only:
+            cases = [c for c in cases if c.name.startswith(args.only)]
+        print(f"{'case':<24} {'calls':>6} {'p50 ms':>9} {'p90 ms':>9} {'p99 ms':>9} {'MB/s':>8} {'dates/s':>11} {'peak KB':>9}")
+        for case in cases:
+            results[case.name] = run_case(case)
+            print(format_row(case.name, results[case.name]))
+
+    if args.save:
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump({
+                'recorded': time.strftime('%Y-%m-%d %H:%M:%S'),
+                'machine': f"{platform.node()} / Python {platform.python_version()}",
+                'quick': args.quick,
+                'results': results,
+            }, f, indent=2)
+        print(f"\nBaseline saved to {args.baseline}")
+
+    if args.compare:
+        if not args.baseline.exists():
+            print(f"\nNo baseline at {args.baseline}; run with --save first")
+            sys.exit(1)
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} case(s) got slower: {', '.join(regressions)}")
+            sys.exit(1)
+        print("\nNo regressions")
+
+
+if __name__ == "__main__":
+    main()
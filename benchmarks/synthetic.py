@@ -0,0 +1,151 @@
+"""
+Synthetic inputs for the benchmarks: text of a given size and date density,
+date strings in every shape date_patterns produces, short chat-like
+messages, and small PDFs.
+
+Everything is generated from a fixed seed, so two runs (or two branches)
+benchmark exactly the same input.
+"""
+import random
+
+MONTHS = ['January', 'February', 'March', 'April', 'May', 'June', 'July',
+          'August', 'September', 'October', 'November', 'December']
+
+FILLER = ("the committee will review the budget proposal and circulate minutes to all members "
+          "before the next session please confirm attendance with the office by email and note "
+          "that parking is limited so public transport is recommended for everyone attending").split()
+
+
+def random_date(rng):
+    """One date in a random shape, including multi-day lists and dash ranges"""
+    y, m, d = rng.randint(1995, 2030), rng.randint(1, 12), rng.randint(1, 26)
+    month = MONTHS[m - 1]
+    short = month[:3]
+    return rng.choice([
+        f"{m:02d}/{d:02d}/{y}",
+        f"{y}-{m:02d}-{d:02d}",
+        f"{short} {d}, {y}",
+        f"{d} {month} {y}",
+        f"{d}th of {month} {y}",
+        f"{d},{d + 1},{d + 2} {short.upper()} {y}",
+        f"{d}th & {d + 1}th {month} {y}",
+        f"{d}th - {d + 2}th {month} {y}",
+    ])
+
+
+def make_text(size, density, seed=1):
+    """
+    About `size` characters of prose with a date every `density` words on
+    average (density=0 → no dates at all). Lines are 8–16 words long.
+    """
+    rng = random.Random(seed)
+    parts = []
+    length = 0
+    words_in_line = 0
+    line_length = rng.randint(8, 16)
+    while length < size:
+        if density and rng.random() < 1.0 / density:
+            word = random_date(rng)
+        else:
+            word = rng.choice(FILLER)
+        words_in_line += 1
+        if words_in_line >= line_length:
+            word += '\n'
+            words_in_line = 0
+            line_length = rng.randint(8, 16)
+        else:
+            word += ' '
+        parts.append(word)
+        length += len(word)
+    return ''.join(parts)[:size]
+
+
+def make_dates(n, seed=2):
+    """n single date strings (the shapes normalize_date sees)"""
+    rng = random.Random(seed)
+    out = []
+    for _ in range(n):
+        y, m, d = rng.randint(1990, 2030), rng.randint(1, 12), rng.randint(1, 28)
+        month = MONTHS[m - 1]
+        out.append(rng.choice([
+            f"{m:02d}/{d:02d}/{y}",
+            f"{y}-{m:02d}-{d:02d}",
+            f"{month[:3]} {d}, {y}",
+            f"{d} {month} {y}",
+            f"{d}th of {month} {y}",
+        ]))
+    return out
+
+
+def make_multiday(n, seed=3):
+    """'25,26,27 FEB 2026'-style strings for expand_multiday_dates"""
+    rng = random.Random(seed)
+    out = []
+    for _ in range(n):
+        first = rng.randint(1, 20)
+        days = ','.join(str(first + i) for i in range(rng.randint(2, 6)))
+        out.append(f"{days} {rng.choice(MONTHS)[:3].upper()} {rng.randint(2000, 2030)}")
+    return out
+
+
+def make_dash_ranges(n, seed=4):
+    """'7th - 8th March 2026'-style strings for expand_daterange_with_dash"""
+    rng = random.Random(seed)
+    out = []
+    for _ in range(n):
+        start = rng.randint(1, 20)
+        out.append(f"{start}th - {start + rng.randint(1, 7)}th {rng.choice(MONTHS)} {rng.randint(2000, 2030)}")
+    return out
+
+
+CHAT = ["ok see you then", "thanks!", "lunch?", "running 10 min late", "sounds good",
+        "can you send the slides", "call me when you're free", "room 204 is booked"]
+
+
+def make_messages(n, seed=5):
+    """
+    n short strings like chat messages and subject lines: most have no
+    date, some have one, and common messages repeat.
+    """
+    rng = random.Random(seed)
+    out = []
+    for _ in range(n):
+        r = rng.random()
+        if r < 0.5:
+            out.append(rng.choice(CHAT))
+        elif r < 0.8:
+            out.append(' '.join(rng.choice(FILLER) for _ in range(rng.randint(3, 12))))
+        else:
+            out.append(f"Re: {rng.choice(FILLER)} on {random_date(rng)}")
+    return out
+
+
+def make_pdf(path, page_texts):
+    """
+    Write a minimal PDF with one line of Helvetica text per page (empty
+    strings give pages with no text layer). Enough for PyPDF2 to extract.
+    """
+    objects = [
+        '<< /Type /Catalog /Pages 2 0 R >>',
+        '<< /Type /Pages /Kids [%s] /Count %d >>' % (
+            ' '.join(f'{4 + 2 * i} 0 R' for i in range(len(page_texts))), len(page_texts)),
+        '<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>',
+    ]
+    for i, text in enumerate(page_texts):
+        objects.append(f'<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] '
+                       f'/Resources << /Font << /F1 3 0 R >> >> /Contents {5 + 2 * i} 0 R >>')
+        escaped = text.replace('\\', '\\\\').replace('(', '\\(').replace(')', '\\)')
+        stream = f'BT /F1 10 Tf 40 750 Td ({escaped}) Tj ET' if text else ''
+        objects.append(f'<< /Length {len(stream)} >>\nstream\n{stream}\nendstream')
+
+    out = b'%PDF-1.4\n'
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += f'{number} 0 obj\n{body}\nendobj\n'.encode('latin-1')
+    xref = len(out)
+    out += f'xref\n0 {len(objects) + 1}\n0000000000 65535 f \n'.encode('latin-1')
+    out += ''.join(f'{offset:010d} 00000 n \n' for offset in offsets).encode('latin-1')
+    out += f'trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n'.encode('latin-1')
+    with open(path, 'wb') as f:
+        f.write(out)
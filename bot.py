@@ -10,15 +10,19 @@ Setup:
     4. Run: python bot.py
 """
 
-from datetime import datetime
-import json
-import os
+import asyncio
 import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from telegram import Update
 from telegram.ext import ApplicationBuilder, CommandHandler, MessageHandler, filters, ContextTypes, CallbackQueryHandler
 from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup
 from dateExtractor import DateExtractor
+from ocrCache import OcrCache
+from resultCache import ResultCache
+from savedDates import SavedDatesStore
+from instrumentation import Stats
 
 # ─────────────────────────────────────────
 # PASTE YOUR BOT TOKEN FROM @BotFather HERE
@@ -26,28 +30,105 @@ BOT_TOKEN = "8443448673:AAGPwcGdf18RWQVT1hZYU1WiqTCLPp5B-jI"
 # ─────────────────────────────────────────
 
 
-# File to store saved dates
-SAVED_DATES_FILE = "saved_dates.json"
-
-
-def load_saved_dates():
-    """Load previously saved dates from JSON file"""
-    if os.path.exists(SAVED_DATES_FILE):
-        with open(SAVED_DATES_FILE, 'r', encoding='utf-8') as f:
-            return json.load(f)
-    return []
-
-
-def save_date_to_file(event_name, date):
-    """Append a new date to the saved dates JSON file"""
-    saved = load_saved_dates()
-    saved.append({
-        'event_name': event_name,
-        'date': date,
-        'saved_at': datetime.now().isoformat()
-    })
-    with open(SAVED_DATES_FILE, 'w', encoding='utf-8') as f:
-        json.dump(saved, f, indent=2, ensure_ascii=False)
+# Saved dates live in SQLite; an old saved_dates.json is imported on first start.
+# Its dates have no user, so they go to LEGACY_DATES_OWNER (your Telegram user id);
+# while that is None they are kept but shown to nobody.
+# The store is opened by main(), so importing this module doesn't touch the user's files.
+LEGACY_DATES_OWNER = None
+SAVED_DATES = None   # SavedDatesStore, set by main()
+SAVED_PAGE_SIZE = 20   # dates shown per /saved page
+
+# OCR results shared by every chat — a forwarded poster is only OCR'd once
+OCR_CACHE = None   # OcrCache, set by main()
+# Full-resolution uploads are shrunk and grayscaled before OCR (see imagePreprocess.py)
+OCR_PREPROCESS = "gray,max=2000"
+
+# Dates found in each photo/document, keyed by Telegram's file_unique_id: a flyer
+# forwarded by many people is downloaded and extracted once (see resultCache.py).
+# main() creates it, keyed on make_extractor()'s settings.
+RESULT_CACHE_TTL = 30 * 24 * 3600   # seconds before a cached result is extracted again
+RESULT_CACHE_MAX_ENTRIES = 50000    # files remembered before the least recently used are dropped
+RESULT_CACHE = None   # ResultCache, set by main()
+
+# Extraction runs in worker threads so one slow OCR or PDF never freezes other chats
+EXTRACTION_WORKERS = 4        # files processed at the same time
+EXTRACTION_QUEUE_LIMIT = 20   # jobs running + waiting before new ones are turned away
+EXTRACTION_TIMEOUT = 90       # seconds a job may run (time queued doesn't count) before it is given up on
+
+
+class ExtractionJob:
+    """A job on ExtractionPool: `started` resolves to time.monotonic() when a worker picks it up"""
+
+    def __init__(self, started, future):
+        self.started = started
+        self.future = future
+
+
+class ExtractionPool:
+    """
+    Bounded worker pool for DateExtractor jobs.
+    Only touched from the event loop, so the pending counter needs no lock.
+    """
+
+    def __init__(self, workers, queue_limit, timeout):
+        self.workers = workers
+        self.queue_limit = queue_limit
+        self.timeout = timeout
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="extract")
+        self.pending = 0   # jobs submitted and not yet finished
+
+    def is_full(self):
+        return self.pending >= self.queue_limit
+
+    def submit(self, fn, *args):
+        """
+        Queue a job. Returns (ExtractionJob, position) where position is how many
+        jobs are ahead of it in the queue (0 = a worker picks it up right away).
+        """
+        loop = asyncio.get_running_loop()
+        position = max(0, self.pending - self.workers + 1)
+        started = loop.create_future()
+
+        def run():
+            now = time.monotonic()
+            loop.call_soon_threadsafe(lambda: started.done() or started.set_result(now))
+            return fn(*args)
+
+        job = self.executor.submit(run)
+        self.pending += 1
+        # Count the job as pending until its thread really finishes, even if we stop waiting
+        job.add_done_callback(lambda _: loop.call_soon_threadsafe(self._job_done))
+        return ExtractionJob(started, asyncio.wrap_future(job, loop=loop)), position
+
+    def _job_done(self):
+        self.pending -= 1
+
+    async def wait(self, job):
+        """
+        Wait for a job's result, at most `timeout` seconds after a worker
+        started it; raises asyncio.TimeoutError after that. A thread can't be
+        killed, so the job has to stop by itself (see extract_and_record_stats);
+        use finished() before deleting files it reads.
+        """
+        started_at = await asyncio.shield(job.started)
+        time_left = max(0.0, started_at + self.timeout - time.monotonic())
+        # shield: cancelling the wrapper wouldn't stop the thread, only hide that it still runs
+        return await asyncio.wait_for(asyncio.shield(job.future), time_left)
+
+    async def finished(self, job):
+        """Wait until a job's thread is done, however it ended"""
+        await asyncio.wait([job.future])
+
+
+EXTRACTION_POOL = ExtractionPool(EXTRACTION_WORKERS, EXTRACTION_QUEUE_LIMIT, EXTRACTION_TIMEOUT)
+
+# Per-stage timings and counters of every file extracted since the bot started (/stats)
+EXTRACTION_STATS = Stats()
+
+# An album arrives as one update per photo. Its items are collected until none has
+# arrived for MEDIA_GROUP_WAIT seconds, then handled as one batch with one reply.
+MEDIA_GROUP_WAIT = 1.0
+PENDING_ALBUMS = {}   # (chat id, media_group_id) → messages received so far
 
 
 async def start(update: Update, context: ContextTypes.DEFAULT_TYPE):
@@ -58,37 +139,115 @@ async def start(update: Update, context: ContextTypes.DEFAULT_TYPE):
         "🖼 Image (JPG, PNG, etc.)\n"
         "📧 Email file (.eml)\n"
         "💬 Plain text\n\n"
-        "If I find multiple dates, you can choose which ones to save!\n\n"
+        "If I find multiple dates, you can choose which ones to save!\n"
+        "Send an album to get the dates of all its photos in one reply.\n\n"
         "Commands:\n"
-        "/saved - View all saved dates\n"
-        "/clear - Clear all saved dates",
+        "/saved - View your saved dates (/saved 2 for page 2)\n"
+        "/clear - Clear all saved dates\n"
+        "/stats - Where extraction time goes (/stats prometheus for metrics text)",
         parse_mode="Markdown"
     )
 
 
-async def view_saved(update: Update, context: ContextTypes.DEFAULT_TYPE):
-    """Show all saved dates"""
-    saved = load_saved_dates()
-    if not saved:
-        await update.message.reply_text("📭 No dates saved yet.")
-        return
+def render_saved_page(user_id, page):
+    """Text and Prev/Next buttons for one page of a user's saved dates"""
+    total = SAVED_DATES.count(user_id)
+    if not total:
+        return "📭 No dates saved yet.", None
+
+    pages = (total + SAVED_PAGE_SIZE - 1) // SAVED_PAGE_SIZE
+    page = min(max(page, 1), pages)
+    items = SAVED_DATES.page(user_id, page, SAVED_PAGE_SIZE)
 
-    lines = ["📅 *Your Saved Dates:*\n"]
-    for i, item in enumerate(saved, 1):
+    lines = [f"📅 *Your Saved Dates* (page {page}/{pages}):\n"]
+    first = (page - 1) * SAVED_PAGE_SIZE
+    for i, item in enumerate(items, first + 1):
         lines.append(f"{i}. *{item['event_name']}* — `{item['date']}`")
-    
-    await update.message.reply_text("\n".join(lines), parse_mode="Markdown")
+
+    buttons = []
+    if page > 1:
+        buttons.append(InlineKeyboardButton("◀ Prev", callback_data=f"saved_page:{page - 1}"))
+    if page < pages:
+        buttons.append(InlineKeyboardButton("Next ▶", callback_data=f"saved_page:{page + 1}"))
+    return "\n".join(lines), InlineKeyboardMarkup([buttons]) if buttons else None
+
+
+async def view_saved(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """Show one page of saved dates (/saved 2 jumps to page 2)"""
+    page = int(context.args[0]) if context.args and context.args[0].isdigit() else 1
+    text, reply_markup = render_saved_page(update.effective_user.id, page)
+    await update.message.reply_text(text, parse_mode="Markdown", reply_markup=reply_markup)
 
 
 async def clear_saved(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Clear all saved dates"""
-    if os.path.exists(SAVED_DATES_FILE):
-        os.remove(SAVED_DATES_FILE)
+    SAVED_DATES.clear(update.effective_user.id)
     await update.message.reply_text("🗑 All saved dates cleared.")
 
 
+async def show_stats(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """Extraction timings, OCR cache and queue state (/stats prometheus for the metrics text)"""
+    if context.args and context.args[0] == "prometheus":
+        await update.message.reply_text(EXTRACTION_STATS.to_prometheus())
+        return
+    text = (EXTRACTION_STATS.format("Extraction since start") + "\n\n"
+            + OCR_CACHE.format_stats() + "\n"
+            + RESULT_CACHE.format_stats() + "\n"
+            + f"Queue: {EXTRACTION_POOL.pending} running or waiting (limit {EXTRACTION_POOL.queue_limit})")
+    await update.message.reply_text(f"📊 Stats\n```\n{text}\n```", parse_mode="Markdown")
+
+
+def make_extractor():
+    """A DateExtractor for one file sent to the bot"""
+    # ocr_timeout kills a stuck Tesseract run; extract_and_record_stats also gives
+    # every file a deadline, so a timed-out job stops and frees its worker
+    # pdf_ocr lets scanned PDFs (no text layer) go through OCR like photos
+    # profile feeds /stats
+    return DateExtractor(ocr_cache=OCR_CACHE, ocr_timeout=EXTRACTION_TIMEOUT, pdf_ocr=True,
+                         preprocess=OCR_PREPROCESS, profile=True)
+
+
+def extraction_result(extractor):
+    """{'event_name', 'dates'} of the file an extractor processed, or None if nothing was found"""
+    if not extractor.extracted_dates:
+        return None
+    first = extractor.extracted_dates[0]
+    return {'event_name': first.get('event_name', 'Unknown Event'), 'dates': first.get('dates', [])}
+
+
+def cache_result(tg_file, result, extractor):
+    """Remember a Telegram file's result in RESULT_CACHE (only when it has dates)"""
+    if result and result['dates']:
+        RESULT_CACHE.put(tg_file.file_unique_id, result, tg_file.file_size,
+                         extractor.stats.seconds.get('total', 0.0))
+
+
+def extract_and_record_stats(extractor, file_path):
+    """Process one file and add its timings to EXTRACTION_STATS"""
+    # The job's time starts now, in its worker, like ExtractionPool.wait's timer
+    extractor.deadline = time.monotonic() + EXTRACTION_TIMEOUT
+    try:
+        return extractor.process_file(file_path)
+    finally:
+        EXTRACTION_STATS.merge(extractor.stats)
+
+
+async def reply_from_cache(update: Update, context: ContextTypes.DEFAULT_TYPE, tg_file):
+    """Answer from RESULT_CACHE without downloading; False if the file isn't cached"""
+    result = RESULT_CACHE.get(tg_file.file_unique_id)
+    if result is None:
+        return False
+    await reply_with_dates(update, context, result)
+    return True
+
+
 async def handle_document(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    if update.message.media_group_id:
+        await collect_album(update, context)
+        return
     doc = update.message.document
+    if await reply_from_cache(update, context, doc):
+        return
     file_name = doc.file_name or "received_file"
     await update.message.reply_text(f"📥 Received: `{file_name}`\nExtracting dates...", parse_mode="Markdown")
 
@@ -96,18 +255,100 @@ async def handle_document(update: Update, context: ContextTypes.DEFAULT_TYPE):
         file_path = Path(tmp_dir) / file_name
         tg_file = await context.bot.get_file(doc.file_id)
         await tg_file.download_to_drive(file_path)
-        await process_and_respond(update, context, file_path)
+        await process_and_respond(update, context, file_path, cache_file=doc)
 
 
 async def handle_photo(update: Update, context: ContextTypes.DEFAULT_TYPE):
-    await update.message.reply_text("🖼 Photo received — extracting dates...")
+    if update.message.media_group_id:
+        await collect_album(update, context)
+        return
     photo = update.message.photo[-1]
+    if await reply_from_cache(update, context, photo):
+        return
+    await update.message.reply_text("🖼 Photo received — extracting dates...")
 
     with tempfile.TemporaryDirectory() as tmp_dir:
         file_path = Path(tmp_dir) / "photo.jpg"
         tg_file = await context.bot.get_file(photo.file_id)
         await tg_file.download_to_drive(file_path)
-        await process_and_respond(update, context, file_path)
+        await process_and_respond(update, context, file_path, cache_file=photo)
+
+
+async def collect_album(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """
+    Add a photo/document to its album. The album's first update waits for
+    the rest, then processes them all with process_album; later ones return.
+    """
+    key = (update.effective_chat.id, update.message.media_group_id)
+    album = PENDING_ALBUMS.get(key)
+    if album is not None:
+        album.append(update.message)
+        return
+
+    album = PENDING_ALBUMS[key] = [update.message]
+    seen = 0
+    while seen != len(album):
+        seen = len(album)
+        await asyncio.sleep(MEDIA_GROUP_WAIT)
+    del PENDING_ALBUMS[key]
+    await process_album(update, context, album)
+
+
+async def download(context: ContextTypes.DEFAULT_TYPE, tg_file, file_path: Path):
+    tg_file = await context.bot.get_file(tg_file.file_id)
+    await tg_file.download_to_drive(file_path)
+
+
+async def process_album(update: Update, context: ContextTypes.DEFAULT_TYPE, messages):
+    """
+    Extract dates from every file of an album at once: cached files are
+    answered from RESULT_CACHE, the rest are downloaded concurrently and
+    extracted in parallel on EXTRACTION_POOL. One reply covers the album.
+    """
+    attachments = [message.photo[-1] if message.photo else message.document for message in messages]
+    results = [RESULT_CACHE.get(attachment.file_unique_id) for attachment in attachments]
+    todo = [i for i, result in enumerate(results) if result is None]
+    failed = 0
+
+    if not todo:
+        await reply_with_album(update, context, results)
+        return
+    if EXTRACTION_POOL.pending + len(todo) > EXTRACTION_POOL.queue_limit:
+        await update.message.reply_text("🚦 I'm busy with a lot of files right now — please try again in a minute.")
+        return
+    await update.message.reply_text(f"🖼 Album of {len(messages)} files received — extracting dates...")
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        paths = []
+        for i in todo:
+            name = "photo.jpg" if messages[i].photo else (attachments[i].file_name or "received_file")
+            # One folder per file keeps file names (and so event names) as sent
+            folder = Path(tmp_dir) / str(i)
+            folder.mkdir()
+            paths.append(folder / name)
+        downloads = await asyncio.gather(*(download(context, attachments[i], path) for i, path in zip(todo, paths)),
+                                         return_exceptions=True)
+
+        jobs = []   # (album index, extractor, ExtractionJob)
+        for i, path, error in zip(todo, paths, downloads):
+            if isinstance(error, Exception):
+                failed += 1
+                continue
+            extractor = make_extractor()
+            job, _ = EXTRACTION_POOL.submit(extract_and_record_stats, extractor, path)
+            jobs.append((i, extractor, job))
+        outcomes = await asyncio.gather(*(EXTRACTION_POOL.wait(job) for _, _, job in jobs), return_exceptions=True)
+
+        for (i, extractor, _), outcome in zip(jobs, outcomes):
+            if isinstance(outcome, Exception):   # timed out or crashed
+                failed += 1
+                continue
+            results[i] = extraction_result(extractor)
+            cache_result(attachments[i], results[i], extractor)
+
+        await reply_with_album(update, context, results, failed)
+        # Jobs that timed out may still be reading their files: keep them until every job has stopped
+        await asyncio.gather(*(EXTRACTION_POOL.finished(job) for _, _, job in jobs))
 
 
 async def handle_text(update: Update, context: ContextTypes.DEFAULT_TYPE):
@@ -117,27 +358,57 @@ async def handle_text(update: Update, context: ContextTypes.DEFAULT_TYPE):
     with tempfile.TemporaryDirectory() as tmp_dir:
         file_path = Path(tmp_dir) / "message.txt"
         file_path.write_text(text, encoding="utf-8")
-        await process_and_respond(update, context, file_path)
+        # Chat messages are tiny — extract right away instead of queueing behind images
+        await process_and_respond(update, context, file_path, inline=True)
 
 
-async def process_and_respond(update: Update, context: ContextTypes.DEFAULT_TYPE, file_path: Path):
-    """Run extractor and handle single vs multiple dates"""
-    extractor = DateExtractor()
-    extractor.process_file(file_path)
+async def process_and_respond(update: Update, context: ContextTypes.DEFAULT_TYPE, file_path: Path, inline=False,
+                              cache_file=None):
+    """
+    Run extractor and handle single vs multiple dates. cache_file is the
+    Telegram PhotoSize/Document the file came from; its result goes into RESULT_CACHE.
+    """
+    extractor = make_extractor()
 
-    if not extractor.extracted_dates:
+    if inline:
+        extract_and_record_stats(extractor, file_path)
+    else:
+        if EXTRACTION_POOL.is_full():
+            await update.message.reply_text("🚦 I'm busy with a lot of files right now — please try again in a minute.")
+            return
+
+        job, position = EXTRACTION_POOL.submit(extract_and_record_stats, extractor, file_path)
+        if position:
+            await update.message.reply_text(f"⏳ Busy right now — your file is queued at position {position}.")
+
+        try:
+            await EXTRACTION_POOL.wait(job)
+        except asyncio.TimeoutError:
+            await update.message.reply_text("⌛ This file took too long to process and was cancelled.")
+            # The caller deletes file_path when we return; let the job stop reading it first
+            await EXTRACTION_POOL.finished(job)
+            return
+
+    result = extraction_result(extractor)
+    if cache_file is not None:
+        cache_result(cache_file, result, extractor)
+    await reply_with_dates(update, context, result)
+
+
+async def reply_with_dates(update: Update, context: ContextTypes.DEFAULT_TYPE, result):
+    """Reply with one file's {'event_name', 'dates'} (None = nothing found): auto-save one date, buttons for several"""
+    if result is None:
         await update.message.reply_text("❌ No dates found in this file.")
         return
 
-    result = extractor.extracted_dates[0]
-    event_name = result.get('event_name', 'Unknown Event')
-    dates = result.get('dates', [])
+    event_name = result['event_name']
+    dates = result['dates']
 
     if len(dates) == 0:
         await update.message.reply_text("❌ No dates found.")
     elif len(dates) == 1:
         # Single date — auto-save it
-        save_date_to_file(event_name, dates[0])
+        SAVED_DATES.add(update.effective_user.id, event_name, dates[0])
         await update.message.reply_text(
             f"✅ *{event_name}*\n📅 `{dates[0]}`\n\n💾 Automatically saved!",
             parse_mode="Markdown"
@@ -168,6 +439,57 @@ async def process_and_respond(update: Update, context: ContextTypes.DEFAULT_TYPE
         )
 
 
+async def reply_with_album(update: Update, context: ContextTypes.DEFAULT_TYPE, results, failed=0):
+    """
+    One reply for a whole album: the dates of each event, without repeats
+    (the same poster photographed twice lists its dates once). A single date
+    is auto-saved; several get buttons like a single file's.
+    """
+    events = {}   # event name → its dates, in the order first seen
+    for result in results:
+        if not result:
+            continue
+        event_dates = events.setdefault(result['event_name'], [])
+        for date in result['dates']:
+            if date not in event_dates:
+                event_dates.append(date)
+    pairs = [(event_name, date) for event_name, dates in events.items() for date in dates]
+    note = f"\n\n⚠️ {failed} of {len(results)} files could not be processed." if failed else ""
+
+    if not pairs:
+        await update.message.reply_text("❌ No dates found in this album." + note)
+        return
+
+    if len(pairs) == 1:
+        event_name, date = pairs[0]
+        SAVED_DATES.add(update.effective_user.id, event_name, date)
+        await update.message.reply_text(
+            f"✅ *{event_name}*\n📅 `{date}`\n\n💾 Automatically saved!" + note,
+            parse_mode="Markdown"
+        )
+        return
+
+    lines = [f"✅ Found {len(pairs)} dates in {len(results)} files:"]
+    for event_name, dates in events.items():
+        lines.append(f"\n*{event_name}*")
+        lines.extend(f"📅 `{date}`" for date in dates)
+    lines.append("\nSelect which to save:" + note)
+
+    # Same payload and buttons as reply_with_dates, plus the event of every date
+    message_id = update.message.message_id
+    context.user_data[f"dates_{message_id}"] = {
+        "event_name": pairs[0][0],
+        "dates": [date for _, date in pairs],
+        "events": [event_name for event_name, _ in pairs],
+    }
+    keyboard = [[InlineKeyboardButton(f"📅 {date}" if len(events) == 1 else f"📅 {date} — {event_name}",
+                                      callback_data=f"save:{message_id}:{idx}")]
+                for idx, (event_name, date) in enumerate(pairs)]
+    keyboard.append([InlineKeyboardButton("✅ Save All", callback_data=f"save_all:{message_id}")])
+    await update.message.reply_text("\n".join(lines), parse_mode="Markdown",
+                                    reply_markup=InlineKeyboardMarkup(keyboard))
+
+
 async def button_callback(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Handle button clicks for date selection"""
     query = update.callback_query
@@ -193,7 +515,10 @@ async def button_callback(update: Update, context: ContextTypes.DEFAULT_TYPE):
             await query.edit_message_text("❌ Invalid date index.")
             return
         date = dates[idx]
-        save_date_to_file(event_name, date)
+        if "events" in payload:
+            # Album replies list dates of several events
+            event_name = payload["events"][idx]
+        SAVED_DATES.add(update.effective_user.id, event_name, date)
         await query.edit_message_text(
             f"✅ *{event_name}*\n📅 `{date}`\n\n💾 Saved!",
             parse_mode="Markdown"
@@ -210,21 +535,43 @@ async def button_callback(update: Update, context: ContextTypes.DEFAULT_TYPE):
             return
         event_name = payload.get("event_name", "Unknown Event")
         dates = payload.get("dates", [])
-        for date in dates:
-            save_date_to_file(event_name, date)
+        by_event = {}
+        for event, date in zip(payload.get("events") or [event_name] * len(dates), dates):
+            by_event.setdefault(event, []).append(date)
+        for event, event_dates in by_event.items():
+            SAVED_DATES.add_many(update.effective_user.id, event, event_dates)
+        title = event_name if len(by_event) == 1 else f"{len(by_event)} events"
         await query.edit_message_text(
-            f"✅ *{event_name}*\n\n💾 Saved all {len(dates)} dates!",
+            f"✅ *{title}*\n\n💾 Saved all {len(dates)} dates!",
             parse_mode="Markdown"
         )
 
+    elif action == "saved_page":
+        page = int(data[1]) if len(data) > 1 and data[1].isdigit() else 1
+        text, reply_markup = render_saved_page(update.effective_user.id, page)
+        await query.edit_message_text(text, parse_mode="Markdown", reply_markup=reply_markup)
+
 
 def main():
     print("🤖 Timely bot is running... Press Ctrl+C to stop.")
-    app = ApplicationBuilder().token(BOT_TOKEN).build()
+    # The SQLite stores are opened here, not on import, so importing bot.py
+    # (tests, benchmarks/bench_startup.py) leaves the user's files alone
+    global SAVED_DATES, OCR_CACHE, RESULT_CACHE
+    SAVED_DATES = SavedDatesStore("saved_dates.sqlite", legacy_json="saved_dates.json",
+                                  legacy_user_id=LEGACY_DATES_OWNER)
+    OCR_CACHE = OcrCache("ocr_cache.sqlite")
+    # Rows made with other extraction settings (a changed OCR_PREPROCESS, backend,
+    # DPI, ...) are misses, not stale answers
+    RESULT_CACHE = ResultCache("result_cache.sqlite", settings=make_extractor().extraction_settings(),
+                               ttl=RESULT_CACHE_TTL, max_entries=RESULT_CACHE_MAX_ENTRIES)
+
+    # concurrent_updates lets other chats be served while a file is being extracted
+    app = ApplicationBuilder().token(BOT_TOKEN).concurrent_updates(True).build()
 
     app.add_handler(CommandHandler("start", start))
     app.add_handler(CommandHandler("saved", view_saved))
     app.add_handler(CommandHandler("clear", clear_saved))
+    app.add_handler(CommandHandler("stats", show_stats))
     app.add_handler(MessageHandler(filters.Document.ALL, handle_document))
     app.add_handler(MessageHandler(filters.PHOTO, handle_photo))
     app.add_handler(MessageHandler(filters.TEXT & ~filters.COMMAND, handle_text))
@@ -1,48 +1,888 @@
 import re
 import os
+import mmap
+import contextlib
 from datetime import datetime
 from pathlib import Path
-import email
-from email import policy
 import subprocess
-import tempfile
-
-
-# PIL and pytesseract for image OCR
-try:
+import sys
+import threading
+import time
+from functools import lru_cache
+from calendar import monthrange
+
+from resultWriters import TextReportWriter
+from instrumentation import Stats, NULL_STATS
+from fileTypes import FileFilter, sniff_file, IMAGE, PDF, EMAIL
+
+
+# Tesseract binary used for every OCR call. On Windows it lives in the user's
+# install folder; everywhere else it is expected on the PATH.
+if sys.platform == 'win32':
+    TESSERACT_CMD = r'C:\Users\Varsh\AppData\Local\Programs\Tesseract-OCR\tesseract.exe'
+    TESSDATA_PREFIX = r'C:\Users\Varsh\AppData\Local\Programs\Tesseract-OCR\tessdata'
+else:
+    TESSERACT_CMD = 'tesseract'
+    TESSDATA_PREFIX = None
+
+# Optional backends are imported the first time a file needs them, not when
+# this module is imported: main.py runs from cron many times a day, and most
+# runs never touch an image or a PDF. The *_AVAILABLE flags and the module
+# names (Image, PyPDF2, ...) still work as attributes of this module; reading
+# one triggers the import (see __getattr__ at the bottom).
+
+class _OptionalImport:
+    """
+    An optional dependency, imported on first get(). A missing package is
+    reported once, with its install hint, when something first needs it.
+    """
+
+    def __init__(self, load, warning=None):
+        self._load = load
+        self._warning = warning
+        self._loaded = False
+        self._value = None
+        self._lock = threading.Lock()
+
+    def get(self):
+        """The imported module (or function), or None if it isn't installed"""
+        if not self._loaded:
+            with self._lock:
+                if not self._loaded:
+                    try:
+                        self._value = self._load()
+                    except ImportError:
+                        if self._warning:
+                            print(self._warning)
+                    self._loaded = True
+        return self._value
+
+    @property
+    def available(self):
+        return self.get() is not None
+
+
+def _load_pil():
+    # PIL and pytesseract for image OCR
     from PIL import Image
     import pytesseract
-    import sys
     if sys.platform == 'win32':
-        tesseract_path = r'C:\Users\Varsh\AppData\Local\Programs\Tesseract-OCR\tesseract.exe'
-        pytesseract.pytesseract.tesseract_cmd = tesseract_path
-        os.environ['TESSDATA_PREFIX'] = r'C:\Users\Varsh\AppData\Local\Programs\Tesseract-OCR\tessdata'
-    OCR_AVAILABLE = True
-except ImportError:
-    OCR_AVAILABLE = False
-    print("Warning: PIL/pytesseract not available. Install with: pip install pillow pytesseract")
-
-# PyPDF2 for PDF reading
-try:
+        pytesseract.pytesseract.tesseract_cmd = TESSERACT_CMD
+        os.environ['TESSDATA_PREFIX'] = TESSDATA_PREFIX
+    return Image
+
+
+def _load_pypdf2():
     import PyPDF2
-    PDF_AVAILABLE = True
-except ImportError:
-    PDF_AVAILABLE = False
-    print("Warning: PyPDF2 not available. Install with: pip install PyPDF2")
+    return PyPDF2
+
+
+def _load_pdf2image():
+    # pdf2image (needs poppler) for rasterizing scanned PDF pages so they can be OCR'd
+    from pdf2image import convert_from_path
+    return convert_from_path
 
-# dateutil for normalizing matched dates to YYYY-MM-DD
-try:
+
+def _load_tesserocr():
+    import tesserocr
+    return tesserocr
+
+
+def _load_dateutil():
+    # dateutil for normalizing matched dates to YYYY-MM-DD
     from dateutil import parser as date_parser
-    DATEUTIL_AVAILABLE = True
-except ImportError:
-    DATEUTIL_AVAILABLE = False
-    print("Warning: dateutil not available. Install with: pip install python-dateutil")
+    return date_parser
+
+
+_PIL = _OptionalImport(
+    _load_pil, "Warning: PIL/pytesseract not available. Install with: pip install pillow pytesseract")
+_PYPDF2 = _OptionalImport(
+    _load_pypdf2, "Warning: PyPDF2 not available. Install with: pip install PyPDF2")
+_PDF2IMAGE = _OptionalImport(
+    _load_pdf2image,
+    "Warning: pdf2image not available, scanned PDFs can't be OCR'd. Install with: pip install pdf2image")
+# tesserocr keeps a Tesseract engine loaded in-process. Optional: without it
+# every OCR call runs the tesseract CLI instead, which works but is slower.
+_TESSEROCR = _OptionalImport(_load_tesserocr)
+_DATEUTIL = _OptionalImport(
+    _load_dateutil, "Warning: dateutil not available. Install with: pip install python-dateutil")
+
+_LAZY_FLAGS = {
+    'OCR_AVAILABLE': _PIL,
+    'PDF_AVAILABLE': _PYPDF2,
+    'PDF_RASTER_AVAILABLE': _PDF2IMAGE,
+    'TESSEROCR_AVAILABLE': _TESSEROCR,
+    'DATEUTIL_AVAILABLE': _DATEUTIL,
+}
+_LAZY_NAMES = {
+    'Image': _PIL,
+    'PyPDF2': _PYPDF2,
+    'convert_from_path': _PDF2IMAGE,
+    'tesserocr': _TESSEROCR,
+    'date_parser': _DATEUTIL,
+}
+
+
+_tesseract_version = None
+
+
+def tesseract_version():
+    """First line of `tesseract --version`, looked up once per process (part of the OCR cache key)."""
+    global _tesseract_version
+    if _tesseract_version is None:
+        try:
+            result = subprocess.run([TESSERACT_CMD, '--version'], env=_tesseract_env(),
+                                    capture_output=True, text=True)
+            output = (result.stdout or result.stderr).strip()
+            _tesseract_version = output.splitlines()[0] if output else 'unknown'
+        except OSError:
+            _tesseract_version = 'unknown'
+    return _tesseract_version
+
+
+def _tesseract_env():
+    """Environment for the tesseract subprocess (points it at tessdata on Windows)."""
+    env = os.environ.copy()
+    if TESSDATA_PREFIX:
+        env['TESSDATA_PREFIX'] = TESSDATA_PREFIX
+    return env
+
+
+
+TSV_HEADER = 'level\tpage_num\tblock_num\tpar_num\tline_num\tword_num\tleft\ttop\twidth\theight\tconf\ttext'
+
+
+class SubprocessOcrBackend:
+    """
+    Runs the tesseract CLI once per image. Always available, but every call
+    starts a new process and reloads the language model (~100+ ms).
+    """
+    name = 'subprocess'
+
+    def __init__(self, lang='eng'):
+        self.lang = lang
+
+    def version(self):
+        return tesseract_version()
+
+    def tsv_from_path(self, image_path, timeout=None):
+        """TSV for an image file, or None if Tesseract produced nothing"""
+        result = subprocess.run(
+            [TESSERACT_CMD, str(image_path), 'stdout', '-l', self.lang, 'tsv'],
+            env=_tesseract_env(), capture_output=True, text=True, encoding='utf-8',
+            timeout=timeout
+        )
+        return result.stdout or None
+
+    def tsv_from_image(self, image, timeout=None):
+        """TSV for an in-memory PIL image, piped to tesseract as PNG on stdin"""
+        from io import BytesIO
+        buffer = BytesIO()
+        image.save(buffer, format='PNG', compress_level=1)   # fast to write; tesseract decodes it anyway
+        result = subprocess.run(
+            [TESSERACT_CMD, 'stdin', 'stdout', '-l', self.lang, 'tsv'],
+            input=buffer.getvalue(), env=_tesseract_env(), capture_output=True,
+            timeout=timeout
+        )
+        return result.stdout.decode('utf-8', errors='replace') or None
+
+
+class TesserocrBackend:
+    """
+    Tesseract through its C API (tesserocr). Each thread keeps one engine
+    with the traineddata already loaded and hands it PIL images directly,
+    so there is no process start-up, model load or temp file per call.
+
+    The C API can't be interrupted, so the timeout argument is ignored here.
+    """
+    name = 'tesserocr'
+
+    def __init__(self, lang='eng'):
+        self.lang = lang
+        self._local = threading.local()
+
+    def _api(self):
+        """This thread's warm engine, created on first use"""
+        api = getattr(self._local, 'api', None)
+        if api is None:
+            if TESSDATA_PREFIX:
+                api = _TESSEROCR.get().PyTessBaseAPI(path=TESSDATA_PREFIX, lang=self.lang)
+            else:
+                api = _TESSEROCR.get().PyTessBaseAPI(lang=self.lang)
+            self._local.api = api
+        return api
+
+    def version(self):
+        return 'tesserocr ' + _TESSEROCR.get().tesseract_version().splitlines()[0]
+
+    def tsv_from_path(self, image_path, timeout=None):
+        with _PIL.get().open(image_path) as image:
+            return self.tsv_from_image(image)
+
+    def tsv_from_image(self, image, timeout=None):
+        api = self._api()
+        api.SetImage(image)
+        # GetTSVText() returns the word rows only; add the header the CLI prints
+        rows = api.GetTSVText(0)
+        api.Clear()
+        if not rows:
+            return None
+        return TSV_HEADER + '\n' + rows
+
+
+OCR_BACKENDS = {
+    SubprocessOcrBackend.name: SubprocessOcrBackend,
+    TesserocrBackend.name: TesserocrBackend,
+}
+
+_ocr_backends = {}
+
+
+def get_ocr_backend(name='auto', lang='eng'):
+    """
+    The shared OCR backend for a name and language, created once per process
+    so warm engines are reused by every DateExtractor.
+
+    'auto' picks tesserocr when it is installed and falls back to the CLI.
+    """
+    if name == 'auto':
+        name = TesserocrBackend.name if _TESSEROCR.available else SubprocessOcrBackend.name
+    if name not in OCR_BACKENDS:
+        raise ValueError(f"Unknown OCR backend {name!r} (choose from: auto, {', '.join(OCR_BACKENDS)})")
+    if name == TesserocrBackend.name and not _TESSEROCR.available:
+        raise ValueError("OCR backend 'tesserocr' needs tesserocr. Install with: pip install tesserocr")
+    backend = _ocr_backends.get((name, lang))
+    if backend is None:
+        backend = _ocr_backends[(name, lang)] = OCR_BACKENDS[name](lang)
+    return backend
+
+
+_band_pools = {}   # (pid, tiles) → thread pool the bands of tiled images are OCR'd on
+_band_pools_lock = threading.Lock()
+
+
+def _band_pool(tiles):
+    """
+    The long-lived thread pool for OCR'ing image bands (see ocrTiles.py),
+    shared by every DateExtractor in this process. Its threads outlive one
+    image, so a tesserocr backend's per-thread engines stay warm instead of
+    loading the traineddata again for every band. Keyed by pid as well: a
+    forked pool worker can't use its parent's threads.
+    """
+    key = (os.getpid(), tiles)
+    with _band_pools_lock:
+        pool = _band_pools.get(key)
+        if pool is None:
+            from concurrent.futures import ThreadPoolExecutor
+            pool = _band_pools[key] = ThreadPoolExecutor(max_workers=tiles, thread_name_prefix='ocr-band')
+        return pool
+
+class OcrResult:
+    """
+    The words Tesseract found in one image, parsed from a single TSV run.
+
+    Plain text, font-size ordered text and the event name are all derived
+    from this one object, so an image only ever goes through Tesseract once.
+    Each word is a dict with its line key (block, par, line), bounding box,
+    confidence and text.
+    """
+
+    def __init__(self, words):
+        self.words = words
+
+    @classmethod
+    def from_tsv(cls, tsv_text):
+        """Parse Tesseract's TSV output into an OcrResult."""
+        words = []
+        rows = tsv_text.splitlines()
+        for row in rows[1:]:  # skip header row
+            cols = row.strip().split('\t')
+            if len(cols) < 12 or not cols[11].strip():
+                continue
+            try:
+                left, top = int(cols[6]), int(cols[7])
+                width, height = int(cols[8]), int(cols[9])
+            except ValueError:
+                continue
+            try:
+                conf = float(cols[10])   # confidence score (Tesseract 5 gives e.g. "96.123456")
+            except ValueError:
+                conf = None
+            words.append({
+                'key': (cols[2], cols[3], cols[4]),   # (block, par, line)
+                'left': left, 'top': top, 'width': width,
+                'height': height,                      # bounding box height = font size proxy
+                'conf': conf,
+                'text': cols[11],
+            })
+        return cls(words)
+
+    def plain_text(self):
+        """Rebuild Tesseract's plain text output: one line per row, blank line between paragraphs."""
+        out = []
+        prev_key = None
+        for word in self.words:
+            key = word['key']
+            if prev_key is None:
+                pass
+            elif key == prev_key:
+                out.append(' ')
+            elif key[:2] == prev_key[:2]:
+                out.append('\n')
+            else:
+                out.append('\n\n')
+            out.append(word['text'])
+            prev_key = key
+        return ''.join(out)
+
+    def lines_by_fontsize(self):
+        """
+        Group confident words into lines and return them largest font first.
+        Each line is a dict {'height': max_height, 'words': [...]}.
+        """
+        lines_dict = {}  # key=(block,par,line) → {'height': max_height, 'words': []}
+        for word in self.words:
+            conf = word['conf']
+            if conf is None or conf < 30:  # skip low-confidence words
+                continue
+            key = word['key']
+            if key not in lines_dict:
+                lines_dict[key] = {'height': 0, 'words': []}
+            lines_dict[key]['words'].append(word['text'])
+            lines_dict[key]['height'] = max(lines_dict[key]['height'], word['height'])
+        return sorted(lines_dict.values(), key=lambda x: x['height'], reverse=True)
+
+    def text_by_fontsize(self):
+        """Confident lines joined largest font first, or None if there are none."""
+        sorted_lines = self.lines_by_fontsize()
+        if not sorted_lines:
+            return None
+        return '\n'.join(' '.join(l['words']) for l in sorted_lines)
+
+    def to_tsv(self):
+        """The words as Tesseract TSV again (word rows only), which from_tsv() reads back unchanged."""
+        rows = [TSV_HEADER]
+        for word in self.words:
+            block, par, line = word['key']
+            conf = word['conf'] if word['conf'] is not None else ''
+            rows.append(f"5\t1\t{block}\t{par}\t{line}\t0\t{word['left']}\t{word['top']}\t"
+                        f"{word['width']}\t{word['height']}\t{conf}\t{word['text']}")
+        return '\n'.join(rows) + '\n'
+
+
+class FailedExtraction(list):
+    """
+    What the extract_* methods return when a file couldn't be read (OCR not
+    available, a Tesseract error or timeout, an unreadable PDF, ...): the
+    dates found before giving up, usually none. It is still a list, so code
+    that only wants the dates doesn't notice, but incremental runs can tell
+    it apart from a file that has no dates and try it again next time.
+    """
+
+    def __init__(self, dates=(), reason=''):
+        super().__init__(dates)
+        self.reason = reason
+
+
+# Streaming text extraction (see DateExtractor.iter_dates_from_text_file)
+STREAM_THRESHOLD = 32 * 1024 * 1024   # stream text files bigger than this (bytes)
+STREAM_CHUNK_SIZE = 1024 * 1024       # characters read per chunk
+STREAM_OVERLAP = 4096                 # characters re-scanned at the start of the next window
+
+# PDFs with at least this many pages are split across pdf_jobs worker processes
+PDF_PARALLEL_MIN_PAGES = 16
+# Scanned (text-less) PDF pages rasterized per poppler call
+PDF_OCR_BATCH = 8
+
+# extract_dates_batch(): strings per process-pool task, and how many distinct
+# strings each chunk remembers results for
+BATCH_CHUNK_SIZE = 5000
+BATCH_MEMO_ITEMS = 100000
+
+
+def _file_digest(path):
+    """sha256 of a file's contents, read in blocks"""
+    import hashlib
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1024 * 1024), b''):
+            h.update(block)
+    return h.hexdigest()
+
+
+def _contiguous_runs(indexes):
+    """[1, 2, 3, 7, 8] → [(1, 3), (7, 8)]"""
+    runs = []
+    for index in indexes:
+        if runs and index == runs[-1][1] + 1:
+            runs[-1] = (runs[-1][0], index)
+        else:
+            runs.append((index, index))
+    return runs
+
+
+def _last_break(text, end, start=0, slack=None):
+    """
+    Index just after the last newline in text[start:end], or 0 if there is
+    none. With slack, a newline more than `slack` characters before end
+    gives way to later whitespace, so a file of very long lines is still
+    cut close to end.
+    """
+    cut = text.rfind('\n', start, end) + 1
+    if cut == 0 or (slack is not None and end - cut > slack):
+        cut = max(cut, text.rfind(' ', start, end) + 1, text.rfind('\t', start, end) + 1)
+    return cut
+
+
+def _iter_text_windows(f, chunk_size, overlap):
+    """
+    Read a text file object in chunks and yield overlapping windows that
+    start and end on line breaks. Only one window is held in memory at a
+    time, and none is much longer than chunk_size + overlap.
+    """
+    carry = ''
+    while True:
+        chunk = f.read(chunk_size)
+        if not chunk:
+            if carry.strip():
+                yield carry
+            return
+        buffer = carry + chunk
+        # Cut in the newly read chunk only, so every window moves past the carried overlap
+        cut = _last_break(buffer, len(buffer), start=len(carry), slack=overlap)
+        if cut == 0:
+            # No whitespace in the whole chunk — cut it as it is
+            cut = len(buffer)
+        window = buffer[:cut]
+        yield window
+        # Re-scan the last `overlap` characters of this window with the next one,
+        # starting on a break no more than another `overlap` further back
+        start = max(0, len(window) - 2 * overlap)
+        tail = _last_break(window, max(0, len(window) - overlap), start=start, slack=overlap)
+        if tail == 0:
+            tail = max(0, len(window) - overlap)
+        carry = window[tail:] + buffer[cut:]
+
+
+_BYTES_DIGIT = re.compile(rb'[0-9]')
+_BYTES_SPACE = b' \t\r\n\f\v'
+# Bytes that can't be part of any date in date_patterns (UTF-8 bytes are left alone)
+_BYTES_NON_DATE = re.compile(rb'[^0-9A-Za-z\s,&/\-\x80-\xff]')
+JOIN_CONTEXT = 4096   # bytes of blank lines looked through for the other half of a split date
+
+
+def _context_line_start(buf, line_start):
+    """Start of the last non-blank line before line_start (blank lines in between are skipped)"""
+    limit = max(0, line_start - JOIN_CONTEXT)
+    i = line_start - 1
+    while i >= limit and buf[i] in _BYTES_SPACE:
+        i -= 1
+    return buf.rfind(b'\n', 0, i) + 1 if i >= limit else line_start
+
+
+def _context_line_end(buf, line_end):
+    """End of the first non-blank line after line_end (blank lines in between are skipped)"""
+    size = len(buf)
+    limit = min(size, line_end + JOIN_CONTEXT)
+    i = line_end
+    while i < limit and buf[i] in _BYTES_SPACE:
+        i += 1
+    if i >= limit:
+        return line_end
+    end = buf.find(b'\n', i)
+    return size if end < 0 else end + 1
+
+
+def _utf8_boundary(buf, i):
+    """i, moved back so it doesn't split a UTF-8 character"""
+    while i > 0 and (buf[i] & 0xC0) == 0x80:
+        i -= 1
+    return i
+
+
+def _last_space(buf, start, end):
+    """Index just after the last space, tab or newline in buf[start:end], or -1 if there is none"""
+    found = max(buf.rfind(b'\n', start, end), buf.rfind(b' ', start, end), buf.rfind(b'\t', start, end))
+    return found + 1 if found >= 0 else -1
+
+
+def _last_separator(buf, start, end):
+    """
+    Index just after the last byte in buf[start:end] that no date can contain
+    (quotes, colons, brackets, ...), or -1 if there is none. Cutting there
+    can't split a date, so it is the next best thing to whitespace in text
+    without any, like minified JSON. Searched backwards in blocks.
+    """
+    high = end
+    while high > start:
+        low = max(start, high - 4096)
+        found = -1
+        for m in _BYTES_NON_DATE.finditer(buf, low, high):
+            found = m.end()
+        if found >= 0:
+            return found
+        high = low
+    return -1
+
+
+def _cut_span(buf, start, max_span, overlap):
+    """
+    Where to end a piece of at most max_span bytes starting at start, and
+    where the next piece starts so that it re-scans at least `overlap`
+    bytes: (cut, next_start). Both are put on whitespace or, failing that,
+    after a byte no date contains, within `overlap` bytes of where they
+    would ideally be; only a stretch with neither is cut as it is. So every
+    piece moves at least max_span - 3 * overlap bytes past the last one.
+    """
+    limit = start + max_span
+    low = max(start + overlap + 1, limit - overlap)
+    cut = _last_space(buf, low, limit)
+    if cut < 0:
+        cut = _last_separator(buf, low, limit)
+    if cut < 0:
+        # One enormous word — cut it anyway
+        cut = _utf8_boundary(buf, limit)
+    back = cut - overlap
+    low = max(start + 1, back - overlap)
+    next_start = _last_space(buf, low, back)
+    if next_start < 0:
+        next_start = _last_separator(buf, low, back)
+    if next_start < 0:
+        next_start = max(start + 1, _utf8_boundary(buf, back))
+    return cut, next_start
+
+
+def _candidate_spans(buf, max_span, overlap):
+    """
+    (start, end) byte ranges of buf that can hold a date, found without
+    decoding anything: every line with an ASCII digit, plus the nearest
+    non-blank line before and after it (a date split over two lines is
+    joined before matching, and only one half needs a digit). Ranges that
+    touch are merged; anything longer than max_span is cut into pieces that
+    overlap by `overlap` bytes.
+    """
+    size = len(buf)
+    span_start = span_end = None
+    pos = 0
+    while True:
+        m = _BYTES_DIGIT.search(buf, pos)
+        if m is None:
+            break
+        line_start = buf.rfind(b'\n', 0, m.start()) + 1
+        line_end = buf.find(b'\n', m.start())
+        line_end = size if line_end < 0 else line_end + 1
+        start = _context_line_start(buf, line_start)
+        end = _context_line_end(buf, line_end)
+        if span_start is not None and start <= span_end:
+            span_end = max(span_end, end)
+        else:
+            if span_start is not None:
+                yield span_start, span_end
+            span_start, span_end = start, end
+        while span_end - span_start > max_span:
+            cut, next_start = _cut_span(buf, span_start, max_span, overlap)
+            yield span_start, cut
+            span_start = next_start
+        pos = line_end
+    if span_start is not None:
+        yield span_start, span_end
+
+
+# Pre-processing rewrites used by extract_dates_from_text(), compiled once.
+# Case 1: day numbers on one line, month (+ optional year) on the next
+_JOIN_DAYS_MONTH = re.compile(
+    r'(\b\d{1,2}(?:[,\s]*\d{1,2})*)\s*\n\s*'
+    r'((?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]*(?:\s+\d{4})?)',
+    re.IGNORECASE
+)
+# Case 2: month on one line, year on the next  e.g. "FEB\n2026"
+_JOIN_MONTH_YEAR = re.compile(
+    r'((?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]*)\s*\n\s*(\d{4}\b)',
+    re.IGNORECASE
+)
+# Every date pattern needs a digit, so text without one has no dates
+_DIGIT = re.compile(r'\d')
+
+# Prefilter for extract_dates_from_text(). A date (or a split date the join
+# rewrites put back together) never touches a "dead" line: one with no digit,
+# no month token and something other than whitespace , & - on it. Its first
+# line has the digit or month it starts with, its last line the digit it ends
+# with, and lines in between only hold digits, ordinals, month names and
+# ", & -". So the text between dead lines can be matched window by window,
+# and windows without a digit can't hold a date at all.
+_LIVE_TOKEN = re.compile(r'\d|jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec', re.IGNORECASE)
+_NOT_NEUTRAL = re.compile(r'[^\s,&\-]')
+
+
+def _is_dead_line(text, start, end):
+    return _LIVE_TOKEN.search(text, start, end) is None and _NOT_NEUTRAL.search(text, start, end) is not None
+
+
+def _candidate_windows(text):
+    """
+    (start, end) of every run of non-dead lines in text that contains a
+    digit. Only the lines around each digit are looked at; the jump from one
+    digit to the next is a plain character search.
+    """
+    windows = []
+    size = len(text)
+    pos = 0
+    while True:
+        m = _DIGIT.search(text, pos)
+        if m is None:
+            break
+        start = text.rfind('\n', 0, m.start()) + 1
+        while start > 0:
+            previous = text.rfind('\n', 0, start - 1) + 1
+            if _is_dead_line(text, previous, start - 1):
+                break
+            start = previous
+        end = text.find('\n', m.start())
+        end = size if end < 0 else end
+        while end < size:
+            following = text.find('\n', end + 1)
+            following = size if following < 0 else following
+            if _is_dead_line(text, end + 1, following):
+                break
+            end = following
+        windows.append((start, end))
+        pos = end
+    return windows
+
+
+# Kinds of match, decided by how the matched string starts (see _match_kind)
+MULTIDAY = 'multiday'      # "25,26,27 FEB 2026"
+DASH_RANGE = 'dash'        # "7th - 8th March 2026"
+SINGLE = 'single'          # everything else, normalized one date at a time
+
+# Every date pattern starts at a word boundary with a digit or a month name
+_CANDIDATE_START = r'\b(?=\d|[adfjmnos](?:an|eb|ar|pr|ay|un|ul|ug|ep|ct|ov|ec))'
+
+
+def _match_kind(match):
+    r"""
+    Same decision as re.match(r'^\d{1,2}(?:,\s*\d{1,2})+') and
+    re.match(r'^\d{1,2}(?:st|nd|rd|th)?\s*-') on the match, done with plain
+    string checks (ordinals are case-sensitive, as before).
+    """
+    i = 0
+    while i < len(match) and match[i].isdecimal():
+        i += 1
+    if not 1 <= i <= 2:
+        return SINGLE
+    rest = match[i:]
+    if rest[:1] == ',' and rest[1:].lstrip()[:1].isdecimal():
+        return MULTIDAY
+    if rest[:2] in ('st', 'nd', 'rd', 'th'):
+        rest = rest[2:]
+    if rest.lstrip()[:1] == '-':
+        return DASH_RANGE
+    return SINGLE
+
+
+# Month names dateutil understands, for the native normalizer below
+_MONTH_NUMBERS = {
+    'jan': 1, 'feb': 2, 'mar': 3, 'apr': 4, 'may': 5, 'jun': 6,
+    'jul': 7, 'aug': 8, 'sep': 9, 'sept': 9, 'oct': 10, 'nov': 11, 'dec': 12,
+    'january': 1, 'february': 2, 'march': 3, 'april': 4, 'june': 6, 'july': 7,
+    'august': 8, 'september': 9, 'october': 10, 'november': 11, 'december': 12,
+}
+
+# The single-date shapes date_patterns can produce, with capture groups for each part
+_NATIVE_DATE = re.compile(r'''
+      (?P<a>\d{1,2}) (?P<sep>[/-]) (?P<b>\d{1,2}) (?P=sep) (?P<y>\d{4}|\d{2})          # 01/15/2024, 15-01-24
+    | (?P<iy>\d{4}) (?P<isep>[/-]) (?P<im>\d{1,2}) (?P=isep) (?P<id>\d{1,2})           # 2024-01-15
+    | (?P<mon1>[a-z]+) \  (?P<d1>\d{1,2}) ,? \  (?P<y1>\d{4})                         # Jan 15, 2024
+    | (?P<d2>\d{1,2}) (?:st|nd|rd|th)? \  (?:of\ )? (?P<mon2>[a-z]+) ,? \  (?P<y2>\d{4}) # 1st of January 2024
+''', re.IGNORECASE | re.VERBOSE | re.ASCII)
+
+
+def _two_digit_year(year):
+    """dateutil's rule: pick the century that puts the year within 50 years of today"""
+    this_year = datetime.now().year
+    year += this_year // 100 * 100
+    if year >= this_year + 50:
+        year -= 100
+    elif year < this_year - 50:
+        year += 100
+    return year
+
+
+def _native_normalize(date_str):
+    """
+    Build YYYY-MM-DD straight from the capture groups of a known shape,
+    resolving numeric dates the way dateutil does (month first unless the
+    first number is over 12). Returns None for a shape we can't be sure
+    about, so the caller falls back to dateutil; returns False for a
+    recognised shape that is not a real date (e.g. Feb 30).
+    """
+    m = _NATIVE_DATE.fullmatch(date_str)
+    if m is None:
+        return None
+    a, _, b, y, iy, _, im, iday, mon1, d1, y1, d2, mon2, y2 = m.groups()
+    if a is not None:
+        a, b = int(a), int(b)
+        if not (1 <= a <= 31 and 1 <= b <= 31):
+            return None
+        month, day = (a, b) if a <= 12 else (b, a)
+        year = _two_digit_year(int(y)) if len(y) == 2 else int(y)
+    elif iy is not None:
+        year, month, day = int(iy), int(im), int(iday)
+    else:
+        month_word, day, year = (mon1, d1, y1) if mon1 is not None else (mon2, d2, y2)
+        month = _MONTH_NUMBERS.get(month_word.lower())
+        day, year = int(day), int(year)
+        if month is None or not 1 <= day <= 31:
+            return None
+    if year < 1000:
+        return None
+    if not 1 <= month <= 12 or not 1 <= day <= monthrange(year, month)[1]:
+        return False
+    return f"{year}-{month:02d}-{day:02d}"
+
+
+_dateutil_calls = 0   # strings _normalize_date had to hand to dateutil (for profiling)
+
+
+@lru_cache(maxsize=65536)
+def _normalize_date(date_str):
+    """Shared, memoized body of DateExtractor.normalize_date()"""
+    global _dateutil_calls
+    native = _native_normalize(date_str)
+    if native is not None:
+        return native or None
+    date_parser = _DATEUTIL.get()
+    if date_parser is None:
+        return None
+    _dateutil_calls += 1
+    try:
+        parsed = date_parser.parse(date_str, fuzzy=False)
+        return parsed.strftime('%Y-%m-%d')
+    except (ValueError, OverflowError, TypeError):
+        return None
+
+
+class DateMatcher:
+    """
+    All date patterns compiled into one alternation of named groups
+    (p0, p1, ...) and scanned in a single pass.
+
+    The alternation jumps straight to the next position where any pattern
+    matches and says which one did. Patterns can overlap each other (e.g.
+    "27 FEB 2026" inside "25,26,27 FEB 2026"), so at each hit the later
+    patterns are also tried at that same position, and the scan resumes one
+    character on. scan() keeps each pattern's own matches non-overlapping,
+    which gives exactly what re.findall would return for each pattern.
+    """
+
+    def __init__(self, patterns):
+        self.count = len(patterns)
+        self.locator = re.compile(
+            _CANDIDATE_START + '(?:' + '|'.join(f'(?P<p{i}>{p})' for i, p in enumerate(patterns)) + ')',
+            re.IGNORECASE
+        )
+        self._pattern_of_group = {idx: int(name[1:]) for name, idx in self.locator.groupindex.items()}
+
+        # probes[k] tries every pattern after k at one position, each in its own lookahead
+        self.probes = []
+        for k in range(self.count):
+            later = list(range(k + 1, self.count))
+            probe = re.compile(''.join(f'(?:(?=(?P<p{i}>{patterns[i]})))?' for i in later), re.IGNORECASE)
+            self.probes.append((probe, [(i, probe.groupindex[f'p{i}'] - 1) for i in later]))
+
+    def scan(self, text):
+        """
+        Return one list per pattern, in pattern order, of (kind, matched_text)
+        tuples in text order — the same matches re.findall would give per pattern.
+        """
+        buckets = [[] for _ in range(self.count)]
+        next_start = [0] * self.count  # findall resumes after each pattern's previous match
+        search = self.locator.search
+        pos = 0
+        while True:
+            m = search(text, pos)
+            if m is None:
+                break
+            start = m.start()
+            k = self._pattern_of_group[m.lastindex]
+            if start >= next_start[k]:
+                match = m.group(m.lastindex)
+                next_start[k] = start + len(match)
+                buckets[k].append((_match_kind(match), match))
+
+            probe, groups = self.probes[k]
+            if groups:
+                found = probe.match(text, start).groups()
+                for i, g in groups:
+                    match = found[g]
+                    if match is not None and start >= next_start[i]:
+                        next_start[i] = start + len(match)
+                        buckets[i].append((_match_kind(match), match))
+            pos = start + 1
+        return buckets
+
+
+_matchers = {}
+
+
+def _get_matcher(patterns):
+    """Compile each distinct pattern list only once per process"""
+    matcher = _matchers.get(patterns)
+    if matcher is None:
+        matcher = _matchers[patterns] = DateMatcher(patterns)
+    return matcher
 
 
 class DateExtractor:
-    def __init__(self, output_file="extracted_dates.txt"):
+    def __init__(self, output_file="extracted_dates.txt", ocr_cache=None, ocr_lang='eng',
+                 stream_threshold=STREAM_THRESHOLD, ocr_timeout=None, pdf_jobs=1,
+                 pdf_ocr=False, pdf_ocr_dpi=200, ocr_backend='auto', preprocess=None,
+                 ocr_tiles=1, writers=None, keep_results=True, profile=False):
         self.output_file = output_file
         self.extracted_dates = []
+        # resultWriters.ResultWriter objects each file's entry is written to as soon as
+        # it finishes; with keep_results=False entries aren't also kept in extracted_dates
+        self.writers = list(writers or [])
+        self.keep_results = keep_results
+        # Per-stage timers and counters (see instrumentation.py): self.stats is the
+        # running total, file_stats holds (file, Stats) for every extracted file
+        self.profile = profile
+        self.stats = Stats() if profile else NULL_STATS
+        self.file_stats = []
+
+        # Optional ocrCache.OcrCache — repeated images skip Tesseract entirely
+        self.ocr_cache = ocr_cache
+        self.ocr_lang = ocr_lang
+        # 'auto', 'tesserocr' (warm in-process engine) or 'subprocess' (tesseract CLI)
+        self.ocr_backend = ocr_backend
+        # Seconds before a Tesseract run is killed (None = wait forever)
+        self.ocr_timeout = ocr_timeout
+        # time.monotonic() value after which extraction of the current file gives up
+        # with TimeoutError (None = never). Set per file by callers with a time
+        # budget (e.g. the bot); checked between PDF pages and text windows, and
+        # bounds every Tesseract and poppler call.
+        self.deadline = None
+        # Optional imagePreprocess.Preprocessor (or its spec, e.g. "gray,max=2000")
+        # applied to every image before OCR
+        if isinstance(preprocess, str):
+            from imagePreprocess import Preprocessor
+            preprocess = Preprocessor.from_spec(preprocess)
+        self.preprocess = preprocess
+        # Large images are cut into up to this many overlapping bands that are
+        # OCR'd concurrently (see ocrTiles.py); 1 = one Tesseract run per image
+        self.ocr_tiles = ocr_tiles
+
+        # Text files larger than this many bytes are read in chunks (None = never)
+        self.stream_threshold = stream_threshold
+        # Worker processes used to extract the pages of one large PDF
+        self.pdf_jobs = pdf_jobs
+        # OCR PDF pages that have no text layer (scans), rasterized at this DPI
+        self.pdf_ocr = pdf_ocr
+        self.pdf_ocr_dpi = pdf_ocr_dpi
+        # Skip lines that can't be part of a date before scanning (see _candidate_windows).
+        # That reasoning holds for the patterns below; turn it off after adding
+        # patterns that can span other kinds of lines.
+        self.prefilter = True
 
         self.date_patterns = [
             r'\b\d{1,2}[/-]\d{1,2}[/-]\d{2,4}\b',                                                                                                    # 01/15/2024
@@ -69,19 +909,22 @@ class DateExtractor:
             'october': '10', 'november': '11', 'december': '12'
         }
 
+    @property
+    def matcher(self):
+        """The compiled DateMatcher for the current date_patterns (built once per pattern set)."""
+        return _get_matcher(tuple(self.date_patterns))
+
     def normalize_date(self, date_str):
         """
         Convert any matched date string into standard YYYY-MM-DD format.
         This ensures all dates are stored in one consistent format.
         Returns None if the string cannot be parsed as a date.
+
+        The shapes our patterns produce are converted directly (see
+        _native_normalize); dateutil only sees the ones we don't recognise.
+        Results are memoized, so repeated strings cost a dict lookup.
         """
-        if not DATEUTIL_AVAILABLE:
-            return None
-        try:
-            parsed = date_parser.parse(date_str, fuzzy=False)
-            return parsed.strftime('%Y-%m-%d')
-        except (ValueError, OverflowError, TypeError):
-            return None
+        return _normalize_date(date_str)
 
     def expand_multiday_dates(self, match_str):
         """
@@ -142,46 +985,89 @@ class DateExtractor:
         date, it will only appear ONCE in the output.
         """
 
-        # --- PRE-PROCESSING ---
-        # Tesseract OCR reads text line by line. A date like:
-        #     25,26,27        <- line 1
-        #     FEB 2026        <- line 2
-        # becomes "25,26,27\nFEB 2026" in the string, which no pattern matches.
-        # These substitutions join such split dates back into a single line.
-
-        # Case 1: day numbers on one line, month (+ optional year) on the next
-        text = re.sub(
-            r'(\b\d{1,2}(?:[,\s]*\d{1,2})*)\s*\n\s*'
-            r'((?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]*(?:\s+\d{4})?)',
-            r'\1 \2', text, flags=re.IGNORECASE
-        )
-        # Case 2: month on one line, year on the next  e.g. "FEB\n2026"
-        text = re.sub(
-            r'((?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]*)\s*\n\s*(\d{4}\b)',
-            r'\1 \2', text, flags=re.IGNORECASE
-        )
+        stats = self.stats
+        matcher = self.matcher   # compiled on first use, outside the timed scans
+
+        # --- PREFILTER ---
+        # Only the windows of lines that can hold a date are rewritten and
+        # scanned (see _candidate_windows); the rest of the text is skipped.
+        if self.prefilter:
+            with stats.time('prefilter'):
+                windows = _candidate_windows(text)
+            if stats.enabled:
+                scanned = sum(end - start for start, end in windows)
+                stats.count('prefilter_chars_scanned', scanned)
+                stats.count('prefilter_chars_skipped', len(text) - scanned)
+            if len(windows) == 1 and windows[0] == (0, len(text)):
+                texts = [text]
+            else:
+                texts = [text[start:end] for start, end in windows]
+        else:
+            texts = [text]
+
+        buckets = [[] for _ in range(matcher.count)]
+        for text in texts:
+            # --- PRE-PROCESSING ---
+            # Tesseract OCR reads text line by line. A date like:
+            #     25,26,27        <- line 1
+            #     FEB 2026        <- line 2
+            # becomes "25,26,27\nFEB 2026" in the string, which no pattern matches.
+            # These substitutions join such split dates back into a single line.
+
+            # Case 1: day numbers on one line, month (+ optional year) on the next
+            text = _JOIN_DAYS_MONTH.sub(r'\1 \2', text)
+            # Case 2: month on one line, year on the next  e.g. "FEB\n2026"
+            text = _JOIN_MONTH_YEAR.sub(r'\1 \2', text)
+
+            # --- EXTRACTION ---
+            # One scan of the text finds every pattern's matches and tells us what
+            # kind each one is (see DateMatcher), grouped per pattern in order.
+            # Each window's matches are appended per pattern, which keeps them in text order.
+            with stats.time('regex_scan'):
+                for bucket, matches in zip(buckets, matcher.scan(text)):
+                    bucket.extend(matches)
+        if stats.enabled:
+            memo_before = _normalize_date.cache_info().hits
+            dateutil_before = _dateutil_calls
+
+        with stats.time('normalize'):
+            dates, failed = self._collect_dates(buckets)
+
+        if stats.enabled:
+            # The memo and dateutil counters are process-wide, so with several
+            # extractors running in threads these are approximate
+            stats.count('regex_matches', sum(len(matches) for matches in buckets))
+            stats.count('dates_found', len(dates))
+            stats.count('normalize_memo_hits', _normalize_date.cache_info().hits - memo_before)
+            stats.count('normalize_dateutil', _dateutil_calls - dateutil_before)
+            stats.count('normalize_failed', failed)
+        return dates
 
-        # --- EXTRACTION ---
+    def _collect_dates(self, buckets):
+        """
+        Turn DateMatcher.scan() results into the final date list.
+        Returns (dates, number of matches that couldn't be normalized).
+        """
         dates = []
         seen = set()  # YYYY-MM-DD strings already saved — the deduplication gate
+        failed = 0
 
-        for pattern in self.date_patterns:
-            matches = re.findall(pattern, text, re.IGNORECASE)
-            for match in matches:
+        for matches in buckets:
+            for kind, match in matches:
 
-                if re.match(r'^\d{1,2}(?:,\s*\d{1,2})+', match):
+                if kind == MULTIDAY:
                     # Comma-separated: "25,26,27 FEB 2026"
                     for date_str in self.expand_multiday_dates(match):
                         if date_str not in seen:
                             seen.add(date_str)
                             dates.append(date_str)
-                elif re.match(r'^\d{1,2}(?:st|nd|rd|th)?\s*-', match):
+                elif kind == DASH_RANGE:
                     # Dash range: "7th - 8th March 2026"
                     for date_str in self.expand_daterange_with_dash(match):
                         if date_str not in seen:
                             seen.add(date_str)
                             dates.append(date_str)
-        
+
                 else:
                     # Single date — normalize to YYYY-MM-DD, skip if already seen
                     normalized = self.normalize_date(match)
@@ -191,122 +1077,154 @@ class DateExtractor:
                             dates.append(normalized)
                     else:
                         # Normalization failed — store raw match as fallback
+                        failed += 1
                         if match not in seen:
                             seen.add(match)
                             dates.append(match)
 
-        return dates
-    
-    def extract_text_by_fontsize(self, image_path):
-        tesseract_cmd = r'C:\Users\Varsh\AppData\Local\Programs\Tesseract-OCR\tesseract.exe'
-        env = os.environ.copy()
-        env['TESSDATA_PREFIX'] = r'C:\Users\Varsh\AppData\Local\Programs\Tesseract-OCR\tessdata'
-
-        with tempfile.NamedTemporaryFile(mode='w', delete=False, suffix='.txt') as tmp:
-            out_base = tmp.name.replace('.txt', '')
-
-        # Run Tesseract with TSV output — gives us word positions and heights
-        subprocess.run(
-            [tesseract_cmd, str(image_path), out_base, 'tsv'],
-            env=env, capture_output=True, text=True
-        )
-
-        tsv_file = out_base + '.tsv'
-        if not os.path.exists(tsv_file):
-            return None  # fall back to plain OCR
+        return dates, failed
 
-        # Parse the TSV file
-        lines_dict = {}  # key=(block,par,line) → {'height': max_height, 'words': []}
-        with open(tsv_file, 'r', encoding='utf-8') as f:
-            headers = f.readline().strip().split('\t')  # skip header row
-            for row in f:
-                cols = row.strip().split('\t')
-                if len(cols) < 12:
-                    continue
-                try:
-                    height = int(cols[8])   # bounding box height = font size proxy
-                    conf   = int(cols[10])  # confidence score
-                    word   = cols[11]       # the recognised word
-                except (ValueError, IndexError):
-                    continue
-
-                if conf < 30 or not word.strip():  # skip low-confidence or empty words
-                    continue
-
-                block = cols[2]; par = cols[3]; line = cols[4]
-                key = (block, par, line)
-                if key not in lines_dict:
-                    lines_dict[key] = {'height': 0, 'words': []}
-                lines_dict[key]['words'].append(word)
-                lines_dict[key]['height'] = max(lines_dict[key]['height'], height)
-
-        os.remove(tsv_file)
-
-        if not lines_dict:
-            return None
+    def extract_dates_batch(self, texts, jobs=1, chunk_size=BATCH_CHUNK_SIZE):
+        """
+        extract_dates_from_text() for many strings at once (chat messages,
+        subjects, notes). Returns one date list per input, in input order.
 
-        # Sort lines largest font first, then join into a single string
-        sorted_lines = sorted(lines_dict.values(), key=lambda x: x['height'], reverse=True)
-        return '\n'.join(' '.join(l['words']) for l in sorted_lines)
+        Per string it skips what a single call always pays for: strings
+        without a digit can't hold a date and are answered straight away,
+        the line-joining rewrites only run on multi-line strings, and
+        repeated strings within a chunk are only scanned once. The
+        normalization memo is shared by every item.
 
+        With jobs > 1 the strings are sent to a process pool in chunks of
+        chunk_size (worth it from roughly a hundred thousand strings on).
+        """
+        if jobs <= 1:
+            with self.stats.time('batch'):
+                return self._extract_batch_chunk(texts)
+
+        from concurrent.futures import ProcessPoolExecutor
+
+        results = []
+        with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker,
+                                 initargs=(self.worker_options(),)) as pool:
+            for chunk_results in _bounded_map(pool, _extract_batch_worker, _chunked(texts, chunk_size), jobs * 2):
+                results.extend(chunk_results)
+        return results
+
+    def _extract_batch_chunk(self, texts):
+        scan = self.matcher.scan
+        collect = self._collect_dates
+        has_digit = _DIGIT.search
+        results = []
+        memo = {}   # text → dates, for repeats within this chunk
+        for text in texts:
+            dates = memo.get(text)
+            if dates is None:
+                if not has_digit(text):
+                    dates = []
+                else:
+                    if '\n' in text:
+                        text_joined = _JOIN_MONTH_YEAR.sub(r'\1 \2', _JOIN_DAYS_MONTH.sub(r'\1 \2', text))
+                    else:
+                        text_joined = text
+                    dates = collect(scan(text_joined))[0]
+                if len(memo) < BATCH_MEMO_ITEMS:
+                    memo[text] = dates
+                results.append(dates)
+            else:
+                results.append(list(dates))   # each result is its own list
+        self.stats.count('batch_items', len(results))
+        return results
+    
+    @property
+    def ocr_engine(self):
+        """The OCR backend (see get_ocr_backend) this extractor runs Tesseract through."""
+        return get_ocr_backend(self.ocr_backend, self.ocr_lang)
+
+    def _check_deadline(self):
+        """Raise TimeoutError if the deadline has passed"""
+        if self.deadline is not None and time.monotonic() >= self.deadline:
+            raise TimeoutError("extraction took longer than its deadline")
+
+    def _time_left(self):
+        """Timeout for one Tesseract or poppler call: ocr_timeout, cut short by the deadline"""
+        if self.deadline is None:
+            return self.ocr_timeout
+        self._check_deadline()
+        left = self.deadline - time.monotonic()
+        return left if self.ocr_timeout is None else min(left, self.ocr_timeout)
+
+    def run_ocr(self, image_path):
+        """
+        Run Tesseract once in TSV mode and return an OcrResult.
+        TSV comes back in memory, so no temp files are written.
+        If an OCR cache is set, identical images are served from it instead.
+        Returns None if Tesseract produced no output.
+        """
+        key = None
+        if self.ocr_cache is not None:
+            with open(image_path, 'rb') as f:
+                data = f.read()
+            key = self.ocr_cache.make_key(data, self.ocr_engine.version(), self._ocr_config("tsv"))
+            tsv = self.ocr_cache.get(key)
+            if tsv is not None:
+                self.stats.count('ocr_cache_hits')
+                with self.stats.time('tsv_parse'):
+                    return OcrResult.from_tsv(tsv)
+            self.stats.count('ocr_cache_misses')
+
+        tsv = self._run_tesseract(image_path)
+        if tsv is None:
+            return None
+        if key is not None:
+            self.ocr_cache.put(key, tsv)
+        with self.stats.time('tsv_parse'):
+            return OcrResult.from_tsv(tsv)
+
+    def _ocr_config(self, suffix):
+        """OCR settings that change Tesseract's output, for the cache key"""
+        config = f"lang={self.ocr_lang};{suffix}"
+        if self.preprocess is not None:
+            config += f";pre={self.preprocess.spec()}"
+        if self.ocr_tiles > 1:
+            config += f";tiles={self.ocr_tiles}"
+        return config
+
+    def _run_tesseract(self, image_path):
+        """Tesseract's TSV output for an image file, or None if it produced nothing"""
+        if self.preprocess is not None or self.ocr_tiles > 1:
+            with _PIL.get().open(image_path) as image:
+                # Opening only reads the header; small images still go to Tesseract by path
+                if self.preprocess is not None or len(self._plan_tiles(image)) > 1:
+                    return self._ocr_pil_image(image)
+        self.stats.count('ocr_calls')
+        with self.stats.time('ocr'):
+            return self.ocr_engine.tsv_from_path(image_path, timeout=self._time_left())
+
+    def extract_text_by_fontsize(self, image_path, ocr=None):
+        """
+        Return the image text with the largest font lines first.
+        Pass an existing OcrResult to avoid running Tesseract again.
+        Returns None if there is no confident text (caller falls back to plain OCR).
+        """
+        if ocr is None:
+            ocr = self.run_ocr(image_path)
+        if ocr is None:
+            return None
+        return ocr.text_by_fontsize()
 
-    def extract_event_name(self, image_path):
+    def extract_event_name(self, image_path, ocr=None):
         """
         Returns the largest text from the image that isn't a date.
         This is assumed to be the event/poster title.
         Falls back to filename if TSV parsing fails.
         """
-
-
-        tesseract_cmd = r'C:\Users\Varsh\AppData\Local\Programs\Tesseract-OCR\tesseract.exe'
-        env = os.environ.copy()
-        env['TESSDATA_PREFIX'] = r'C:\Users\Varsh\AppData\Local\Programs\Tesseract-OCR\tessdata'
-
-        with tempfile.NamedTemporaryFile(mode='w', delete=False, suffix='.txt') as tmp:
-            out_base = tmp.name.replace('.txt', '')
-
-        subprocess.run(
-            [tesseract_cmd, str(image_path), out_base, 'tsv'],
-            env=env, capture_output=True, text=True
-        )
-
-        tsv_file = out_base + '.tsv'
-        if not os.path.exists(tsv_file):
+        if ocr is None:
+            ocr = self.run_ocr(image_path)
+        if ocr is None:
             return Path(image_path).stem  # fallback to filename
 
-        # Parse TSV and group by lines, track max height
-        lines_dict = {}
-        with open(tsv_file, 'r', encoding='utf-8') as f:
-            f.readline()  # skip header
-            for row in f:
-                cols = row.strip().split('\t')
-                if len(cols) < 12:
-                    continue
-                try:
-                    height = int(cols[8])
-                    conf = int(cols[10])
-                    word = cols[11]
-                except (ValueError, IndexError):
-                    continue
-                if conf < 30 or not word.strip():
-                    continue
-
-                block, par, line = cols[2], cols[3], cols[4]
-                key = (block, par, line)
-                if key not in lines_dict:
-                    lines_dict[key] = {'height': 0, 'words': []}
-                lines_dict[key]['words'].append(word)
-                lines_dict[key]['height'] = max(lines_dict[key]['height'], height)
-
-        os.remove(tsv_file)
-
-        if not lines_dict:
-            return Path(image_path).stem
-
-        # Sort by height, get the largest non-date line
-        sorted_lines = sorted(lines_dict.values(), key=lambda x: x['height'], reverse=True)
-        
-        for line in sorted_lines:
+        for line in ocr.lines_by_fontsize():
             text = ' '.join(line['words'])
             # Skip if this line looks like a date (contains month names or lots of numbers)
             if any(month in text.lower() for month in ['jan', 'feb', 'mar', 'apr', 'may', 'jun', 
@@ -318,74 +1236,238 @@ class DateExtractor:
             return text.strip()
 
         # Fallback if all large text looks like dates
-        print(f"Extracted text from {image_path}")
-        event_name = self.extract_event_name(image_path)
-        dates = self.extract_dates_from_text(text_to_use)
-        return {'event_name': event_name, 'dates': dates}
-
+        return Path(image_path).stem
 
     def extract_from_image(self, image_path):
         """Extract text from image using OCR, then extract dates"""
-        if not OCR_AVAILABLE:
+        if not _PIL.available:
             print(f"Skipping image {image_path}: OCR not available")
-            return []
+            return FailedExtraction(reason='OCR not available')
 
         try:
-            import subprocess
-            import tempfile
-
-            tesseract_cmd = r'C:\Users\Varsh\AppData\Local\Programs\Tesseract-OCR\tesseract.exe'
-            image_path_str = str(image_path)
-
-            with tempfile.NamedTemporaryFile(mode='w', delete=False, suffix='.txt') as tmp:
-                output_file = tmp.name
-
-            env = os.environ.copy()
-            env['TESSDATA_PREFIX'] = r'C:\Users\Varsh\AppData\Local\Programs\Tesseract-OCR\tessdata'
-
-            cmd = [tesseract_cmd, image_path_str, output_file.replace('.txt', '')]
-            subprocess.run(cmd, env=env, capture_output=True, text=True)
-
-            if os.path.exists(output_file):
-                with open(output_file, 'r', encoding='utf-8') as f:
-                    plain_text = f.read()
-                os.remove(output_file)
+            ocr = self.run_ocr(image_path)
+            if ocr is None:
+                print(f"Error processing image {image_path}: No output from tesseract")
+                return FailedExtraction(reason='no output from tesseract')
 
-                # Try font-size aware extraction first (largest text = most important date)
-                sized_text = self.extract_text_by_fontsize(image_path)
-                text_to_use = sized_text if sized_text else plain_text
+            # Try font-size aware extraction first (largest text = most important date)
+            sized_text = self.extract_text_by_fontsize(image_path, ocr=ocr)
+            text_to_use = sized_text if sized_text else ocr.plain_text()
 
-                print(f"Extracted text from {image_path}")
-                return self.extract_dates_from_text(text_to_use)
-            else:
-                print(f"Error processing image {image_path}: No output from tesseract")
-                return []
+            print(f"Extracted text from {image_path}")
+            return self.extract_dates_from_text(text_to_use)
         except Exception as e:
             print(f"Error processing image {image_path}: {e}")
-            return []
+            return FailedExtraction(reason=str(e))
 
-    def extract_from_pdf(self, pdf_path):
+    def extract_from_pdf(self, pdf_path, max_pages=None, stop_after_n_dates=None):
         """Extract text from PDF, then extract dates"""
-        if not PDF_AVAILABLE:
+        if not _PYPDF2.available:
             print(f"Skipping PDF {pdf_path}: PyPDF2 not available")
-            return []
+            return FailedExtraction(reason='PyPDF2 not available')
 
         try:
-            dates = []
-            with open(pdf_path, 'rb') as file:
-                pdf_reader = PyPDF2.PdfReader(file)
-                for page_num, page in enumerate(pdf_reader.pages):
-                    text = page.extract_text()
-                    page_dates = self.extract_dates_from_text(text)
-                    dates.extend([f"{d} (page {page_num + 1})" for d in page_dates])
+            unread = []
+            dates = [f"{d} (page {page_num})" for page_num, d in
+                     self.iter_pdf_dates(pdf_path, max_pages=max_pages, stop_after_n_dates=stop_after_n_dates,
+                                         jobs=self.pdf_jobs, unread_pages=unread)]
+            if unread:
+                print(f"Extracted dates from {pdf_path}, but scanned pages {unread} couldn't be OCR'd")
+                return FailedExtraction(dates, reason=f"scanned pages {unread} not OCR'd")
             print(f"Extracted dates from {pdf_path}")
             return dates
         except Exception as e:
             print(f"Error processing PDF {pdf_path}: {e}")
+            return FailedExtraction(reason=str(e))
+
+    def iter_pdf_dates(self, pdf_path, max_pages=None, stop_after_n_dates=None, jobs=1, unread_pages=None):
+        """
+        Lazily yield (page_number, date) pairs from a PDF, page by page.
+
+        max_pages           — only look at the first N pages
+        stop_after_n_dates  — stop as soon as this many dates have been yielded
+        jobs                — extract pages in this many worker processes
+                              (only used for documents of PDF_PARALLEL_MIN_PAGES or more)
+        unread_pages        — list the numbers of text-less pages are added to
+                              when pdf_ocr is on but OCR isn't available
+
+        Pages are yielded in order as soon as they are done, so a caller that
+        only needs the first event date can stop after page 1. Stopping early
+        (or breaking out of the loop) cancels the pages not started yet.
+        """
+        with open(pdf_path, 'rb') as file:
+            page_count = len(_PYPDF2.get().PdfReader(file).pages)
+        if max_pages is not None:
+            page_count = min(page_count, max_pages)
+
+        if jobs > 1 and page_count >= PDF_PARALLEL_MIN_PAGES:
+            pages = self._iter_pdf_pages_parallel(pdf_path, page_count, jobs)
+        else:
+            pages = self._iter_pdf_pages(pdf_path, 0, page_count)
+
+        found = 0
+        try:
+            for page_num, page_dates in pages:
+                if isinstance(page_dates, FailedExtraction) and unread_pages is not None:
+                    unread_pages.append(page_num)
+                for d in page_dates:
+                    yield page_num, d
+                    found += 1
+                    if stop_after_n_dates is not None and found >= stop_after_n_dates:
+                        return
+        finally:
+            pages.close()
+
+    def _iter_pdf_pages(self, pdf_path, start, stop, pdf_reader=None, digest=None):
+        """
+        (page_number, dates) for pages start..stop-1, extracted in this process.
+        pdf_reader and digest (the PDF's _file_digest) are reused if the caller
+        already has them; otherwise the file is hashed once, when the first
+        scanned page looks in the OCR cache.
+        """
+        with contextlib.ExitStack() as stack:
+            if pdf_reader is None:
+                pdf_reader = _PYPDF2.get().PdfReader(stack.enter_context(open(pdf_path, 'rb')))
+
+            def ocr_scanned(indexes):
+                nonlocal digest
+                if digest is None and indexes and self.ocr_cache is not None:
+                    digest = _file_digest(pdf_path)
+                for page_index, page_text in self.ocr_pdf_pages(pdf_path, indexes, digest):
+                    yield page_index + 1, self.extract_dates_from_text(page_text)
+
+            scanned = []   # text-less pages waiting to be rasterized together
+            for index in range(start, stop):
+                self._check_deadline()
+                with self.stats.time('pdf_text'):
+                    text = pdf_reader.pages[index].extract_text() or ''
+                if not text.strip() and self.can_ocr_pdf():
+                    scanned.append(index)
+                    if len(scanned) < PDF_OCR_BATCH:
+                        continue
+                # Scanned pages before this one go out first, so pages stay in order
+                if scanned:
+                    yield from ocr_scanned(scanned)
+                    scanned = []
+                if text.strip():
+                    yield index + 1, self.extract_dates_from_text(text)
+                elif not self.can_ocr_pdf():
+                    # A scan we were asked to OCR but can't: nothing read, not "no dates"
+                    yield index + 1, FailedExtraction() if self.pdf_ocr else []
+            yield from ocr_scanned(scanned)
+
+    def can_ocr_pdf(self):
+        """True if text-less PDF pages should be rasterized and OCR'd"""
+        return self.pdf_ocr and _PDF2IMAGE.available and _PIL.available
+
+    def ocr_pdf_pages(self, pdf_path, indexes, digest=None):
+        """
+        OCR text for scanned PDF pages (0-based indexes), as (index, text) in order.
+
+        Each page's TSV is cached under the PDF's content hash, page number and
+        DPI, so re-runs skip both rasterizing and Tesseract. Pass the hash as
+        digest when calling this for several batches of one document, so the
+        file is only read once. Pages that are not cached are rasterized in
+        contiguous runs (one poppler call per run) at pdf_ocr_dpi — higher is
+        more accurate, lower is faster.
+        """
+        if not indexes:
             return []
+        texts = {}
+        keys = {}
+        if self.ocr_cache is not None:
+            if digest is None:
+                digest = _file_digest(pdf_path)
+            config = self._ocr_config(f"dpi={self.pdf_ocr_dpi};pdfpage")
+            for index in indexes:
+                keys[index] = self.ocr_cache.make_key(f"{digest}:{index}".encode(), self.ocr_engine.version(), config)
+                tsv = self.ocr_cache.get(keys[index])
+                if tsv is not None:
+                    self.stats.count('ocr_cache_hits')
+                    with self.stats.time('tsv_parse'):
+                        texts[index] = OcrResult.from_tsv(tsv).plain_text()
+                else:
+                    self.stats.count('ocr_cache_misses')
+
+        missing = [index for index in indexes if index not in texts]
+        convert_from_path = _PDF2IMAGE.get()
+        for first, last in _contiguous_runs(missing):
+            with self.stats.time('pdf_raster'):
+                images = convert_from_path(str(pdf_path), dpi=self.pdf_ocr_dpi,
+                                           first_page=first + 1, last_page=last + 1, timeout=self._time_left())
+            for index, image in zip(range(first, last + 1), images):
+                tsv = self._ocr_pil_image(image)
+                with self.stats.time('tsv_parse'):
+                    texts[index] = OcrResult.from_tsv(tsv).plain_text() if tsv else ''
+                if tsv and index in keys:
+                    self.ocr_cache.put(keys[index], tsv)
+
+        return [(index, texts[index]) for index in indexes]
+
+    def _ocr_pil_image(self, image):
+        """Run Tesseract on an in-memory PIL image (preprocessed first, if configured)"""
+        if self.preprocess is not None:
+            with self.stats.time('preprocess'):
+                image = self.preprocess.apply(image)
+        bands = self._plan_tiles(image)
+        if len(bands) > 1:
+            return self._ocr_tiled(image, bands)
+        self.stats.count('ocr_calls')
+        with self.stats.time('ocr'):
+            return self.ocr_engine.tsv_from_image(image, timeout=self._time_left())
+
+    def _plan_tiles(self, image):
+        """The bands an image is OCR'd in (a single band unless tiling is on and the image is big)"""
+        if self.ocr_tiles <= 1:
+            return [(0, image.height, 0, image.height)]
+        from ocrTiles import plan_tiles
+        return plan_tiles(image.height, self.ocr_tiles)
+
+    def _ocr_tiled(self, image, bands):
+        """OCR the bands of one image at the same time and merge them into one TSV"""
+        from ocrTiles import merge_tiles
+
+        engine = self.ocr_engine
+        image.load()   # decode once, before the threads crop it
+
+        def ocr_band(band):
+            tsv = engine.tsv_from_image(image.crop((0, band[0], image.width, band[1])), timeout=self._time_left())
+            return OcrResult.from_tsv(tsv).words if tsv else []
+
+        self.stats.count('ocr_calls', len(bands))
+        self.stats.count('ocr_tiles', len(bands))
+        with self.stats.time('ocr'):
+            words = merge_tiles(list(zip(bands, _band_pool(self.ocr_tiles).map(ocr_band, bands))))
+        if not words:
+            return None
+        return OcrResult(words).to_tsv()
+
+    def _iter_pdf_pages_parallel(self, pdf_path, page_count, jobs):
+        """
+        (page_number, dates) for each page, extracted by a process pool, in page order.
+
+        Each task is a run of up to PDF_OCR_BATCH consecutive pages, so the
+        scanned pages among them are rasterized in one poppler call. The
+        file is hashed (for the OCR cache) once, here, not in every task.
+        """
+        from concurrent.futures import ProcessPoolExecutor
+
+        options = self.worker_options()
+        digest = _file_digest(pdf_path) if self.ocr_cache is not None and self.can_ocr_pdf() else None
+        run = min(PDF_OCR_BATCH, max(1, page_count // jobs))
+        pool = ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker, initargs=(options,))
+        try:
+            tasks = ((str(pdf_path), digest, start, min(start + run, page_count))
+                     for start in range(0, page_count, run))
+            for pages in _bounded_map(pool, _pdf_pages_worker, tasks, jobs * 2):
+                yield from pages
+        finally:
+            pool.shutdown(wait=True, cancel_futures=True)
 
     def extract_from_email(self, email_path):
         """Extract dates from email file"""
+        import email
+        from email import policy
         try:
             with open(email_path, 'rb') as f:
                 msg = email.message_from_binary_file(f, policy=policy.default)
@@ -399,11 +1481,12 @@ class DateExtractor:
                 subject_dates = self.extract_dates_from_text(msg['Subject'])
                 dates.extend([f"Subject: {d}" for d in subject_dates])
 
-            body = ""
+            # Collect the text parts and join once: += copies the whole body per part
             if msg.is_multipart():
-                for part in msg.walk():
-                    if part.get_content_type() == "text/plain":
-                        body += part.get_payload(decode=True).decode(errors='ignore')
+                parts = [part.get_payload(decode=True).decode(errors='ignore')
+                         for part in msg.walk() if part.get_content_type() == "text/plain"]
+                body = ''.join(parts)
+                del parts
             else:
                 body = msg.get_payload(decode=True).decode(errors='ignore')
 
@@ -414,83 +1497,344 @@ class DateExtractor:
             return dates
         except Exception as e:
             print(f"Error processing email {email_path}: {e}")
-            return []
+            return FailedExtraction(reason=str(e))
 
     def extract_from_text_file(self, text_path):
-        """Extract dates from plain text file"""
+        """Extract dates from plain text file (large files are streamed in chunks)"""
         try:
-            with open(text_path, 'r', encoding='utf-8', errors='ignore') as f:
-                text = f.read()
-            dates = self.extract_dates_from_text(text)
+            if self.stream_threshold is not None and os.path.getsize(text_path) > self.stream_threshold:
+                dates = list(self.iter_dates_from_text_file(text_path))
+            else:
+                with self.stats.time('read'), open(text_path, 'r', encoding='utf-8', errors='ignore') as f:
+                    text = f.read()
+                dates = self.extract_dates_from_text(text)
             print(f"Extracted dates from {text_path}")
             return dates
         except Exception as e:
             print(f"Error processing text file {text_path}: {e}")
-            return []
+            return FailedExtraction(reason=str(e))
 
-    def process_file(self, file_path):
-        """Process a single file based on its extension"""
-        file_path = Path(file_path)
-        extension = file_path.suffix.lower()
-        dates = []
-
-        if extension in ['.jpg', '.jpeg', '.png', '.gif', '.bmp', '.tiff']:
-            dates = self.extract_from_image(file_path)
-        elif extension == '.pdf':
-            dates = self.extract_from_pdf(file_path)
-        elif extension in ['.eml', '.msg']:
-            dates = self.extract_from_email(file_path)
-        elif extension in ['.txt', '.text', '.md']:
-            dates = self.extract_from_text_file(file_path)
-        else:
-            print(f"Unknown extension {extension}, attempting to read as text...")
-            dates = self.extract_from_text_file(file_path)
+    def iter_dates_from_text_file(self, text_path, chunk_size=STREAM_CHUNK_SIZE, overlap=STREAM_OVERLAP):
+        """
+        Yield the dates in a text file one by one while reading it in chunks,
+        so memory stays bounded however big the file is.
+
+        Each window ends on whitespace and the next window starts again
+        `overlap` bytes earlier, on a word boundary, so a date split over a
+        chunk boundary or over two lines ("25,26,27\nFEB 2026") is still seen
+        whole. Dates found twice in the overlap are only yielded once. Stretches
+        of the file with no digits are skipped without being decoded.
+        Dates come out in file order, not grouped by pattern like
+        extract_dates_from_text().
+        """
+        seen = set()
+        for window in self._iter_text_file_windows(text_path, chunk_size, overlap):
+            self._check_deadline()
+            for date in self.extract_dates_from_text(window):
+                if date not in seen:
+                    seen.add(date)
+                    yield date
+
+    def _iter_text_file_windows(self, text_path, chunk_size, overlap):
+        """
+        The decoded windows of a text file that are worth scanning.
 
-        if dates:
+        The file is memory-mapped and searched for candidate spans at the
+        byte level (see _candidate_spans), so only lines near a digit are
+        copied out and decoded; the OS pages the rest in and out as needed.
+        Files that can't be mapped (empty files, pipes) are read in chunks.
+        """
+        with open(text_path, 'rb') as f:
+            try:
+                mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except (ValueError, OSError):
+                mapped = None
+        if mapped is None:
+            with open(text_path, 'r', encoding='utf-8', errors='ignore') as f:
+                yield from _iter_text_windows(f, chunk_size, overlap)
+            return
+
+        with mapped:
+            decoded = 0
+            for start, end in _candidate_spans(mapped, chunk_size, overlap):
+                decoded += end - start
+                with self.stats.time('read'):
+                    window = mapped[start:end].decode('utf-8', errors='ignore')
+                yield window
+            self.stats.count('text_bytes_decoded', decoded)
+            self.stats.count('text_bytes_skipped', max(0, len(mapped) - decoded))
+
+    def extract_file(self, file_path, kind=None):
+        """
+        Extract dates from a single file based on what it contains (nothing is
+        recorded). kind is what fileTypes.sniff_file() already said the file
+        is, if the caller knows (saves reading its header again).
+        """
+        if not self.profile:
+            return self._extract_file(file_path, kind)
+        # Time this file on its own Stats, then add it to the running total
+        total, self.stats = self.stats, Stats()
+        try:
+            with self.stats.time('total'):
+                return self._extract_file(file_path, kind)
+        finally:
+            file_stats, self.stats = self.stats, total
+            self.record_file_stats(file_path, file_stats)
+
+    def record_file_stats(self, file_path, file_stats):
+        """Keep one file's Stats and add them to the total"""
+        self.file_stats.append((str(file_path), file_stats))
+        self.stats.merge(file_stats)
+
+    def _extract_file(self, file_path, kind=None):
+        # Route by what the file really is (magic bytes), not by its extension
+        file_path = Path(file_path)
+        if kind is None:
+            try:
+                kind, description = sniff_file(file_path)
+            except OSError as e:
+                print(f"Error reading {file_path}: {e}")
+                return FailedExtraction(reason=str(e))
+
+        if kind is None:
+            self.stats.count('files_skipped')
+            print(f"Skipping {file_path}: {description}")
+            return []
+        if kind == IMAGE:
+            return self.extract_from_image(file_path)
+        if kind == PDF:
+            return self.extract_from_pdf(file_path)
+        if kind == EMAIL:
+            return self.extract_from_email(file_path)
+        return self.extract_from_text_file(file_path)
+
+    def make_entry(self, file_path, dates):
+        """Build the extracted_dates entry for a file, or None if nothing was found"""
+        if not dates:
+            return None
         # Handle both old format (list) and new format (dict with event_name)
-            if isinstance(dates, dict) and 'event_name' in dates:
-                self.extracted_dates.append({
-                    'file': str(file_path),
-                    'event_name': dates['event_name'],
-                    'dates': dates['dates']
-                })
-            else:
-                # Fallback for PDFs/emails/text files (no event name extraction yet)
-                self.extracted_dates.append({
-                    'file': str(file_path),
-                    'event_name': Path(file_path).stem,
-                    'dates': dates if isinstance(dates, list) else []
-                })
+        if isinstance(dates, dict) and 'event_name' in dates:
+            return {
+                'file': str(file_path),
+                'event_name': dates['event_name'],
+                'dates': dates['dates']
+            }
+        # Fallback for PDFs/emails/text files (no event name extraction yet)
+        return {
+            'file': str(file_path),
+            'event_name': Path(file_path).stem,
+            'dates': dates if isinstance(dates, list) else []
+        }
+
+    def record_entry(self, entry):
+        """Add a finished file's entry to the results and stream it to the writers"""
+        if entry:
+            if self.keep_results:
+                self.extracted_dates.append(entry)
+            for writer in self.writers:
+                writer.write(entry)
 
+    def process_file(self, file_path):
+        """
+        Extract and record a single file. It is routed by what it contains
+        (see extract_file), not its extension; large text files are
+        memory-mapped and only the spans around digits are decoded.
+        """
+        dates = self.extract_file(file_path)
+        self.record_entry(self.make_entry(file_path, dates))
         return dates
 
-    def process_directory(self, directory):
-        """Process all supported files in a directory"""
+    def process_files(self, file_paths, jobs=1, max_in_flight=None, manifest=None, kinds=None):
+        """
+        Process many files. With jobs > 1 they are fanned out to a process pool
+        (Tesseract and PyPDF2 are CPU-bound), with at most max_in_flight files
+        queued at once. Results are recorded in input order either way.
+
+        With a fileManifest.FileManifest, files that haven't changed since the
+        last run reuse their stored dates and only the rest are extracted.
+        kinds maps os.fspath(file) to its already sniffed kind (FileFilter.kinds).
+        """
+        if manifest is not None:
+            self._process_files_incremental(list(file_paths), jobs, max_in_flight, manifest, kinds)
+            return
+        for file_path, dates in self._iter_extracted(file_paths, jobs, max_in_flight, kinds):
+            self.record_entry(self.make_entry(file_path, dates))
+
+    def _iter_extracted(self, file_paths, jobs=1, max_in_flight=None, kinds=None):
+        """(file_path, dates) for each file, in input order"""
+        if kinds is None:
+            kinds = {}   # not `kinds or {}`: FileFilter.kinds starts empty and fills up as walk() goes
+        if isinstance(file_paths, list) and len(file_paths) < 2:
+            jobs = 1   # nothing to fan out; a single PDF can still use pdf_jobs
+        tasks = ((file_path, kinds.get(os.fspath(file_path))) for file_path in file_paths)
+        if jobs <= 1:
+            for file_path, kind in tasks:
+                yield file_path, self.extract_file(file_path, kind)
+            return
+
+        from concurrent.futures import ProcessPoolExecutor
+
+        max_in_flight = max_in_flight or jobs * 4
+        with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker,
+                                 initargs=(self.worker_options(),)) as pool:
+            for file_path, dates, file_stats in _bounded_map(pool, _extract_file_worker, tasks, max_in_flight):
+                if file_stats is not None:
+                    self.record_file_stats(file_path, Stats.from_dict(file_stats))
+                yield file_path, dates
+
+    def _process_files_incremental(self, file_paths, jobs, max_in_flight, manifest, kinds=None):
+        settings = self.extraction_settings()
+        checked = [(file_path, manifest.lookup(file_path, settings)) for file_path in file_paths]
+
+        # Only changed files go to extraction; results are merged back in input order
+        changed = [file_path for file_path, (_, reused, _) in checked if not reused]
+        extracted = self._iter_extracted(changed, jobs, max_in_flight, kinds)
+        for file_path, (fingerprint, reused, dates) in checked:
+            if not reused:
+                _, dates = next(extracted)
+                # A file that couldn't be read isn't stored, so the next run tries it again
+                if isinstance(dates, FailedExtraction):
+                    manifest.failed += 1
+                else:
+                    manifest.record(file_path, fingerprint, dates, settings)
+            self.record_entry(self.make_entry(file_path, dates))
+
+    def extraction_settings(self):
+        """The settings that change what extraction returns, as a string (stored in the manifest)"""
+        import json
+        options = self.worker_options()
+        for irrelevant in ('ocr_cache_path', 'ocr_timeout', 'stream_threshold', 'profile'):
+            options.pop(irrelevant)
+        if options['ocr_tiles'] <= 1:
+            options.pop('ocr_tiles')   # so manifests written before tiling existed stay valid
+        return json.dumps(options, sort_keys=True)
+
+    def worker_options(self):
+        """Settings a pool worker needs to build an equivalent DateExtractor"""
+        return {
+            'ocr_cache_path': self.ocr_cache.path if self.ocr_cache is not None else None,
+            'ocr_lang': self.ocr_lang,
+            'stream_threshold': self.stream_threshold,
+            'ocr_timeout': self.ocr_timeout,
+            'pdf_ocr': self.pdf_ocr,
+            'pdf_ocr_dpi': self.pdf_ocr_dpi,
+            'ocr_backend': self.ocr_backend,
+            'preprocess': self.preprocess.spec() if self.preprocess is not None else None,
+            'ocr_tiles': self.ocr_tiles,
+            'profile': self.profile,
+        }
+
+    @classmethod
+    def from_worker_options(cls, options):
+        ocr_cache = None
+        if options['ocr_cache_path']:
+            from ocrCache import OcrCache
+            ocr_cache = OcrCache(options['ocr_cache_path'])
+        return cls(output_file=None, ocr_cache=ocr_cache, ocr_lang=options['ocr_lang'],
+                   stream_threshold=options['stream_threshold'], ocr_timeout=options['ocr_timeout'],
+                   pdf_ocr=options['pdf_ocr'], pdf_ocr_dpi=options['pdf_ocr_dpi'],
+                   ocr_backend=options['ocr_backend'], preprocess=options['preprocess'],
+                   ocr_tiles=options['ocr_tiles'], profile=options['profile'])
+
+    def process_directory(self, directory, jobs=1, manifest=None, file_filter=None):
+        """
+        Process all supported files in a directory. With a manifest only new
+        or modified files are extracted, and files that are gone are marked deleted.
+        A fileTypes.FileFilter picks the files (default: skip empty and binary files).
+        """
         directory = Path(directory)
-        for file_path in directory.rglob('*'):
-            if file_path.is_file():
-                self.process_file(file_path)
+        file_filter = file_filter or FileFilter()
+        files = file_filter.walk(directory)
+        if manifest is None:
+            self.process_files(files, jobs=jobs, kinds=file_filter.kinds)
+            return
+        files = list(files)
+        self.process_files(files, jobs=jobs, manifest=manifest, kinds=file_filter.kinds)
+        manifest.mark_deleted(directory, files)
 
     def save_results(self):
         """Save all extracted dates to output file"""
-        with open(self.output_file, 'w', encoding='utf-8') as f:
-            f.write(f"Date Extraction Results\n")
-            f.write(f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
-            f.write("=" * 80 + "\n\n")
-
-            if not self.extracted_dates:
-                f.write("No dates found.\n")
-            else:
-                for item in self.extracted_dates:
-                    event_name = item.get('event_name', 'Unknown Event')
-                    f.write(f"Event: {event_name}\n")
-                    f.write(f"File: {item['file']}\n")
-                    f.write("-" * 80 + "\n")
-                    for date in item['dates']:
-                        f.write(f"  • {date}\n")
-                    f.write("\n")
+        with TextReportWriter(self.output_file) as writer:
+            for item in self.extracted_dates:
+                writer.write(item)
 
         print(f"\nResults saved to: {self.output_file}")
         print(f"Total files processed: {len(self.extracted_dates)}")
         total_dates = sum(len(item['dates']) for item in self.extracted_dates)
-        print(f"Total dates found: {total_dates}")
\ No newline at end of file
+        print(f"Total dates found: {total_dates}")
+
+
+# ─────────────────────────────────────────
+# Process-pool helpers for parallel ingestion
+# ─────────────────────────────────────────
+
+_worker_extractor = None
+
+
+def _init_worker(options):
+    """Runs once in each pool process: build the extractor every task will reuse"""
+    global _worker_extractor
+    _worker_extractor = DateExtractor.from_worker_options(options)
+
+
+def _extract_file_worker(task):
+    """(file_path, dates, the file's stats as a dict or None when not profiling) for a (file_path, kind) task"""
+    file_path, kind = task
+    dates = _worker_extractor.extract_file(file_path, kind)
+    file_stats = None
+    if _worker_extractor.profile:
+        file_stats = _worker_extractor.file_stats.pop()[1].as_dict()
+    return file_path, dates, file_stats
+
+
+_worker_pdf = (None, None)   # (path, PdfReader) kept open between page tasks
+
+
+def _pdf_pages_worker(task):
+    """[(page_number, dates)] for a run of PDF pages; the reader is reused while tasks are for the same file"""
+    global _worker_pdf
+    pdf_path, digest, start, stop = task
+    if _worker_pdf[0] != pdf_path:
+        _worker_pdf = (pdf_path, _PYPDF2.get().PdfReader(pdf_path))
+    return list(_worker_extractor._iter_pdf_pages(pdf_path, start, stop, pdf_reader=_worker_pdf[1], digest=digest))
+
+
+def _extract_batch_worker(texts):
+    return _worker_extractor._extract_batch_chunk(texts)
+
+
+def _chunked(items, size):
+    """Lists of up to size items from any iterable"""
+    chunk = []
+    for item in items:
+        chunk.append(item)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _bounded_map(executor, fn, items, max_in_flight):
+    """
+    Like executor.map, but only keeps max_in_flight tasks submitted at a time
+    so huge inputs don't queue up all at once. Results come back in input order.
+    """
+    from collections import deque
+
+    pending = deque()
+    for item in items:
+        pending.append(executor.submit(fn, item))
+        if len(pending) >= max_in_flight:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
+
+
+def __getattr__(name):
+    """The old eagerly-imported names, now resolved (and imported) on first access"""
+    if name in _LAZY_FLAGS:
+        return _LAZY_FLAGS[name].available
+    if name in _LAZY_NAMES:
+        return _LAZY_NAMES[name].get()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,163 @@
+"""
+fileManifest.py — Remembers what was already extracted, for incremental runs
+
+A nightly run over a shared drive only needs to look at the handful of files
+that changed since the last one. For every file the manifest stores its
+size, mtime, sha256 and the dates extraction produced, plus a fingerprint of
+the extraction settings.
+
+On the next run a file is reused as is when:
+
+    - size and mtime are unchanged (no need to read the file at all), or
+    - they changed but the content hash didn't (e.g. the file was touched), or
+    - it is a new path with the same content as a file already indexed
+      (the file was moved or copied)
+
+Everything else is extracted again. Files whose extraction failed (OCR not
+available, a Tesseract timeout, an unreadable PDF) are not recorded, so they
+are tried again on the next run. Files that disappeared from a scanned
+directory are marked deleted (deleted_at) rather than dropped from the table.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+
+
+class FileManifest:
+    def __init__(self, path="file_manifest.sqlite"):
+        self.path = path
+        self._lock = threading.Lock()
+        self.unchanged = 0
+        self.moved = 0
+        self.new = 0
+        self.modified = 0
+        self.deleted = 0
+        self.failed = 0   # extracted but not recorded, see DateExtractor._process_files_incremental
+
+        self._db = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS files ("
+            " path TEXT PRIMARY KEY,"
+            " size INTEGER NOT NULL,"
+            " mtime_ns INTEGER NOT NULL,"
+            " sha256 TEXT NOT NULL,"
+            " settings TEXT NOT NULL,"
+            " dates TEXT,"
+            " indexed_at REAL NOT NULL,"
+            " deleted_at REAL)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS files_sha256 ON files(sha256)")
+        self._db.commit()
+
+    @staticmethod
+    def file_key(file_path):
+        """Manifest rows are keyed by absolute path, so relative arguments still match"""
+        return os.path.abspath(file_path)
+
+    @staticmethod
+    def file_hash(file_path):
+        h = hashlib.sha256()
+        with open(file_path, 'rb') as f:
+            for block in iter(lambda: f.read(1024 * 1024), b''):
+                h.update(block)
+        return h.hexdigest()
+
+    def lookup(self, file_path, settings):
+        """
+        Check a file against the manifest.
+
+        Returns (fingerprint, reused, dates): fingerprint is what record()
+        needs, reused says whether the stored dates can be used instead of
+        extracting the file again.
+        """
+        key = self.file_key(file_path)
+        st = os.stat(file_path)
+        with self._lock:
+            row = self._db.execute(
+                "SELECT size, mtime_ns, sha256, settings, dates FROM files WHERE path = ? AND deleted_at IS NULL",
+                (key,)
+            ).fetchone()
+        if row is not None and row[3] == settings and row[0] == st.st_size and row[1] == st.st_mtime_ns:
+            self.unchanged += 1
+            return (st.st_size, st.st_mtime_ns, row[2]), True, _load_dates(row[4])
+
+        digest = self.file_hash(file_path)
+        fingerprint = (st.st_size, st.st_mtime_ns, digest)
+        if row is not None and row[3] == settings and row[2] == digest:
+            self.unchanged += 1
+            self.record(file_path, fingerprint, _load_dates(row[4]), settings)
+            return fingerprint, True, _load_dates(row[4])
+
+        with self._lock:
+            same_content = self._db.execute(
+                "SELECT dates FROM files WHERE sha256 = ? AND settings = ? LIMIT 1", (digest, settings)
+            ).fetchone()
+        if same_content is not None:
+            self.moved += 1
+            self.record(file_path, fingerprint, _load_dates(same_content[0]), settings)
+            return fingerprint, True, _load_dates(same_content[0])
+
+        if row is None:
+            self.new += 1
+        else:
+            self.modified += 1
+        return fingerprint, False, None
+
+    def record(self, file_path, fingerprint, dates, settings):
+        """Store a file's fingerprint and extracted dates (clears any deleted mark)"""
+        size, mtime_ns, digest = fingerprint
+        with self._lock, self._db:
+            self._db.execute(
+                "INSERT OR REPLACE INTO files (path, size, mtime_ns, sha256, settings, dates, indexed_at, deleted_at)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, NULL)",
+                (self.file_key(file_path), size, mtime_ns, digest, settings,
+                 json.dumps(dates), time.time())
+            )
+
+    def mark_deleted(self, directory, seen_paths):
+        """
+        Mark files under directory that the manifest knows about but that
+        weren't seen in this scan and no longer exist as deleted. Returns
+        their paths. A file the scan skipped (--exclude, --max-size, a
+        binary) is still there, so it isn't reported.
+        """
+        prefix = os.path.join(self.file_key(directory), '')
+        seen = {self.file_key(p) for p in seen_paths}
+        with self._lock, self._db:
+            known = self._db.execute(
+                "SELECT path FROM files WHERE deleted_at IS NULL AND substr(path, 1, ?) = ?",
+                (len(prefix), prefix)
+            ).fetchall()
+            gone = [path for (path,) in known if path not in seen and not os.path.exists(path)]
+            now = time.time()
+            self._db.executemany("UPDATE files SET deleted_at = ? WHERE path = ?", [(now, p) for p in gone])
+        self.deleted += len(gone)
+        return gone
+
+    def stats(self):
+        return {
+            'unchanged': self.unchanged,
+            'moved': self.moved,
+            'new': self.new,
+            'modified': self.modified,
+            'deleted': self.deleted,
+            'failed': self.failed,
+        }
+
+    def format_stats(self):
+        s = self.stats()
+        return (f"Manifest: {s['new']} new, {s['modified']} modified, {s['unchanged']} unchanged, "
+                f"{s['moved']} moved/copied, {s['deleted']} deleted, {s['failed']} failed (retried next run)")
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+
+def _load_dates(text):
+    return json.loads(text) if text is not None else []
@@ -0,0 +1,208 @@
+"""
+fileTypes.py — Decide what a file really is before extracting from it
+
+Extensions lie, and shared drives are full of files that can never hold a
+date we could read: compiled code, archives, databases, media. Decoding
+those as UTF-8 and regex-scanning the result costs more than everything
+else a run does. sniff() reads the first HEADER_BYTES of a file and says
+how to extract it:
+
+    image   JPEG, PNG, GIF, BMP or TIFF magic bytes (whatever the extension)
+    pdf     '%PDF-' near the start
+    email   .eml/.msg text, or text that starts with mail headers (unless the
+            extension says it is a text file: notes.txt starting with
+            "Date: ..." is still read as text)
+    text    anything else that decodes as text (UTF-8, or 8-bit with few
+            control characters)
+    None    binary or unsupported, with the reason ("zip archive", "binary")
+
+FileFilter picks the files a directory walk hands to the extractor:
+include/exclude globs, a size limit, empty files and binaries skipped, with
+a count of what was skipped and why. It remembers the kind it sniffed for
+every file it passes (kinds), so DateExtractor.process_files(kinds=...) can
+dispatch on it without reading each header a second time.
+"""
+
+import fnmatch
+import os
+import re
+from collections import Counter
+from pathlib import Path
+
+IMAGE, PDF, EMAIL, TEXT = 'image', 'pdf', 'email', 'text'
+
+# Bytes read from the start of a file to decide its type
+HEADER_BYTES = 8192
+
+# Extensions that mean plain text even when the file starts like a mail message
+TEXT_EXTENSIONS = ('.txt', '.text', '.md')
+
+# Share of control characters above which non-UTF-8 content counts as binary
+MAX_CONTROL_RATIO = 0.05
+
+# (magic bytes at offset 0, kind, description); kind None = skip
+MAGIC = [
+    (b'\xff\xd8\xff', IMAGE, 'JPEG image'),
+    (b'\x89PNG\r\n\x1a\n', IMAGE, 'PNG image'),
+    (b'GIF87a', IMAGE, 'GIF image'),
+    (b'GIF89a', IMAGE, 'GIF image'),
+    (b'II*\x00', IMAGE, 'TIFF image'),
+    (b'MM\x00*', IMAGE, 'TIFF image'),
+    (b'PK\x03\x04', None, 'zip archive'),
+    (b'PK\x05\x06', None, 'zip archive'),
+    (b'\x1f\x8b', None, 'gzip archive'),
+    (b'\xfd7zXZ\x00', None, 'xz archive'),
+    (b'7z\xbc\xaf\x27\x1c', None, '7z archive'),
+    (b'Rar!\x1a\x07', None, 'rar archive'),
+    (b'\x28\xb5\x2f\xfd', None, 'zstd archive'),
+    (b'\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1', None, 'OLE document (Outlook .msg, old Office)'),
+    (b'\x7fELF', None, 'ELF executable'),
+    (b'SQLite format 3\x00', None, 'SQLite database'),
+    (b'\xff\xfe', None, 'UTF-16 text (not supported)'),
+    (b'\xfe\xff', None, 'UTF-16 text (not supported)'),
+]
+
+# A mail message starts with a header line followed by another header (or a
+# folded continuation of the first). An mbox "From " line is read as text.
+_MAIL_HEADER = re.compile(
+    rb'(?:Return-Path|Received|Delivered-To|From|To|Date|Subject|Message-ID|MIME-Version|X-[\w-]+):[ \t]'
+    rb'[^\n]*\n(?:[ \t]|[\w-]+:)',
+    re.IGNORECASE)
+_CONTROL = bytes(c for c in range(32) if c not in b'\t\n\r\f\x1b') + b'\x7f'
+
+
+def _is_bmp(header):
+    # 'BM' alone is too common at the start of a text file; check the DIB header size too
+    return (header[:2] == b'BM' and len(header) >= 18
+            and int.from_bytes(header[14:18], 'little') in (12, 40, 52, 56, 64, 108, 124))
+
+
+def looks_like_text(header):
+    """True if a file starting with these bytes can be read as text"""
+    if b'\x00' in header:
+        return False
+    try:
+        header.decode('utf-8')
+        return True
+    except UnicodeDecodeError as e:
+        if e.reason == 'unexpected end of data' and e.start >= len(header) - 3:
+            return True   # the header read ended inside a multi-byte character
+    controls = len(header) - len(header.translate(None, _CONTROL))
+    return controls <= len(header) * MAX_CONTROL_RATIO
+
+
+def sniff(header, extension=''):
+    """(kind, description) for a file starting with `header` (see the module docstring)"""
+    for magic, kind, description in MAGIC:
+        if header.startswith(magic):
+            return kind, description
+    if _is_bmp(header):
+        return IMAGE, 'BMP image'
+    if b'%PDF-' in header[:1024]:
+        return PDF, 'PDF document'
+    if not looks_like_text(header):
+        return None, 'binary'
+    if extension in ('.eml', '.msg') or (extension not in TEXT_EXTENSIONS and _MAIL_HEADER.match(header)):
+        return EMAIL, 'mail message'
+    return TEXT, 'text'
+
+
+def sniff_file(file_path):
+    """(kind, description) for a file on disk, from one read of its first HEADER_BYTES"""
+    with open(file_path, 'rb') as f:
+        header = f.read(HEADER_BYTES)
+    if not header:
+        return None, 'empty'
+    return sniff(header, Path(file_path).suffix.lower())
+
+
+def parse_size(text):
+    """'500k', '20M', '2G' or a plain number of bytes → bytes"""
+    text = str(text).strip().upper().rstrip('B')
+    units = {'K': 1024, 'M': 1024 ** 2, 'G': 1024 ** 3}
+    if text and text[-1] in units:
+        return int(float(text[:-1]) * units[text[-1]])
+    return int(text)
+
+
+class FileFilter:
+    """
+    Which files a directory walk passes on. Globs without a '/' match a file
+    or directory name anywhere in the tree (so --exclude node_modules skips
+    the whole folder); globs with a '/' match the path relative to the
+    directory being walked. With include globs, only files matching one are
+    kept. skipped counts the rest by reason; kinds maps every passed file
+    (os.fspath of it) to the kind sniff() gave it.
+    """
+
+    def __init__(self, include=None, exclude=None, max_size=None, sniff=True):
+        self.include = list(include or [])
+        self.exclude = list(exclude or [])
+        self.max_size = max_size
+        self.sniff = sniff
+        self.skipped = Counter()
+        self.kinds = {}
+
+    @staticmethod
+    def _matches(patterns, name, relative):
+        return any(fnmatch.fnmatch(relative if '/' in pattern else name, pattern) for pattern in patterns)
+
+    def check(self, file_path):
+        """None if the file should be extracted, otherwise why it is skipped"""
+        return self._check(file_path)[0]
+
+    def _check(self, file_path):
+        """(why the file is skipped or None, its sniffed kind or None if not sniffed)"""
+        try:
+            size = os.path.getsize(file_path)
+        except OSError:
+            return 'unreadable', None
+        if size == 0:
+            return 'empty', None
+        if self.max_size is not None and size > self.max_size:
+            return 'too large', None
+        if not self.sniff:
+            return None, None
+        try:
+            kind, description = sniff_file(file_path)
+        except OSError:
+            return 'unreadable', None
+        return (description if kind is None else None), kind
+
+    def accept(self, file_path):
+        """check() for a file named directly (globs don't apply), counting skips and keeping the kind"""
+        reason, kind = self._check(file_path)
+        if reason is not None:
+            self.skipped[reason] += 1
+            return False
+        if kind is not None:
+            self.kinds[os.fspath(file_path)] = kind
+        return True
+
+    def walk(self, directory):
+        """The files under directory that pass the globs and check(), in a stable order"""
+        directory = Path(directory)
+        for root, dirs, files in os.walk(directory):
+            relative_root = Path(root).relative_to(directory).as_posix()
+            prefix = '' if relative_root == '.' else relative_root + '/'
+            dirs[:] = sorted(d for d in dirs if not self._matches(self.exclude, d, prefix + d))
+            for name in sorted(files):
+                relative = prefix + name
+                if self._matches(self.exclude, name, relative):
+                    self.skipped['excluded'] += 1
+                    continue
+                if self.include and not self._matches(self.include, name, relative):
+                    self.skipped['not included'] += 1
+                    continue
+                file_path = Path(root) / name
+                if not file_path.is_file():
+                    continue
+                if self.accept(file_path):
+                    yield file_path
+
+    def format_skipped(self):
+        """One line summing up the skipped files, or '' if none were"""
+        if not self.skipped:
+            return ''
+        parts = ', '.join(f"{n} {reason}" for reason, n in self.skipped.most_common())
+        return f"Skipped {sum(self.skipped.values())} files: {parts}"
@@ -0,0 +1,162 @@
+"""
+imagePreprocess.py — Clean up images before they go to Tesseract
+
+Telegram photos and phone scans arrive at full resolution, and Tesseract's
+run time grows with the pixel count. A Preprocessor runs a few cheap PIL
+steps first, in this order:
+
+    gray        convert to 8-bit grayscale (transparent areas become white)
+    dpi=N       rescale images that carry DPI metadata to N dots per inch
+    max=N       shrink so the longest side is at most N pixels
+    crop        crop to the area that holds dark "ink" pixels, plus a margin
+    binarize    black/white threshold (Otsu's method, or binarize=N for a fixed one)
+
+Steps are given as a comma-separated spec, e.g. "gray,max=2000,crop"
+("default" stands for DEFAULT_PREPROCESS). The spec is also part of the
+OCR cache key, so different settings never share cached results.
+benchmarks/bench_preprocess.py shows the speed/accuracy trade-off of each
+step on the sample images.
+"""
+
+from PIL import Image, ImageFilter
+
+
+DEFAULT_PREPROCESS = "gray,max=2000"
+
+# Blank border kept around the cropped text area, in pixels
+CROP_MARGIN = 16
+
+
+class Preprocessor:
+    def __init__(self, grayscale=False, target_dpi=None, max_side=None,
+                 autocrop=False, binarize=False, threshold=None):
+        self.grayscale = grayscale
+        self.target_dpi = target_dpi
+        self.max_side = max_side
+        self.autocrop = autocrop
+        self.binarize = binarize
+        self.threshold = threshold   # None = pick one per image (Otsu)
+
+    @classmethod
+    def from_spec(cls, spec):
+        """Build a Preprocessor from a spec like "gray,dpi=300,max=2000,crop,binarize" """
+        if spec.strip() == 'default':
+            spec = DEFAULT_PREPROCESS
+        options = {}
+        for step in filter(None, (s.strip() for s in spec.split(','))):
+            name, _, value = step.partition('=')
+            if name == 'gray':
+                options['grayscale'] = True
+            elif name == 'dpi':
+                options['target_dpi'] = int(value)
+            elif name == 'max':
+                options['max_side'] = int(value)
+            elif name == 'crop':
+                options['autocrop'] = True
+            elif name == 'binarize':
+                options['binarize'] = True
+                options['threshold'] = int(value) if value else None
+            else:
+                raise ValueError(f"Unknown preprocessing step {step!r} (use gray, dpi=N, max=N, crop, binarize[=N])")
+        return cls(**options)
+
+    def spec(self):
+        """The canonical spec string (round-trips through from_spec; used in cache keys)"""
+        steps = []
+        if self.grayscale:
+            steps.append('gray')
+        if self.target_dpi:
+            steps.append(f'dpi={self.target_dpi}')
+        if self.max_side:
+            steps.append(f'max={self.max_side}')
+        if self.autocrop:
+            steps.append('crop')
+        if self.binarize:
+            steps.append(f'binarize={self.threshold}' if self.threshold is not None else 'binarize')
+        return ','.join(steps)
+
+    def __repr__(self):
+        return f"Preprocessor({self.spec()!r})"
+
+    def apply(self, image):
+        """Return the preprocessed copy of a PIL image"""
+        if self.grayscale or self.autocrop or self.binarize:
+            image = to_grayscale(image)
+        image = self._resize(image)
+
+        threshold = None
+        if self.autocrop or self.binarize:
+            threshold = self.threshold if self.threshold is not None else otsu_threshold(image)
+        if self.autocrop:
+            image = crop_to_ink(image, threshold)
+        if self.binarize:
+            image = image.point(lambda v: 255 if v > threshold else 0)
+        return image
+
+    def _resize(self, image):
+        scale = 1.0
+        dpi = image.info.get('dpi')
+        if self.target_dpi and dpi and dpi[0]:
+            scale = self.target_dpi / float(dpi[0])
+        longest = max(image.size) * scale
+        if self.max_side and longest > self.max_side:
+            scale *= self.max_side / longest
+        if abs(scale - 1.0) < 0.01:
+            return image
+        size = (max(1, round(image.width * scale)), max(1, round(image.height * scale)))
+        return image.resize(size, Image.LANCZOS if scale < 1 else Image.BICUBIC)
+
+
+def to_grayscale(image):
+    """8-bit grayscale, flattening any transparency onto white"""
+    if image.mode == 'L':
+        return image
+    if image.mode in ('RGBA', 'LA') or (image.mode == 'P' and 'transparency' in image.info):
+        rgba = image.convert('RGBA')
+        background = Image.new('RGBA', rgba.size, (255, 255, 255, 255))
+        image = Image.alpha_composite(background, rgba)
+    return image.convert('L')
+
+
+def otsu_threshold(image):
+    """Gray level that best splits a grayscale image into ink and background"""
+    histogram = image.histogram()[:256]
+    total = sum(histogram)
+    if not total:
+        return 127
+    sum_all = sum(level * count for level, count in enumerate(histogram))
+    sum_below = 0
+    weight_below = 0
+    best_level, best_variance = 127, -1.0
+    for level, count in enumerate(histogram):
+        weight_below += count
+        if weight_below == 0:
+            continue
+        weight_above = total - weight_below
+        if weight_above == 0:
+            break
+        sum_below += level * count
+        mean_below = sum_below / weight_below
+        mean_above = (sum_all - sum_below) / weight_above
+        variance = weight_below * weight_above * (mean_below - mean_above) ** 2
+        if variance > best_variance:
+            best_level, best_variance = level, variance
+    return best_level
+
+
+def crop_to_ink(image, threshold, margin=CROP_MARGIN):
+    """
+    Crop a grayscale image to the box around its dark pixels. Isolated specks
+    are filtered out first so scanner noise doesn't stretch the box. Images
+    with no ink, or where the box is nearly the whole image, are returned as is.
+    """
+    ink = image.point(lambda v: 255 if v <= threshold else 0).filter(ImageFilter.MedianFilter(3))
+    box = ink.getbbox()
+    if box is None:
+        return image
+    left, top, right, bottom = box
+    box = (max(0, left - margin), max(0, top - margin),
+           min(image.width, right + margin), min(image.height, bottom + margin))
+    if (box[2] - box[0]) * (box[3] - box[1]) > 0.95 * image.width * image.height:
+        return image
+    return image.crop(box)
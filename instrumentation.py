@@ -0,0 +1,153 @@
+"""
+instrumentation.py — Opt-in per-stage timers and counters
+
+When a file is slow, Stats says where the time went. DateExtractor(profile=True)
+times each stage and counts what happened, per file and in total:
+
+    stages    ocr, preprocess, tsv_parse, pdf_text, pdf_raster, read,
+              prefilter, regex_scan, normalize, total
+    counters  ocr_calls, ocr_tiles, ocr_cache_hits, ocr_cache_misses, regex_matches,
+              dates_found, normalize_memo_hits, normalize_dateutil,
+              normalize_failed, text_bytes_decoded, text_bytes_skipped,
+              files_skipped, prefilter_chars_scanned, prefilter_chars_skipped
+
+Without profiling the extractor uses NULL_STATS, whose methods do nothing,
+so the hot paths pay one no-op call per stage.
+
+Stats can be merged (pool workers send theirs back as plain dicts) and
+exported in Prometheus' text exposition format with to_prometheus().
+"""
+
+import threading
+import time
+
+
+class _Timer:
+    __slots__ = ('stats', 'stage', 'start')
+
+    def __init__(self, stats, stage):
+        self.stats = stats
+        self.stage = stage
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.stats.add_time(self.stage, time.perf_counter() - self.start)
+
+
+class Stats:
+    enabled = True
+
+    def __init__(self):
+        self.seconds = {}    # stage → total seconds
+        self.calls = {}      # stage → number of timed calls
+        self.counters = {}   # name → count
+        self._lock = threading.Lock()
+
+    def time(self, stage):
+        """Context manager adding the time spent inside it to a stage"""
+        return _Timer(self, stage)
+
+    def add_time(self, stage, seconds, calls=1):
+        with self._lock:
+            self.seconds[stage] = self.seconds.get(stage, 0.0) + seconds
+            self.calls[stage] = self.calls.get(stage, 0) + calls
+
+    def count(self, name, n=1):
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + n
+
+    def merge(self, other):
+        """Add another Stats (or its as_dict()) into this one"""
+        if isinstance(other, Stats):
+            other = other.as_dict()
+        for stage, seconds in other['seconds'].items():
+            self.add_time(stage, seconds, other['calls'].get(stage, 0))
+        for name, n in other['counters'].items():
+            self.count(name, n)
+
+    def as_dict(self):
+        with self._lock:
+            return {'seconds': dict(self.seconds), 'calls': dict(self.calls), 'counters': dict(self.counters)}
+
+    @classmethod
+    def from_dict(cls, data):
+        stats = cls()
+        stats.merge(data)
+        return stats
+
+    def summary(self):
+        """One line: total time, then the stages that took longest"""
+        d = self.as_dict()
+        stages = sorted(((s, t) for s, t in d['seconds'].items() if s != 'total'), key=lambda st: -st[1])
+        parts = [f"{stage} {seconds * 1000:.1f}ms" for stage, seconds in stages]
+        total = d['seconds'].get('total')
+        head = f"{total * 1000:.1f}ms" if total is not None else "-"
+        return f"{head} ({', '.join(parts) or 'nothing timed'})"
+
+    def format(self, title="Profile"):
+        """Multi-line table of every stage and counter"""
+        d = self.as_dict()
+        lines = [title, f"  {'stage':<22} {'calls':>7} {'total ms':>10} {'avg ms':>9}"]
+        for stage, seconds in sorted(d['seconds'].items(), key=lambda st: -st[1]):
+            calls = d['calls'].get(stage, 0)
+            avg = seconds / calls * 1000 if calls else 0.0
+            lines.append(f"  {stage:<22} {calls:>7} {seconds * 1000:>10.1f} {avg:>9.2f}")
+        if d['counters']:
+            lines.append(f"  {'counter':<22} {'count':>7}")
+            for name, n in sorted(d['counters'].items()):
+                lines.append(f"  {name:<22} {n:>7}")
+        return '\n'.join(lines)
+
+    def to_prometheus(self, prefix='timely'):
+        """The stats in Prometheus' text exposition format"""
+        d = self.as_dict()
+        lines = [
+            f"# HELP {prefix}_stage_seconds_total Time spent in each extraction stage.",
+            f"# TYPE {prefix}_stage_seconds_total counter",
+        ]
+        lines += [f'{prefix}_stage_seconds_total{{stage="{s}"}} {t:.6f}' for s, t in sorted(d['seconds'].items())]
+        lines += [
+            f"# HELP {prefix}_stage_calls_total Number of times each extraction stage ran.",
+            f"# TYPE {prefix}_stage_calls_total counter",
+        ]
+        lines += [f'{prefix}_stage_calls_total{{stage="{s}"}} {n}' for s, n in sorted(d['calls'].items())]
+        lines += [
+            f"# HELP {prefix}_events_total Extraction events (OCR calls, cache hits, matches, ...).",
+            f"# TYPE {prefix}_events_total counter",
+        ]
+        lines += [f'{prefix}_events_total{{event="{e}"}} {n}' for e, n in sorted(d['counters'].items())]
+        return '\n'.join(lines) + '\n'
+
+
+class _NullTimer:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return None
+
+
+class _NullStats:
+    """Stand-in used when profiling is off: every method is a no-op"""
+    enabled = False
+    _timer = _NullTimer()
+
+    def time(self, stage):
+        return self._timer
+
+    def add_time(self, stage, seconds, calls=1):
+        pass
+
+    def count(self, name, n=1):
+        pass
+
+    def merge(self, other):
+        pass
+
+
+NULL_STATS = _NullStats()
@@ -1,48 +1,156 @@
 from pathlib import Path   # [116] 'Path' for safe, cross-platform file path handling
 import dateExtractor       # [117] Import our dateExtractor module (dateExtractor.py must be in the same folder)
 import sys                 # [118] 'sys' lets us read the command-line arguments the user types after the script name
+import argparse
+import os
+from ocrCache import OcrCache
+from fileManifest import FileManifest
+from resultWriters import WRITERS, make_writer
+from fileTypes import FileFilter, parse_size
+
+
+def print_usage():
+    print("Usage: python main.py [--jobs N] <file_or_directory> [file2] [file3] ...")
+    print("\nExample:")
+    print("  python main.py document.pdf")
+    print("  python main.py image.jpg email.eml")
+    print("  python main.py ./documents/")
+    print("  python main.py --jobs 8 ./documents/     (process 8 files at a time)")
+    print("  python main.py --ocr-pdf scanned.pdf     (OCR pages that have no text layer)")
+    print("  python main.py --ocr-tiles poster.jpg    (OCR a large image as parallel bands)")
+    print("  python main.py --incremental ./documents/ (only extract files changed since the last run)")
+    print("  python main.py --format jsonl --format ics ./documents/   (extracted_dates.jsonl + .ics)")
+    print("\nSupported formats:")
+    print("  - Images : .jpg  .png  .gif  .bmp  .tiff  (requires pytesseract + Tesseract)")
+    print("  - PDFs   : .pdf                            (requires PyPDF2; pdf2image for --ocr-pdf)")
+    print("  - Emails : .eml  .msg")
+    print("  - Text   : .txt  .md  or any plain text file")
 
 
 def main():
     """Entry point: reads file arguments from the terminal, processes them, and saves results"""
 
-    # [119] Create a DateExtractor instance — all results will accumulate inside this object.
-    # output_file sets the name of the text file where dates will be saved.
-    extractor = dateExtractor.DateExtractor(output_file="extracted_dates.txt")
-
     # [120] sys.argv is a list of everything the user typed in the terminal.
-    # sys.argv[0] = script name ("main.py")
-    # sys.argv[1], sys.argv[2], ... = the files/folders the user passed in
-    # Example: "python main.py invoice.pdf screenshot.jpg"
-    # → sys.argv = ["main.py", "invoice.pdf", "screenshot.jpg"]
-    if len(sys.argv) < 2:   # [121] If only the script name is present, no files were given — show help
-        print("Usage: python main.py <file_or_directory> [file2] [file3] ...")
-        print("\nExample:")
-        print("  python main.py document.pdf")
-        print("  python main.py image.jpg email.eml")
-        print("  python main.py ./documents/")
-        print("\nSupported formats:")
-        print("  - Images : .jpg  .png  .gif  .bmp  .tiff  (requires pytesseract + Tesseract)")
-        print("  - PDFs   : .pdf                            (requires PyPDF2)")
-        print("  - Emails : .eml  .msg")
-        print("  - Text   : .txt  .md  or any plain text file")
+    # argparse splits it into options (--jobs 4) and the files/folders the user passed in.
+    # Example: "python main.py --jobs 4 invoice.pdf screenshot.jpg"
+    # → args.jobs = 4, args.paths = ["invoice.pdf", "screenshot.jpg"]
+    parser = argparse.ArgumentParser(add_help=True)
+    parser.add_argument('paths', nargs='*')
+    parser.add_argument('--jobs', '-j', type=int, default=1,
+                        help="number of worker processes to extract files in parallel (default: 1)")
+    parser.add_argument('--ocr-pdf', action='store_true',
+                        help="OCR PDF pages that have no text layer (scanned PDFs, needs pdf2image + poppler)")
+    parser.add_argument('--dpi', type=int, default=200,
+                        help="resolution scanned PDF pages are rasterized at for --ocr-pdf (default: 200)")
+    parser.add_argument('--ocr-backend', choices=['auto', 'tesserocr', 'subprocess'], default='auto',
+                        help="how Tesseract is run: in-process via tesserocr, or the tesseract CLI "
+                             "(default: auto = tesserocr if installed)")
+    parser.add_argument('--preprocess', action='store_true',
+                        help="clean up images before OCR (gray,max=2000; see imagePreprocess.py)")
+    parser.add_argument('--preprocess-steps', metavar='STEPS',
+                        help="clean up images before OCR with these steps instead, "
+                             "e.g. 'gray,max=2000,crop,binarize' (implies --preprocess)")
+    parser.add_argument('--ocr-tiles', action='store_true',
+                        help="OCR large images as overlapping bands in parallel (one per CPU core)")
+    parser.add_argument('--ocr-tile-workers', type=int, metavar='N',
+                        help="with --ocr-tiles, cut large images into up to N bands (default: one per CPU core)")
+    parser.add_argument('--incremental', action='store_true',
+                        help="reuse dates for files unchanged since the last run (tracked in --manifest)")
+    parser.add_argument('--manifest', default='file_manifest.sqlite',
+                        help="manifest file used by --incremental (default: file_manifest.sqlite)")
+    parser.add_argument('--include', action='append', metavar='GLOB',
+                        help="in folders, only extract files matching GLOB (can be repeated, e.g. '*.pdf')")
+    parser.add_argument('--exclude', action='append', metavar='GLOB',
+                        help="in folders, skip files and folders matching GLOB (can be repeated, e.g. node_modules)")
+    parser.add_argument('--max-size', type=parse_size, metavar='SIZE',
+                        help="skip files bigger than SIZE, e.g. 200M (default: no limit)")
+    parser.add_argument('--format', '-f', action='append', choices=list(WRITERS), dest='formats',
+                        help="output format, can be repeated: text, jsonl, csv, ics (default: text)")
+    parser.add_argument('--output', '-o', default='extracted_dates',
+                        help="output file name without extension (default: extracted_dates)")
+    parser.add_argument('--profile', action='store_true',
+                        help="time every stage (OCR, regex scan, normalization, ...) per file and in total")
+    parser.add_argument('--prometheus', metavar='FILE',
+                        help="with --profile, also write the totals in Prometheus text format to FILE")
+    args = parser.parse_args()
+
+    if not args.paths:   # [121] No files were given — show help
+        print_usage()
         sys.exit(1)  # [122] Exit with code 1 to signal an error (0 = success, non-zero = something went wrong)
 
-    # [123] sys.argv[1:] skips the script name at index 0 and gives us only the user-provided paths
-    for path in sys.argv[1:]:
+    preprocess = args.preprocess_steps or ('default' if args.preprocess else None)
+    ocr_tiles = 1
+    if args.ocr_tiles:
+        ocr_tiles = args.ocr_tile_workers or os.cpu_count() or 4
+
+    # [119] Create a DateExtractor instance.
+    # Each writer gets a file's dates as soon as that file is done (extracted_dates.txt, .jsonl, ...),
+    # so nothing piles up in memory and an interrupted run keeps what it already wrote.
+    # ocr_cache keeps Tesseract results on disk, so re-running over the same images is nearly free.
+    writers = [make_writer(fmt, args.output + WRITERS[fmt].extension) for fmt in (args.formats or ['text'])]
+    ocr_cache = OcrCache("ocr_cache.sqlite")
+    extractor = dateExtractor.DateExtractor(output_file=None, ocr_cache=ocr_cache, writers=writers, keep_results=False,
+                                            pdf_jobs=args.jobs, pdf_ocr=args.ocr_pdf, pdf_ocr_dpi=args.dpi,
+                                            ocr_backend=args.ocr_backend, preprocess=preprocess,
+                                            ocr_tiles=ocr_tiles, profile=args.profile)
+
+    # With --incremental the manifest remembers every file's fingerprint and dates
+    manifest = FileManifest(args.manifest) if args.incremental else None
+
+    # [123] Collect every file first so --jobs can spread all of them over the worker pool.
+    # Binaries, empty files and anything --exclude / --max-size rules out are skipped here.
+    file_filter = FileFilter(include=args.include, exclude=args.exclude, max_size=args.max_size)
+    files = []
+    directories = []
+    for path in args.paths:
         path = Path(path)   # [124] Convert the string argument to a Path object for is_file() / is_dir() checks
 
         if path.is_file():         # [125] The argument points to a single file — process it directly
-            extractor.process_file(path)
+            if file_filter.accept(path):
+                files.append(path)
         elif path.is_dir():        # [126] The argument points to a folder — process all files inside recursively
-            extractor.process_directory(path)
+            files.extend(file_filter.walk(path))
+            directories.append(path)
         else:
             print(f"Warning: {path} not found")   # [127] Path doesn't exist — warn and continue with remaining arguments
 
-    extractor.save_results()  # [128] After all files are processed, write everything collected to extracted_dates.txt
+    try:
+        extractor.process_files(files, jobs=args.jobs, manifest=manifest, kinds=file_filter.kinds)
+    finally:
+        for writer in writers:   # [128] Finish every output file, even if the run was interrupted
+            writer.close()
+
+    if manifest is not None:
+        for directory in directories:   # files that were indexed before but are gone now
+            for gone in manifest.mark_deleted(directory, files):
+                print(f"Deleted since last run: {gone}")
+        print(manifest.format_stats())
+        manifest.close()
+
+    print()
+    for writer in writers:
+        print(f"Results saved to: {writer.path}")
+    print(f"Total files processed: {writers[0].files_written}")
+    print(f"Total dates found: {writers[0].dates_written}")
+    if file_filter.skipped:
+        print(file_filter.format_skipped())
+    if args.jobs <= 1:   # with --jobs each worker process keeps its own cache counters
+        print(ocr_cache.format_stats())
+
+    if args.profile:   # per-file timings (workers send theirs back), then the totals
+        print("\nPer-file profile:")
+        for file_name, file_stats in extractor.file_stats:
+            print(f"  {file_name}: {file_stats.summary()}")
+        print()
+        print(extractor.stats.format("Profile (all files)"))
+        if args.prometheus:
+            with open(args.prometheus, 'w', encoding='utf-8') as f:
+                f.write(extractor.stats.to_prometheus())
+            print(f"Prometheus metrics written to: {args.prometheus}")
+    ocr_cache.close()
 
 
 # [129] This guard ensures main() only runs when this script is executed directly.
 # If another script imports main.py, main() will NOT be called automatically.
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,136 @@
+"""
+ocrCache.py — Content-addressed cache for Tesseract results
+
+The same poster is often forwarded to the bot many times. Instead of running
+Tesseract again, we hash the image bytes (plus the Tesseract version and the
+OCR settings) and look the TSV output up in two tiers:
+
+    1. an in-memory LRU of recently used results
+    2. a SQLite file on disk, trimmed back to a size limit (least recently
+       used rows go first)
+
+A repeated image costs one hash and one lookup.
+"""
+
+import hashlib
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+
+class OcrCache:
+    def __init__(self, path="ocr_cache.sqlite", memory_items=128, max_disk_bytes=256 * 1024 * 1024):
+        """
+        path            — SQLite file for the on-disk tier (None = memory only)
+        memory_items    — how many results the in-memory LRU keeps
+        max_disk_bytes  — total size of stored results before old rows are evicted
+        """
+        self.path = path
+        self.memory_items = memory_items
+        self.max_disk_bytes = max_disk_bytes
+        self._memory = OrderedDict()  # key → TSV text, most recently used last
+        self._lock = threading.Lock()
+        self.hits_memory = 0
+        self.hits_disk = 0
+        self.misses = 0
+        self.evictions = 0
+
+        self._db = None
+        if path:
+            # WAL + a busy timeout let several worker processes share one cache file
+            self._db = sqlite3.connect(path, timeout=30, check_same_thread=False)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS ocr_results ("
+                " key TEXT PRIMARY KEY,"
+                " tsv TEXT NOT NULL,"
+                " size INTEGER NOT NULL,"
+                " last_used REAL NOT NULL)"
+            )
+            self._db.execute("CREATE INDEX IF NOT EXISTS ocr_results_last_used ON ocr_results(last_used)")
+            self._db.commit()
+
+    @staticmethod
+    def make_key(data, tesseract_version, config):
+        """Hash of the image bytes plus everything that changes Tesseract's output."""
+        h = hashlib.sha256()
+        h.update(data)
+        h.update(b'\0' + tesseract_version.encode('utf-8'))
+        h.update(b'\0' + config.encode('utf-8'))
+        return h.hexdigest()
+
+    def get(self, key):
+        """Return the cached TSV text for key, or None on a miss."""
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                self.hits_memory += 1
+                return self._memory[key]
+
+            if self._db is not None:
+                row = self._db.execute("SELECT tsv FROM ocr_results WHERE key = ?", (key,)).fetchone()
+                if row is not None:
+                    self._db.execute("UPDATE ocr_results SET last_used = ? WHERE key = ?", (time.time(), key))
+                    self._db.commit()
+                    self._remember(key, row[0])
+                    self.hits_disk += 1
+                    return row[0]
+
+            self.misses += 1
+            return None
+
+    def put(self, key, tsv):
+        """Store a TSV result in both tiers."""
+        with self._lock:
+            self._remember(key, tsv)
+            if self._db is not None:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO ocr_results (key, tsv, size, last_used) VALUES (?, ?, ?, ?)",
+                    (key, tsv, len(tsv.encode('utf-8')), time.time())
+                )
+                self._evict_disk()
+                self._db.commit()
+
+    def _remember(self, key, tsv):
+        self._memory[key] = tsv
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_items:
+            self._memory.popitem(last=False)
+
+    def _evict_disk(self):
+        """Delete least recently used rows until the disk tier fits in max_disk_bytes."""
+        total = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM ocr_results").fetchone()[0]
+        if total <= self.max_disk_bytes:
+            return
+        rows = self._db.execute("SELECT key, size FROM ocr_results ORDER BY last_used").fetchall()
+        for key, size in rows:
+            if total <= self.max_disk_bytes:
+                break
+            self._db.execute("DELETE FROM ocr_results WHERE key = ?", (key,))
+            total -= size
+            self.evictions += 1
+
+    def stats(self):
+        """Hit/miss counters for reporting."""
+        hits = self.hits_memory + self.hits_disk
+        lookups = hits + self.misses
+        return {
+            'hits': hits,
+            'hits_memory': self.hits_memory,
+            'hits_disk': self.hits_disk,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_rate': hits / lookups if lookups else 0.0,
+        }
+
+    def format_stats(self):
+        s = self.stats()
+        return (f"OCR cache: {s['hits']} hits ({s['hits_memory']} memory, {s['hits_disk']} disk), "
+                f"{s['misses']} misses, hit rate {s['hit_rate']:.0%}")
+
+    def close(self):
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
@@ -0,0 +1,72 @@
+"""
+ocrTiles.py — OCR one large image as overlapping bands, in parallel
+
+Tesseract works on one core per image, so a big poster or a 300 DPI scan
+keeps one core busy while the rest sit idle. With tiling, the image is cut
+into horizontal bands that are OCR'd at the same time (one tesseract process
+or tesserocr engine per band), and the words are put back together as if
+the page had been read whole.
+
+Bands span the full width, so a text line is never cut left to right. Each
+band reaches a margin past its share of the page on both sides. Every line
+Tesseract reports is kept from exactly one band: the one whose share of the
+page its vertical centre falls in. A line whose centre is in a band's share
+and that is up to twice the margin tall lies wholly inside that band, so it
+is read whole there; the copy (or the cut-off piece) in the neighbouring
+band is dropped, so no word appears twice.
+
+Merged words keep their heights, get page coordinates, and get line keys
+(block, par, line) that are unique across bands ("2.1" is block 1 of the
+second band). OcrResult.plain_text() and the font-size ordering work on
+them unchanged.
+"""
+
+# Images are only split when every band would be at least this tall
+TILE_MIN_HEIGHT = 600
+# Each band reaches this share of the image height (at least TILE_MIN_OVERLAP
+# pixels) past its share of the page, above and below. Twice that must be more
+# than the tallest line of text.
+TILE_OVERLAP = 0.1
+TILE_MIN_OVERLAP = 128
+
+
+def plan_tiles(height, tiles):
+    """
+    The bands to OCR an image `height` pixels tall in at most `tiles`
+    pieces, as (top, bottom, keep_from, keep_to): the band covers rows
+    top..bottom, and keeps the lines whose centre lies in keep_from..keep_to.
+    One band (the whole image) if the image is too small to split.
+    """
+    count = min(tiles, height // TILE_MIN_HEIGHT)
+    if count < 2:
+        return [(0, height, 0, height)]
+    overlap = max(TILE_MIN_OVERLAP, int(height * TILE_OVERLAP))
+    step = height / count
+    bands = []
+    for i in range(count):
+        keep_from = round(i * step)
+        keep_to = round((i + 1) * step)
+        bands.append((max(0, keep_from - overlap), min(height, keep_to + overlap), keep_from, keep_to))
+    return bands
+
+
+def merge_tiles(tiles):
+    """
+    Page words from [(band, words)], where each word's box is relative to
+    its band (OcrResult word dicts). Bands are merged top to bottom, and
+    lines keep Tesseract's order within a band.
+    """
+    merged = []
+    for index, ((top, bottom, keep_from, keep_to), words) in enumerate(tiles, start=1):
+        lines = {}   # (block, par, line) → the line's words, in order
+        for word in words:
+            lines.setdefault(word['key'], []).append(word)
+        for (block, par, line), line_words in lines.items():
+            line_top = min(w['top'] for w in line_words)
+            line_bottom = max(w['top'] + w['height'] for w in line_words)
+            centre = top + (line_top + line_bottom) / 2
+            if not keep_from <= centre < keep_to:
+                continue
+            key = (f"{index}.{block}", par, line)
+            merged.extend(dict(w, key=key, top=w['top'] + top) for w in line_words)
+    return merged
@@ -0,0 +1,145 @@
+"""
+resultCache.py — Extraction results of Telegram files, keyed by file_unique_id
+
+When a flyer is forwarded to the bot by dozens of people, every copy carries
+the same file_unique_id. Telegram guarantees that id is the same for the
+same file across bots and chats, so the bot can answer from this cache
+before downloading anything: a hit skips both the download and the
+extraction.
+
+Results live in SQLite, so they survive restarts. Rows expire after `ttl`
+seconds, and once there are more than `max_entries` rows the least recently
+used ones are evicted. Every row also stores the file's size and how long
+its extraction took, so a hit can count the bandwidth and CPU time it saved.
+Only files that gave dates are stored: a file with none may just have hit
+a failed OCR run, and that shouldn't stick for the whole ttl.
+
+A row is only reused if it was made with the same extraction settings
+(e.g. a different OCR preprocessing gives a miss, not a stale answer).
+"""
+
+import json
+import sqlite3
+import threading
+import time
+
+
+class ResultCache:
+    def __init__(self, path="result_cache.sqlite", settings="", ttl=30 * 24 * 3600, max_entries=50000):
+        """
+        path         — SQLite file (":memory:" for a cache that dies with the process)
+        settings     — fingerprint of the extraction settings; rows made with others are ignored
+        ttl          — seconds a result stays valid (None = forever)
+        max_entries  — rows kept before the least recently used are evicted
+        """
+        self.path = path
+        self.settings = settings
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+        self.evictions = 0
+        self.bytes_saved = 0       # downloads skipped
+        self.seconds_saved = 0.0   # extraction time skipped
+
+        self._db = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS results ("
+            " file_unique_id TEXT PRIMARY KEY,"
+            " settings TEXT NOT NULL,"
+            " result TEXT NOT NULL,"
+            " file_size INTEGER NOT NULL,"
+            " extract_seconds REAL NOT NULL,"
+            " created_at REAL NOT NULL,"
+            " last_used REAL NOT NULL,"
+            " hits INTEGER NOT NULL DEFAULT 0)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS results_last_used ON results(last_used)")
+        self._db.commit()
+
+    def _is_expired(self, created_at, now):
+        return self.ttl is not None and now - created_at > self.ttl
+
+    def get(self, file_unique_id):
+        """The cached {'event_name', 'dates'} dict for a file, or None on a miss."""
+        now = time.time()
+        with self._lock:
+            row = self._db.execute(
+                "SELECT settings, result, file_size, extract_seconds, created_at FROM results"
+                " WHERE file_unique_id = ?", (file_unique_id,)).fetchone()
+            if row is None or row[0] != self.settings:
+                self.misses += 1
+                return None
+            settings, result, file_size, extract_seconds, created_at = row
+            if self._is_expired(created_at, now):
+                self._db.execute("DELETE FROM results WHERE file_unique_id = ?", (file_unique_id,))
+                self._db.commit()
+                self.expired += 1
+                self.misses += 1
+                return None
+            self._db.execute("UPDATE results SET last_used = ?, hits = hits + 1 WHERE file_unique_id = ?",
+                             (now, file_unique_id))
+            self._db.commit()
+            self.hits += 1
+            self.bytes_saved += file_size
+            self.seconds_saved += extract_seconds
+            return json.loads(result)
+
+    def put(self, file_unique_id, result, file_size=0, extract_seconds=0.0):
+        """Store the {'event_name', 'dates'} extracted from a file"""
+        now = time.time()
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO results"
+                " (file_unique_id, settings, result, file_size, extract_seconds, created_at, last_used)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (file_unique_id, self.settings, json.dumps(result),
+                 file_size or 0, extract_seconds, now, now)
+            )
+            self._evict(now)
+            self._db.commit()
+
+    def _evict(self, now):
+        """Drop expired rows, then least recently used ones until max_entries are left."""
+        if self.ttl is not None:
+            cursor = self._db.execute("DELETE FROM results WHERE created_at < ?", (now - self.ttl,))
+            self.expired += cursor.rowcount
+        count = self._db.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+        if count > self.max_entries:
+            cursor = self._db.execute(
+                "DELETE FROM results WHERE file_unique_id IN"
+                " (SELECT file_unique_id FROM results ORDER BY last_used LIMIT ?)",
+                (count - self.max_entries,))
+            self.evictions += cursor.rowcount
+
+    def __len__(self):
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+
+    def stats(self):
+        """Hit/miss counters and savings since start, for reporting."""
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'expired': self.expired,
+            'evictions': self.evictions,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'bytes_saved': self.bytes_saved,
+            'seconds_saved': self.seconds_saved,
+        }
+
+    def format_stats(self):
+        s = self.stats()
+        return (f"Result cache: {s['hits']} hits, {s['misses']} misses, hit rate {s['hit_rate']:.0%}; "
+                f"saved {s['bytes_saved'] / (1024 * 1024):.1f} MB of downloads "
+                f"and {s['seconds_saved']:.1f}s of extraction")
+
+    def close(self):
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
@@ -0,0 +1,227 @@
+"""
+resultWriters.py — Output formats for extracted dates, written as files finish
+
+Every writer takes one entry per processed file (the dicts DateExtractor
+records: {'file', 'event_name', 'dates'}) and writes it out straight away,
+flushing after each one. Nothing has to be held in memory until the end,
+and a crash only loses the file that was being worked on.
+
+    text   the human-readable report (extracted_dates.txt)
+    jsonl  one JSON object per file, exactly the recorded entry
+    csv    one row per date: file, event_name, date, page, source
+    ics    one all-day VEVENT per date, for importing into a calendar
+
+PDF dates carry their page ("2024-01-15 (page 3)") and email dates say where
+in the message they were found ("Subject: 2024-01-15", "Email Date: <Date
+header>"). The csv and ics writers read both with parse_date, so the date
+column only ever holds the date itself.
+"""
+
+import csv
+import hashlib
+import json
+import re
+from datetime import date, datetime, timedelta, timezone
+from email.utils import parsedate_to_datetime
+
+
+class ResultWriter:
+    """Base class: opens the file, counts what was written, closes cleanly."""
+    extension = '.txt'
+    newline = None
+
+    def __init__(self, path):
+        self.path = path
+        self.files_written = 0
+        self.dates_written = 0
+        self._f = open(path, 'w', encoding='utf-8', newline=self.newline)
+        self.start()
+
+    def start(self):
+        """Write anything that goes before the first entry"""
+
+    def finish(self):
+        """Write anything that goes after the last entry"""
+
+    def write(self, entry):
+        self.write_entry(entry)
+        self.files_written += 1
+        self.dates_written += len(entry['dates'])
+        self._f.flush()
+
+    def write_entry(self, entry):
+        raise NotImplementedError
+
+    def close(self):
+        if self._f.closed:
+            return
+        self.finish()
+        self._f.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class TextReportWriter(ResultWriter):
+    """The bullet-point report DateExtractor.save_results() has always written"""
+    extension = '.txt'
+
+    def start(self):
+        self._f.write(f"Date Extraction Results\n")
+        self._f.write(f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
+        self._f.write("=" * 80 + "\n\n")
+
+    def write_entry(self, entry):
+        event_name = entry.get('event_name', 'Unknown Event')
+        self._f.write(f"Event: {event_name}\n")
+        self._f.write(f"File: {entry['file']}\n")
+        self._f.write("-" * 80 + "\n")
+        for d in entry['dates']:
+            self._f.write(f"  • {d}\n")
+        self._f.write("\n")
+
+    def finish(self):
+        if not self.files_written:
+            self._f.write("No dates found.\n")
+
+
+class JsonlWriter(ResultWriter):
+    extension = '.jsonl'
+
+    def write_entry(self, entry):
+        self._f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+
+
+class CsvWriter(ResultWriter):
+    extension = '.csv'
+    newline = ''   # the csv module writes its own line endings
+
+    def start(self):
+        self._csv = csv.writer(self._f)
+        self._csv.writerow(['file', 'event_name', 'date', 'page', 'source'])
+
+    def write_entry(self, entry):
+        for d in entry['dates']:
+            day, page, source = parse_date(d)
+            self._csv.writerow([entry['file'], entry.get('event_name', ''), day, page or '', source or ''])
+
+
+class IcsWriter(ResultWriter):
+    """
+    iCalendar (RFC 5545) with one all-day event per date. Dates that aren't
+    YYYY-MM-DD (raw matches dateutil couldn't parse) are skipped.
+    """
+    extension = '.ics'
+    newline = ''   # iCalendar lines end in CRLF
+
+    def start(self):
+        self.skipped = 0
+        self._stamp = datetime.now(timezone.utc).strftime('%Y%m%dT%H%M%SZ')
+        self._lines(['BEGIN:VCALENDAR', 'VERSION:2.0', 'PRODID:-//timely//Date Extractor//EN'])
+
+    def write_entry(self, entry):
+        event_name = entry.get('event_name') or 'Unknown Event'
+        for d in entry['dates']:
+            day, page, where = parse_date(d)
+            try:
+                start = date.fromisoformat(day)
+            except ValueError:
+                self.skipped += 1
+                continue
+            source = entry['file']
+            if page:
+                source += f" (page {page})"
+            elif where:
+                source += f" ({where})"
+            uid = hashlib.sha1(f"{entry['file']}|{d}|{event_name}".encode('utf-8')).hexdigest()
+            self._lines([
+                'BEGIN:VEVENT',
+                f'UID:{uid}@timely',
+                f'DTSTAMP:{self._stamp}',
+                f'DTSTART;VALUE=DATE:{start:%Y%m%d}',
+                f'DTEND;VALUE=DATE:{start + timedelta(days=1):%Y%m%d}',
+                f'SUMMARY:{ics_escape(event_name)}',
+                f'DESCRIPTION:{ics_escape("Found in " + source)}',
+                'END:VEVENT',
+            ])
+
+    def finish(self):
+        self._lines(['END:VCALENDAR'])
+
+    def _lines(self, lines):
+        for line in lines:
+            self._f.write(ics_fold(line) + '\r\n')
+
+
+WRITERS = {
+    'text': TextReportWriter,
+    'jsonl': JsonlWriter,
+    'csv': CsvWriter,
+    'ics': IcsWriter,
+}
+
+
+def make_writer(fmt, path):
+    """Open a writer for one of the WRITERS formats"""
+    if fmt not in WRITERS:
+        raise ValueError(f"Unknown output format {fmt!r} (choose from: {', '.join(WRITERS)})")
+    return WRITERS[fmt](path)
+
+
+_PAGE_SUFFIX = re.compile(r'^(.*) \(page (\d+)\)$')
+
+
+def split_page(d):
+    """'2024-01-15 (page 3)' → ('2024-01-15', 3); dates without a page → (d, None)"""
+    m = _PAGE_SUFFIX.match(d)
+    if m:
+        return m.group(1), int(m.group(2))
+    return d, None
+
+
+# Labels extract_from_email puts in front of its dates → the source column
+_EMAIL_SOURCES = {'Email Date': 'email date header', 'Subject': 'email subject', 'Body': 'email body'}
+
+
+def parse_date(d):
+    """
+    One entry date → (date, page, source): '2024-01-15 (page 3)' →
+    ('2024-01-15', 3, None), 'Subject: 2024-01-15' → ('2024-01-15', None,
+    'email subject'). An 'Email Date:' header is turned into YYYY-MM-DD (the
+    sender's calendar day) when it parses.
+    """
+    label, sep, rest = d.partition(': ')
+    if sep and label in _EMAIL_SOURCES:
+        if label == 'Email Date':
+            try:
+                rest = parsedate_to_datetime(rest).date().isoformat()
+            except (TypeError, ValueError):
+                pass
+        return rest, None, _EMAIL_SOURCES[label]
+    day, page = split_page(d)
+    return day, page, None
+
+
+def ics_escape(text):
+    return (text.replace('\\', '\\\\').replace(';', '\\;').replace(',', '\\,')
+            .replace('\r\n', '\\n').replace('\n', '\\n'))
+
+
+def ics_fold(line):
+    """Split a content line into 75-octet pieces, continuation lines starting with a space"""
+    data = line.encode('utf-8')
+    if len(data) <= 75:
+        return line
+    parts = []
+    limit = 75
+    while data:
+        cut = min(limit, len(data))
+        while cut < len(data) and (data[cut] & 0xC0) == 0x80:   # don't split a UTF-8 character
+            cut -= 1
+        parts.append(data[:cut].decode('utf-8'))
+        data = data[cut:]
+        limit = 74   # the leading space counts towards the next line
+    return '\r\n '.join(parts)
@@ -0,0 +1,104 @@
+"""
+savedDates.py — SQLite store for the dates users save from the bot
+
+Replaces the old saved_dates.json, which was re-read and rewritten in full
+on every save. Rows are appended with plain INSERTs (a whole "Save All" is
+one transaction), the database runs in WAL mode so concurrent writers and
+readers don't block each other, and /saved reads one page at a time.
+
+Dates saved before the bot tracked users (imported from saved_dates.json)
+belong to legacy_user_id. Without one they are kept with no user_id, read
+by nobody and never deleted, until a later start names their owner. Every
+query is then a plain user_id lookup on the (user_id, id) index.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+from datetime import datetime
+
+
+class SavedDatesStore:
+    def __init__(self, path="saved_dates.sqlite", legacy_json="saved_dates.json", legacy_user_id=None):
+        """
+        path            — SQLite file
+        legacy_json     — old saved_dates.json to import once, if it exists
+        legacy_user_id  — user the dates from legacy_json belong to
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS saved_dates ("
+            " id INTEGER PRIMARY KEY AUTOINCREMENT,"
+            " user_id INTEGER,"
+            " event_name TEXT NOT NULL,"
+            " date TEXT NOT NULL,"
+            " saved_at TEXT NOT NULL)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS saved_dates_user ON saved_dates(user_id, id)")
+        self._db.execute("CREATE INDEX IF NOT EXISTS saved_dates_date ON saved_dates(date)")
+        self._db.execute("CREATE INDEX IF NOT EXISTS saved_dates_event ON saved_dates(event_name)")
+        self._db.commit()
+
+        if legacy_json:
+            self._import_legacy_json(legacy_json, legacy_user_id)
+        if legacy_user_id is not None:
+            # Rows imported before an owner was configured
+            with self._lock, self._db:
+                self._db.execute("UPDATE saved_dates SET user_id = ? WHERE user_id IS NULL", (legacy_user_id,))
+
+    def _import_legacy_json(self, legacy_json, user_id):
+        """One-off import of the old JSON file; it is renamed so it isn't imported twice"""
+        if not os.path.exists(legacy_json):
+            return
+        with open(legacy_json, 'r', encoding='utf-8') as f:
+            saved = json.load(f)
+        rows = [(user_id, item.get('event_name', 'Unknown Event'), item['date'],
+                 item.get('saved_at', datetime.now().isoformat())) for item in saved]
+        with self._lock, self._db:
+            self._db.executemany(
+                "INSERT INTO saved_dates (user_id, event_name, date, saved_at) VALUES (?, ?, ?, ?)", rows
+            )
+        os.replace(legacy_json, legacy_json + ".imported")
+
+    def add(self, user_id, event_name, date):
+        """Save one date"""
+        self.add_many(user_id, event_name, [date])
+
+    def add_many(self, user_id, event_name, dates):
+        """Save several dates for one event in a single transaction"""
+        saved_at = datetime.now().isoformat()
+        with self._lock, self._db:
+            self._db.executemany(
+                "INSERT INTO saved_dates (user_id, event_name, date, saved_at) VALUES (?, ?, ?, ?)",
+                [(user_id, event_name, date, saved_at) for date in dates]
+            )
+
+    def count(self, user_id):
+        with self._lock:
+            return self._db.execute(
+                "SELECT COUNT(*) FROM saved_dates WHERE user_id = ?", (user_id,)
+            ).fetchone()[0]
+
+    def page(self, user_id, page=1, page_size=20):
+        """One page (1-based) of a user's saved dates, oldest first, as dicts"""
+        offset = (max(page, 1) - 1) * page_size
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT event_name, date, saved_at FROM saved_dates"
+                " WHERE user_id = ? ORDER BY id LIMIT ? OFFSET ?",
+                (user_id, page_size, offset)
+            ).fetchall()
+        return [{'event_name': e, 'date': d, 'saved_at': t} for e, d, t in rows]
+
+    def clear(self, user_id):
+        """Delete every date this user saved"""
+        with self._lock, self._db:
+            self._db.execute("DELETE FROM saved_dates WHERE user_id = ?", (user_id,))
+
+    def close(self):
+        with self._lock:
+            self._db.close()
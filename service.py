@@ -0,0 +1,391 @@
+"""
+service.py — Long-running extraction service (HTTP over TCP or a Unix socket)
+
+main.py pays Python start-up, imports and a cold OCR engine on every call.
+The service starts once and keeps all of that warm: one OCR cache, the
+OCR engines and the compiled date patterns are shared by every client.
+Files are queued to a pool of worker threads; results are kept by job id.
+
+    python service.py                              # http://127.0.0.1:8765
+    python service.py --unix /tmp/timely.sock      # HTTP over a Unix socket
+    python service.py --workers 8 --queue-limit 100
+
+API (JSON responses):
+    POST /jobs?filename=poster.jpg   body = the file's bytes
+                                     → 202 {"job_id", "status", "position"}
+                                     → 503 + Retry-After when the queue is full
+                                     → 400 for a filename that isn't one (empty, "." or "..")
+                                     add &wait=N to wait up to N seconds for the result
+    GET  /jobs/<job_id>              → {"job_id", "status", "dates", "event_name", ...}
+    POST /text                       body = plain text → {"dates": [...]} (answered directly,
+                                     503 when the queue is full)
+    GET  /stats                      queue, OCR cache and per-stage timings
+    GET  /metrics                    the same timings in Prometheus text format
+    GET  /health                     → {"ok": true}
+
+Example:
+    curl --data-binary @poster.jpg 'http://127.0.0.1:8765/jobs?filename=poster.jpg&wait=30'
+    curl --unix-socket /tmp/timely.sock http://localhost/jobs/<job_id>
+"""
+
+import argparse
+import asyncio
+import json
+import shutil
+import tempfile
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from urllib.parse import urlsplit, parse_qs
+
+from dateExtractor import DateExtractor, FailedExtraction
+from instrumentation import Stats
+from ocrCache import OcrCache
+
+# ─────────────────────────────────────────
+# Defaults (all can be changed on the command line)
+# ─────────────────────────────────────────
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+DEFAULT_WORKERS = 4          # files extracted at the same time
+DEFAULT_QUEUE_LIMIT = 64     # jobs queued + running before new ones get 503
+MAX_UPLOAD_BYTES = 64 * 1024 * 1024
+JOB_HISTORY = 1000           # finished jobs kept for GET /jobs/<id>, oldest dropped first
+MAX_WAIT_SECONDS = 300       # longest ?wait= a client can ask for
+
+HTTP_REASONS = {200: "OK", 202: "Accepted", 400: "Bad Request", 404: "Not Found",
+                405: "Method Not Allowed", 411: "Length Required", 413: "Payload Too Large",
+                500: "Internal Server Error", 503: "Service Unavailable"}
+
+
+class HttpError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+# ─────────────────────────────────────────
+# Jobs and the worker pool
+# ─────────────────────────────────────────
+
+class Job:
+    def __init__(self, filename, path):
+        self.id = uuid.uuid4().hex
+        self.filename = filename
+        self.path = path                # uploaded copy, deleted once extracted
+        self.status = "queued"          # queued → running → done | failed (nothing could be read)
+        self.submitted = time.time()
+        self.started = None
+        self.finished = None
+        self.dates = None
+        self.event_name = None
+        self.error = None
+        self.done = asyncio.Event()
+
+    def as_dict(self):
+        d = {'job_id': self.id, 'status': self.status, 'filename': self.filename,
+             'submitted': self.submitted}
+        if self.started:
+            d['queued_seconds'] = round(self.started - self.submitted, 3)
+        if self.finished:
+            d['run_seconds'] = round(self.finished - self.started, 3)
+        if self.status == "done":
+            d['event_name'] = self.event_name
+            d['dates'] = self.dates
+        if self.error:
+            d['error'] = self.error
+        return d
+
+
+class ExtractionService:
+    """
+    Job queue in front of a thread pool. All state is touched from the event
+    loop only; the threads just run DateExtractor and hand back the result.
+    """
+
+    def __init__(self, workers=DEFAULT_WORKERS, queue_limit=DEFAULT_QUEUE_LIMIT, ocr_cache=None,
+                 extractor_options=None):
+        self.workers = workers
+        self.queue_limit = queue_limit
+        self.ocr_cache = ocr_cache
+        self.extractor_options = extractor_options or {}
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="extract")
+        self.jobs = OrderedDict()   # job id → Job, oldest first
+        self.pending = 0            # jobs queued or running
+        self.stats = Stats()        # every job's per-stage timings
+        self.upload_dir = Path(tempfile.mkdtemp(prefix="timely-service-"))
+
+    def is_full(self):
+        return self.pending >= self.queue_limit
+
+    def new_extractor(self):
+        """A fresh DateExtractor per job; cache, OCR engines and patterns are shared"""
+        return DateExtractor(output_file=None, ocr_cache=self.ocr_cache, profile=True,
+                             **self.extractor_options)
+
+    def submit(self, filename, data):
+        """Store the upload and queue it. Returns (job, position in the queue)."""
+        # Only the last component counts, so a name can't point outside the job's folder
+        name = Path(filename).name
+        if name in ('', '.', '..'):
+            raise HttpError(400, f"not a file name: {filename!r}")
+        if self.is_full():
+            raise HttpError(503, "queue is full, try again later")
+        job_dir = self.upload_dir / uuid.uuid4().hex
+        job_dir.mkdir()
+        path = job_dir / name
+        path.write_bytes(data)
+
+        job = Job(path.name, path)
+        self.jobs[job.id] = job
+        position = max(0, self.pending - self.workers + 1)
+        self.pending += 1
+        asyncio.get_running_loop().create_task(self._run(job))
+        return job, position
+
+    async def _run(self, job):
+        loop = asyncio.get_running_loop()
+        extractor = self.new_extractor()
+
+        def started(now):
+            job.started = now
+            job.status = "running"
+
+        def work():
+            # Job state belongs to the loop; the thread only reports when it began
+            loop.call_soon_threadsafe(started, time.time())
+            return extractor.extract_file(job.path)
+
+        try:
+            dates = await loop.run_in_executor(self.executor, work)
+            if isinstance(dates, FailedExtraction):
+                # e.g. Tesseract missing or an unreadable PDF — not the same as "no dates"
+                job.error = dates.reason or "extraction failed"
+                job.status = "failed"
+                return
+            entry = extractor.make_entry(job.path, dates)
+            job.dates = entry['dates'] if entry else []
+            job.event_name = entry['event_name'] if entry else job.path.stem
+            job.status = "done"
+        except Exception as e:
+            job.error = str(e)
+            job.status = "failed"
+        finally:
+            job.finished = time.time()
+            self.pending -= 1
+            self.stats.merge(extractor.stats)
+            shutil.rmtree(job.path.parent, ignore_errors=True)
+            job.done.set()
+            self._forget_old_jobs()
+
+    def _forget_old_jobs(self):
+        finished = [job_id for job_id, job in self.jobs.items() if job.done.is_set()]
+        for job_id in finished[:max(0, len(finished) - JOB_HISTORY)]:
+            del self.jobs[job_id]
+
+    async def extract_text(self, text):
+        """
+        Dates in a piece of text, run on the pool so big bodies don't block the
+        loop. It takes a worker like a job does, so it counts against the queue limit.
+        """
+        if self.is_full():
+            raise HttpError(503, "queue is full, try again later")
+        extractor = self.new_extractor()
+        loop = asyncio.get_running_loop()
+        self.pending += 1
+        try:
+            return await loop.run_in_executor(self.executor, extractor.extract_dates_from_text, text)
+        finally:
+            self.pending -= 1
+            self.stats.merge(extractor.stats)
+
+    def snapshot(self):
+        counts = {}
+        for job in self.jobs.values():
+            counts[job.status] = counts.get(job.status, 0) + 1
+        return {
+            'workers': self.workers,
+            'queue_limit': self.queue_limit,
+            'pending': self.pending,
+            'jobs': counts,
+            'ocr_cache': self.ocr_cache.stats() if self.ocr_cache is not None else None,
+            'timings': self.stats.as_dict(),
+        }
+
+    def close(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
+        shutil.rmtree(self.upload_dir, ignore_errors=True)
+
+
+# ─────────────────────────────────────────
+# Minimal HTTP/1.1 front end (one request per connection)
+# ─────────────────────────────────────────
+
+async def read_request(reader):
+    """(method, path, query dict, headers dict, body bytes)"""
+    request_line = (await reader.readline()).decode('latin-1').strip()
+    if not request_line:
+        raise ConnectionResetError
+    try:
+        method, target, _ = request_line.split(' ', 2)
+    except ValueError:
+        raise HttpError(400, "malformed request line")
+
+    headers = {}
+    while True:
+        line = (await reader.readline()).decode('latin-1')
+        if line in ('\r\n', '\n', ''):
+            break
+        name, _, value = line.partition(':')
+        headers[name.strip().lower()] = value.strip()
+
+    body = b''
+    if method in ('POST', 'PUT'):
+        if 'content-length' not in headers:
+            raise HttpError(411, "Content-Length required")
+        length = int(headers['content-length'])
+        if length > MAX_UPLOAD_BYTES:
+            raise HttpError(413, f"uploads are limited to {MAX_UPLOAD_BYTES} bytes")
+        body = await reader.readexactly(length)
+
+    url = urlsplit(target)
+    query = {k: v[-1] for k, v in parse_qs(url.query).items()}
+    return method, url.path, query, headers, body
+
+
+def write_response(writer, status, payload, content_type='application/json', extra_headers=None):
+    if content_type == 'application/json':
+        body = (json.dumps(payload, indent=2) + '\n').encode('utf-8')
+    else:
+        body = payload.encode('utf-8')
+    head = [f"HTTP/1.1 {status} {HTTP_REASONS.get(status, '')}",
+            f"Content-Type: {content_type}; charset=utf-8",
+            f"Content-Length: {len(body)}",
+            "Connection: close"]
+    for name, value in (extra_headers or {}).items():
+        head.append(f"{name}: {value}")
+    writer.write(('\r\n'.join(head) + '\r\n\r\n').encode('latin-1') + body)
+
+
+async def route(service, method, path, query, headers, body):
+    """(status, payload, content type, extra headers) for one request"""
+    if path == '/health':
+        return 200, {'ok': True}, 'application/json', None
+
+    if path == '/jobs':
+        if method != 'POST':
+            raise HttpError(405, "use POST to submit a file")
+        filename = query.get('filename') or headers.get('x-filename') or 'upload.txt'
+        job, position = service.submit(filename, body)
+        wait = min(float(query.get('wait', 0) or 0), MAX_WAIT_SECONDS)
+        if wait > 0:
+            try:
+                await asyncio.wait_for(asyncio.shield(job.done.wait()), wait)
+            except asyncio.TimeoutError:
+                pass
+        status = 200 if job.done.is_set() else 202
+        return status, dict(job.as_dict(), position=position), 'application/json', None
+
+    if path.startswith('/jobs/'):
+        if method != 'GET':
+            raise HttpError(405, "use GET to fetch a job")
+        job = service.jobs.get(path[len('/jobs/'):])
+        if job is None:
+            raise HttpError(404, "no such job (finished jobs are only kept for a while)")
+        return 200, job.as_dict(), 'application/json', None
+
+    if path == '/text':
+        if method != 'POST':
+            raise HttpError(405, "use POST with the text as the body")
+        dates = await service.extract_text(body.decode('utf-8', errors='ignore'))
+        return 200, {'dates': dates}, 'application/json', None
+
+    if path == '/stats':
+        return 200, service.snapshot(), 'application/json', None
+
+    if path == '/metrics':
+        return 200, service.stats.to_prometheus(), 'text/plain; version=0.0.4', None
+
+    raise HttpError(404, f"unknown path {path}")
+
+
+def make_handler(service):
+    async def handle(reader, writer):
+        try:
+            try:
+                request = await read_request(reader)
+                status, payload, content_type, extra = await route(service, *request)
+            except (ConnectionResetError, asyncio.IncompleteReadError):
+                raise
+            except HttpError as e:
+                extra = {'Retry-After': '5'} if e.status == 503 else None
+                status, payload, content_type = e.status, {'error': str(e)}, 'application/json'
+            except (ValueError, UnicodeDecodeError) as e:
+                status, payload, content_type, extra = 400, {'error': str(e)}, 'application/json', None
+            except Exception as e:
+                # Anything else is our bug, but the client still gets an answer
+                print(f"Error handling request: {e!r}")
+                status, payload, content_type, extra = 500, {'error': str(e)}, 'application/json', None
+            write_response(writer, status, payload, content_type, extra)
+            await writer.drain()
+        except (ConnectionResetError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+    return handle
+
+
+async def serve(args):
+    ocr_cache = OcrCache(args.ocr_cache) if args.ocr_cache else None
+    options = {'pdf_ocr': args.ocr_pdf, 'ocr_backend': args.ocr_backend, 'preprocess': args.preprocess,
+               'ocr_tiles': args.ocr_tiles, 'ocr_timeout': args.ocr_timeout}
+    service = ExtractionService(args.workers, args.queue_limit, ocr_cache, options)
+    handler = make_handler(service)
+
+    if args.unix:
+        server = await asyncio.start_unix_server(handler, path=args.unix)
+        print(f"Timely service listening on unix:{args.unix}")
+    else:
+        server = await asyncio.start_server(handler, args.host, args.port)
+        print(f"Timely service listening on http://{args.host}:{args.port}")
+    print(f"{args.workers} workers, queue limit {args.queue_limit}. Press Ctrl+C to stop.")
+
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        service.close()
+        if ocr_cache is not None:
+            ocr_cache.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the date extractor as a long-running local service")
+    parser.add_argument('--host', default=DEFAULT_HOST)
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    parser.add_argument('--unix', metavar='PATH', help="listen on this Unix socket instead of TCP")
+    parser.add_argument('--workers', type=int, default=DEFAULT_WORKERS,
+                        help=f"files extracted at the same time (default: {DEFAULT_WORKERS})")
+    parser.add_argument('--queue-limit', type=int, default=DEFAULT_QUEUE_LIMIT,
+                        help=f"queued + running jobs before clients get 503 (default: {DEFAULT_QUEUE_LIMIT})")
+    parser.add_argument('--ocr-cache', default='ocr_cache.sqlite',
+                        help="OCR cache file shared by all clients ('' to disable)")
+    parser.add_argument('--ocr-pdf', action='store_true', help="OCR PDF pages that have no text layer")
+    parser.add_argument('--ocr-backend', choices=['auto', 'tesserocr', 'subprocess'], default='auto')
+    parser.add_argument('--ocr-timeout', type=float, default=None, help="seconds before a Tesseract run is killed")
+    parser.add_argument('--preprocess', default=None, metavar='STEPS',
+                        help="image preprocessing before OCR, e.g. 'gray,max=2000' (see imagePreprocess.py)")
+    parser.add_argument('--ocr-tiles', type=int, default=1, metavar='N',
+                        help="OCR large images as up to N overlapping bands in parallel (see ocrTiles.py)")
+    args = parser.parse_args()
+
+    try:
+        asyncio.run(serve(args))
+    except KeyboardInterrupt:
+        print("\nStopped.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,18 @@
+"""
+Shared fixtures. The modules live flat in the repo root, so put it on
+sys.path, with benchmarks/ for the synthetic input generators.
+"""
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / 'benchmarks'))
+
+
+@pytest.fixture
+def extractor():
+    from dateExtractor import DateExtractor
+    return DateExtractor(output_file=None)
@@ -0,0 +1,83 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip('telegram')
+
+import bot
+from resultCache import ResultCache
+
+
+class FakeFile:
+    def __init__(self, text):
+        self.text = text
+
+    async def download_to_drive(self, path):
+        path.write_text(self.text, encoding='utf-8')
+
+
+def _album(texts, group='album-1'):
+    """One Update per document of an album, all with the same media_group_id"""
+    replies = []
+    files = {}
+    updates = []
+    for i, text in enumerate(texts):
+        document = SimpleNamespace(file_id=f'file-{i}', file_unique_id=f'unique-{i}', file_size=len(text),
+                                   file_name=f'notes{i}.txt')
+        files[document.file_id] = FakeFile(text)
+
+        async def reply_text(text, **kwargs):
+            replies.append(text)
+
+        message = SimpleNamespace(media_group_id=group, photo=None, document=document, reply_text=reply_text)
+        updates.append(SimpleNamespace(message=message, effective_chat=SimpleNamespace(id=42)))
+
+    async def get_file(file_id):
+        return files[file_id]
+
+    context = SimpleNamespace(bot=SimpleNamespace(get_file=get_file), args=[])
+    return updates, context, replies
+
+
+def test_album_is_handled_as_one_batch_with_one_reply(monkeypatch, tmp_path):
+    monkeypatch.setattr(bot, 'MEDIA_GROUP_WAIT', 0.05)
+    monkeypatch.setattr(bot, 'RESULT_CACHE', ResultCache(':memory:'))
+    monkeypatch.setattr(bot, 'OCR_CACHE', None)
+    monkeypatch.setattr(bot, 'EXTRACTION_POOL', bot.ExtractionPool(2, 20, 30))
+
+    submitted = []
+    submit = bot.EXTRACTION_POOL.submit
+
+    def count_submit(fn, *args):
+        submitted.append(args[1])
+        return submit(fn, *args)
+
+    monkeypatch.setattr(bot.EXTRACTION_POOL, 'submit', count_submit)
+
+    albums = []
+
+    async def reply_with_album(update, context, results, failed=0):
+        albums.append((results, failed))
+
+    monkeypatch.setattr(bot, 'reply_with_album', reply_with_album)
+
+    updates, context, replies = _album(['Due 2026-01-05', 'Meeting on 7 March 2026', 'Party 2026-12-31'])
+
+    async def deliver():
+        # Telegram sends an album as one update per file, a moment apart
+        tasks = []
+        for update in updates:
+            tasks.append(asyncio.create_task(bot.handle_document(update, context)))
+            await asyncio.sleep(0.01)
+        await asyncio.gather(*tasks)
+
+    asyncio.run(deliver())
+
+    assert len(albums) == 1
+    results, failed = albums[0]
+    assert failed == 0
+    assert [result['dates'] for result in results] == [['2026-01-05'], ['2026-03-07'], ['2026-12-31']]
+    assert len(submitted) == 3 and len({path.parent.parent for path in submitted}) == 1   # one batch
+    assert len(replies) == 1   # "Album of 3 files received", then the album reply
+    assert bot.PENDING_ALBUMS == {}
@@ -0,0 +1,24 @@
+"""
+Regression check for extract_dates_from_text().
+
+date_corpus.json holds sample texts and the exact list of dates the
+extractor returned for them before the matching engine was rewritten.
+Content and order must both stay the same.
+"""
+import json
+from pathlib import Path
+
+import pytest
+
+CORPUS = json.loads((Path(__file__).resolve().parent / 'date_corpus.json').read_text(encoding='utf-8'))
+
+
+@pytest.mark.parametrize('case', CORPUS, ids=[f"case{i}" for i in range(len(CORPUS))])
+def test_corpus(extractor, case):
+    assert extractor.extract_dates_from_text(case['text']) == case['expected']
+
+
+@pytest.mark.parametrize('case', CORPUS, ids=[f"case{i}" for i in range(len(CORPUS))])
+def test_corpus_without_prefilter(extractor, case):
+    extractor.prefilter = False
+    assert extractor.extract_dates_from_text(case['text']) == case['expected']
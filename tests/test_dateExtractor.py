@@ -0,0 +1,446 @@
+import io
+import time
+
+import pytest
+
+import dateExtractor
+from dateExtractor import OcrResult, TSV_HEADER, _iter_text_windows
+from ocrCache import OcrCache
+from synthetic import make_pdf
+
+
+def _windows(text, chunk_size, overlap):
+    return list(_iter_text_windows(io.StringIO(text), chunk_size, overlap))
+
+
+def test_text_windows_stay_bounded_after_an_early_newline():
+    # One newline at the top and none after: the cut must not fall back into the carried overlap
+    windows = _windows('header\n' + 'word 25 Feb 2026 ' * 20000, 4096, 512)
+    assert max(len(w) for w in windows) <= 4096 + 2 * 512
+    assert min(len(w) for w in windows[:-1]) > 512
+
+
+def test_text_windows_cut_long_lines_on_whitespace():
+    text = ('x' * 100 + '\n' + 'lorem ipsum 2026-03-14 ' * 500 + '\n') * 20
+    windows = _windows(text, 1000, 100)
+    assert max(len(w) for w in windows) <= 1000 + 2 * 100
+    assert all(w[-1].isspace() for w in windows[:-1])
+
+
+def test_text_windows_cover_the_text(extractor):
+    text = 'intro\n' + ''.join(f'meeting {d} March 2026 and more words here\n' for d in range(1, 29)) * 50
+    windows = _windows(text, 256, 64)
+    found = {date for w in windows for date in extractor.extract_dates_from_text(w)}
+    assert found == set(extractor.extract_dates_from_text(text))
+
+
+def test_text_windows_hard_cut_without_whitespace():
+    windows = _windows('x' * 10000, 1000, 100)
+    assert max(len(w) for w in windows) <= 1000 + 2 * 100
+    assert ''.join(w[100:] if i else w for i, w in enumerate(windows)).count('x') >= 10000
+
+
+
+def test_spans_without_whitespace_move_forward(extractor, tmp_path):
+    # Minified JSON: no whitespace at all, so pieces are cut after punctuation
+    data = b''.join(b'{"id":%d,"due":"2024-%02d-%02d"},' % (i, i % 12 + 1, i % 28 + 1) for i in range(5000))
+    spans = list(dateExtractor._candidate_spans(data, 1000, 100))
+    assert len(spans) <= 2 * len(data) // (1000 - 3 * 100)
+    assert all(end - start <= 1000 for start, end in spans)
+
+    path = tmp_path / 'min.json'
+    path.write_bytes(data)
+    streamed = list(extractor.iter_dates_from_text_file(path, chunk_size=1000, overlap=100))
+    assert sorted(streamed) == sorted(set(extractor.extract_dates_from_text(data.decode())))
+
+
+def test_spans_hard_cut_a_word_without_separators():
+    spans = list(dateExtractor._candidate_spans(b'7' * 100000, 1000, 100))
+    assert len(spans) <= 2 * 100000 // (1000 - 3 * 100)
+    assert spans[0][0] == 0 and spans[-1][1] == 100000
+
+# ─── OCR results ───
+
+TSV5 = TSV_HEADER + '\n' + '\n'.join([
+    '1\t1\t0\t0\t0\t0\t0\t0\t800\t600\t-1\t',
+    '5\t1\t1\t1\t1\t1\t10\t10\t300\t80\t96.123456\tSPRING',
+    '5\t1\t1\t1\t1\t2\t320\t10\t200\t80\t95.5\tFAIR',
+    '5\t1\t2\t1\t1\t1\t10\t200\t120\t20\t91.873993\t14',
+    '5\t1\t2\t1\t1\t2\t140\t200\t120\t20\t90.01\tMarch',
+    '5\t1\t2\t1\t1\t3\t270\t200\t120\t20\t89.7\t2026',
+    '5\t1\t3\t1\t1\t1\t10\t400\t120\t30\t12.5\tsmudge',
+]) + '\n'
+
+
+def test_from_tsv_reads_tesseract5_float_confidences():
+    ocr = OcrResult.from_tsv(TSV5)
+    assert [w['conf'] for w in ocr.words] == [96.123456, 95.5, 91.873993, 90.01, 89.7, 12.5]
+    # Low-confidence words are dropped and lines come largest font first
+    assert ocr.text_by_fontsize() == 'SPRING FAIR\n14 March 2026'
+    assert OcrResult.from_tsv(ocr.to_tsv()).words == ocr.words
+
+
+def test_event_name_from_tesseract5_tsv(extractor):
+    assert extractor.extract_event_name('poster.png', ocr=OcrResult.from_tsv(TSV5)) == 'SPRING FAIR'
+
+
+def test_from_tsv_integer_and_missing_confidences():
+    ocr = OcrResult.from_tsv(TSV_HEADER + '\n5\t1\t1\t1\t1\t1\t0\t0\t10\t10\t96\tword\n'
+                                          '5\t1\t1\t1\t1\t2\t0\t0\t10\t10\t\tnoconf\n')
+    assert [w['conf'] for w in ocr.words] == [96, None]
+
+
+def test_tiled_ocr_reuses_band_threads(monkeypatch):
+    """Bands run on one long-lived pool, so per-thread engines are created once"""
+    import threading
+    from PIL import Image
+
+    engines = []
+
+    class FakeBackend:
+        name = 'fake'
+        _local = threading.local()
+
+        def version(self):
+            return 'fake'
+
+        def tsv_from_image(self, image, timeout=None):
+            if not hasattr(self._local, 'engine'):
+                self._local.engine = len(engines)
+                engines.append(threading.get_ident())
+            return TSV_HEADER + f'\n5\t1\t1\t1\t1\t1\t0\t{image.height // 2}\t10\t10\t95\tx\n'
+
+    monkeypatch.setattr(dateExtractor, 'get_ocr_backend', lambda name, lang: FakeBackend())
+    extractor = dateExtractor.DateExtractor(output_file=None, ocr_tiles=3)
+    image = Image.new('L', (100, 3000), 255)
+    for _ in range(5):
+        assert extractor._ocr_pil_image(image) is not None
+    assert len(engines) <= 3
+
+
+
+# ─── batches ───
+
+def _batch_texts():
+    from synthetic import make_messages
+
+    texts = make_messages(300)
+    texts += ['', '   ', 'no dates here', 'call me at 5', '25,26,27\nFEB 2026', 'Due 2026-01-05'] * 3
+    texts += ['Due 2026-01-05\nand 7 March 2026', texts[0], '']
+    return texts
+
+
+@pytest.mark.parametrize('jobs', [1, 2])
+def test_batch_matches_one_call_per_text(extractor, jobs):
+    texts = _batch_texts()
+    expected = [extractor.extract_dates_from_text(text) for text in texts]
+    assert any(expected) and not all(expected)
+    assert extractor.extract_dates_batch(texts, jobs=jobs, chunk_size=64) == expected
+
+
+def test_batch_results_are_separate_lists(extractor):
+    first, repeat = extractor.extract_dates_batch(['Due 2026-01-05'] * 2)
+    first.append('changed')
+    assert repeat == ['2026-01-05']
+    assert extractor.extract_dates_batch([]) == []
+
+# ─── date normalization ───
+
+def _dateutil_normalize(date_str):
+    parser = pytest.importorskip('dateutil.parser')
+    try:
+        return parser.parse(date_str, fuzzy=False).strftime('%Y-%m-%d')
+    except (ValueError, OverflowError):
+        return None
+
+
+@pytest.mark.parametrize('date_str', [
+    '01/15/2024', '15/01/2024', '1/2/24', '12/31/99', '07/04/76',   # month first unless it can't be
+    '31/02/2024', '02/30/2024', '13/13/2024', '29 Feb 2023', '2023-02-29',   # not real dates
+    '2024-01-15', '2024-2-29', 'Jan 15, 2024', 'December 25, 2024', '15 Jan 2024',
+    'Sept 5, 2024', 'sept 5 2024', '5 Sept 2024',
+    '1st of January 2024', '22nd of February, 2024', '9th of sept 2024', '3rd March 2024',
+])
+def test_native_normalize_agrees_with_dateutil(date_str):
+    native = dateExtractor._native_normalize(date_str)
+    assert native is not None, "shape should be handled without dateutil"
+    assert (native or None) == _dateutil_normalize(date_str)
+
+
+def test_native_normalize_agrees_with_dateutil_on_generated_dates():
+    from synthetic import make_dates
+
+    for date_str in make_dates(500):
+        native = dateExtractor._native_normalize(date_str)
+        assert native and native == _dateutil_normalize(date_str), date_str
+
+
+
+# ─── OCR backends ───
+
+class FakeTessBaseAPI:
+    created = 0
+
+    def __init__(self, path=None, lang='eng'):
+        FakeTessBaseAPI.created += 1
+        self.lang = lang
+
+    def SetImage(self, image):
+        self.size = image.size
+
+    def GetTSVText(self, page):
+        return f'5\t1\t1\t1\t1\t1\t0\t0\t{self.size[0]}\t{self.size[1]}\t95\t2026-01-05\n'
+
+    def Clear(self):
+        pass
+
+
+class FakeTesserocr:
+    PyTessBaseAPI = FakeTessBaseAPI
+
+    @staticmethod
+    def tesseract_version():
+        return 'tesseract 5.3.0\n leptonica-1.82.0'
+
+
+def _missing():
+    raise ImportError('tesserocr')
+
+
+@pytest.fixture
+def backends(monkeypatch):
+    """Fresh backend registry, a fixed CLI version, and tesserocr installed or not via install()"""
+    monkeypatch.setattr(dateExtractor, '_ocr_backends', {})
+    monkeypatch.setattr(dateExtractor, '_tesseract_version', 'tesseract 5.3.0')
+    monkeypatch.setattr(dateExtractor, '_TESSEROCR', dateExtractor._OptionalImport(_missing))
+
+    def install():
+        monkeypatch.setattr(dateExtractor, '_TESSEROCR', dateExtractor._OptionalImport(lambda: FakeTesserocr))
+    return install
+
+
+def test_auto_falls_back_to_the_cli_without_tesserocr(backends):
+    backend = dateExtractor.get_ocr_backend('auto')
+    assert isinstance(backend, dateExtractor.SubprocessOcrBackend)
+    assert dateExtractor.get_ocr_backend('subprocess') is backend
+    assert dateExtractor.get_ocr_backend('auto', 'deu') is not backend
+    with pytest.raises(ValueError, match='pip install tesserocr'):
+        dateExtractor.get_ocr_backend('tesserocr')
+    with pytest.raises(ValueError, match='Unknown OCR backend'):
+        dateExtractor.get_ocr_backend('easyocr')
+
+
+def test_auto_prefers_tesserocr_and_keeps_one_engine_per_thread(backends):
+    from PIL import Image
+
+    backends()
+    backend = dateExtractor.get_ocr_backend('auto')
+    assert isinstance(backend, dateExtractor.TesserocrBackend)
+    created = FakeTessBaseAPI.created
+    for _ in range(3):
+        tsv = backend.tsv_from_image(Image.new('L', (40, 20), 255))
+        assert OcrResult.from_tsv(tsv).plain_text().strip() == '2026-01-05'
+    assert FakeTessBaseAPI.created == created + 1
+
+
+def test_subprocess_backend_runs_the_cli(backends, monkeypatch):
+    calls = []
+
+    def run(args, **kwargs):
+        calls.append((args, kwargs.get('timeout')))
+        return dateExtractor.subprocess.CompletedProcess(args, 0, stdout=TSV_HEADER + '\n')
+
+    monkeypatch.setattr(dateExtractor.subprocess, 'run', run)
+    backend = dateExtractor.SubprocessOcrBackend('deu')
+    assert backend.tsv_from_path('poster.png', timeout=5) == TSV_HEADER + '\n'
+    assert calls == [([dateExtractor.TESSERACT_CMD, 'poster.png', 'stdout', '-l', 'deu', 'tsv'], 5)]
+
+
+def test_backend_choice_is_part_of_the_cache_key(backends, monkeypatch, tmp_path):
+    from PIL import Image
+
+    backends()
+    image = tmp_path / 'poster.png'
+    Image.new('L', (40, 20), 255).save(image)
+    monkeypatch.setattr(dateExtractor.SubprocessOcrBackend, 'tsv_from_path',
+                        lambda self, path, timeout=None: TSV5)
+    cache = OcrCache(tmp_path / 'ocr.sqlite')
+    cli = dateExtractor.DateExtractor(output_file=None, ocr_cache=cache, ocr_backend='subprocess', profile=True)
+    api = dateExtractor.DateExtractor(output_file=None, ocr_cache=cache, ocr_backend='tesserocr', profile=True)
+    assert 'SPRING' in cli.run_ocr(image).plain_text()
+    # Same image and settings, other engine: not served the CLI's cached result
+    assert api.run_ocr(image).plain_text().strip() == '2026-01-05'
+    assert api.stats.counters.get('ocr_cache_misses') == 1
+    assert cli.run_ocr(image).plain_text() == OcrResult.from_tsv(TSV5).plain_text()
+    assert cli.stats.counters.get('ocr_cache_hits') == 1
+
+# ─── scanned PDF pages ───
+
+def _scanned_pdf(tmp_path, pages):
+    """A PDF whose pages marked None have no text layer"""
+    path = tmp_path / 'scan.pdf'
+    make_pdf(path, [text or '' for text in pages])
+    return path
+
+
+@pytest.fixture
+def fake_pdf_ocr(monkeypatch):
+    """Rasterizing and OCR replaced by fakes that record what they were asked to do"""
+    calls = {'raster': [], 'digest': 0}
+    from PIL import Image
+
+    def convert_from_path(path, dpi, first_page, last_page, timeout=None):
+        calls['raster'].append((first_page, last_page))
+        return [Image.new('L', (10, 10), page) for page in range(first_page, last_page + 1)]
+
+    def ocr_pil_image(self, image):
+        page = image.getpixel((0, 0))
+        return ('level\tpage_num\tblock_num\tpar_num\tline_num\tword_num\tleft\ttop\twidth\theight\tconf\ttext\n'
+                f'5\t1\t1\t1\t1\t1\t0\t0\t10\t10\t95\t{page}/03/2026\n')
+
+    real_digest = dateExtractor._file_digest
+
+    def file_digest(path):
+        calls['digest'] += 1
+        return real_digest(path)
+
+    monkeypatch.setattr(dateExtractor._PDF2IMAGE, 'get', lambda: convert_from_path)
+    monkeypatch.setattr(dateExtractor.DateExtractor, '_ocr_pil_image', ocr_pil_image)
+    monkeypatch.setattr(dateExtractor, '_file_digest', file_digest)
+    return calls
+
+
+def _pdf_extractor(tmp_path):
+    return dateExtractor.DateExtractor(output_file=None, pdf_ocr=True, ocr_cache=OcrCache(tmp_path / 'ocr.sqlite'))
+
+
+def test_scanned_pdf_is_hashed_once_and_rasterized_in_runs(tmp_path, fake_pdf_ocr):
+    pages = [None] * 10 + ['Due 2026-01-05'] + [None] * 3
+    path = _scanned_pdf(tmp_path, pages)
+    extractor = _pdf_extractor(tmp_path)
+    dates = list(extractor._iter_pdf_pages(path, 0, len(pages)))
+    assert [page for page, _ in dates] == list(range(1, 15))
+    assert dates[10] == (11, ['2026-01-05'])
+    assert fake_pdf_ocr['digest'] == 1
+    assert fake_pdf_ocr['raster'] == [(1, 8), (9, 10), (12, 14)]
+
+
+def test_pdf_page_run_worker(tmp_path, fake_pdf_ocr):
+    pages = [None] * 6
+    path = _scanned_pdf(tmp_path, pages)
+    extractor = _pdf_extractor(tmp_path)
+    dateExtractor._worker_extractor = extractor
+    try:
+        digest = dateExtractor._file_digest(path)
+        result = dateExtractor._pdf_pages_worker((str(path), digest, 2, 6))
+    finally:
+        dateExtractor._worker_extractor = None
+        dateExtractor._worker_pdf = (None, None)
+    assert [page for page, _ in result] == [3, 4, 5, 6]
+    assert fake_pdf_ocr['digest'] == 1   # only the call above; the worker reused it
+    assert fake_pdf_ocr['raster'] == [(3, 6)]
+
+
+def test_past_deadline_stops_a_pdf(tmp_path, fake_pdf_ocr):
+    path = _scanned_pdf(tmp_path, ['Due 2026-01-05'] * 3)
+    extractor = _pdf_extractor(tmp_path)
+    extractor.deadline = time.monotonic() - 1
+    result = extractor.extract_from_pdf(path)
+    assert isinstance(result, dateExtractor.FailedExtraction) and 'deadline' in result.reason
+    extractor.deadline = time.monotonic() + 60
+    assert extractor.extract_from_pdf(path) == ['2026-01-05 (page 1)', '2026-01-05 (page 2)', '2026-01-05 (page 3)']
+
+@pytest.fixture
+def read_pages(monkeypatch):
+    """Count the pages whose text layer gets extracted"""
+    import PyPDF2
+
+    calls = []
+    real = PyPDF2.PageObject.extract_text
+
+    def extract_text(page, *args, **kwargs):
+        text = real(page, *args, **kwargs)
+        calls.append(text)
+        return text
+
+    monkeypatch.setattr(PyPDF2.PageObject, 'extract_text', extract_text)
+    return calls
+
+
+def test_pdf_pages_after_max_pages_are_not_read(tmp_path, extractor, read_pages):
+    path = tmp_path / 'doc.pdf'
+    make_pdf(path, [f'Session on {i + 1} March 2026' for i in range(10)])
+    dates = extractor.extract_from_pdf(path, max_pages=3)
+    assert dates == [f'2026-03-0{i} (page {i})' for i in (1, 2, 3)]
+    assert len(read_pages) == 3
+
+
+def test_pdf_stops_reading_after_enough_dates(tmp_path, extractor, read_pages):
+    path = tmp_path / 'doc.pdf'
+    make_pdf(path, ['Cover page', 'Due 2026-01-05 and 2026-01-06', 'Due 2026-02-01'] + ['Due 2026-03-01'] * 7)
+    pages = extractor.iter_pdf_dates(path, stop_after_n_dates=1)
+    assert next(pages) == (2, '2026-01-05')
+    assert len(read_pages) == 2   # lazy: nothing past the page that had the date
+    assert list(pages) == []
+    assert len(read_pages) == 2
+    assert extractor.extract_from_pdf(path, stop_after_n_dates=3) == [
+        '2026-01-05 (page 2)', '2026-01-06 (page 2)', '2026-02-01 (page 3)']
+    assert len(read_pages) == 2 + 3
+
+def test_parallel_pdf_pages_match_sequential(tmp_path):
+    pages = [f"Session {i} on {i % 28 + 1} March 2026" if i % 3 else '' for i in range(40)]
+    path = tmp_path / 'doc.pdf'
+    make_pdf(path, pages)
+    extractor = dateExtractor.DateExtractor(output_file=None)
+    sequential = list(extractor.iter_pdf_dates(path))
+    assert sequential and list(extractor.iter_pdf_dates(path, jobs=3)) == sequential
+
+
+# ─── many files ───
+
+def _mixed_folder(tmp_path):
+    files = []
+    for i in range(6):
+        path = tmp_path / f'notes{i}.txt'
+        path.write_text(f'Meeting on {i + 1} March 2026 and 2026-04-{i + 10:02d}\n')
+        files.append(path)
+    make_pdf(tmp_path / 'agenda.pdf', ['Opening 5 May 2026', 'Closing 2026-05-09'])
+    (tmp_path / 'broken.pdf').write_bytes(b'%PDF-1.4\nnot really a pdf\n')
+    (tmp_path / 'empty.txt').write_text('no dates in here\n')
+    return files[:3] + [tmp_path / 'agenda.pdf', tmp_path / 'broken.pdf', tmp_path / 'empty.txt'] + files[3:]
+
+
+def test_parallel_files_match_sequential_in_order(tmp_path):
+    files = _mixed_folder(tmp_path)
+    results = {}
+    for jobs in (1, 2):
+        extractor = dateExtractor.DateExtractor(output_file=None)
+        extracted = list(extractor._iter_extracted(files, jobs=jobs, max_in_flight=3))
+        assert [path for path, _ in extracted] == files
+        broken = dict(extracted)[tmp_path / 'broken.pdf']
+        assert isinstance(broken, dateExtractor.FailedExtraction) and broken.reason
+
+        extractor = dateExtractor.DateExtractor(output_file=None)
+        extractor.process_files(files, jobs=jobs, max_in_flight=3)
+        results[jobs] = extractor.extracted_dates
+    assert results[2] == results[1]
+    assert [entry['file'] for entry in results[1]] == [str(path) for path in files
+                                                       if path.name not in ('broken.pdf', 'empty.txt')]
+
+
+def test_bounded_map_keeps_order_and_limit():
+    from concurrent.futures import ThreadPoolExecutor
+
+    submitted = []
+
+    def items():
+        for i in range(20):
+            submitted.append(i)
+            yield i
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        results = []
+        for result in dateExtractor._bounded_map(pool, lambda x: x * x, items(), 3):
+            assert len(submitted) - len(results) <= 3
+            results.append(result)
+    assert results == [i * i for i in range(20)]
@@ -0,0 +1,96 @@
+import os
+
+import pytest
+
+import dateExtractor
+from dateExtractor import DateExtractor, FailedExtraction
+from fileManifest import FileManifest
+
+SETTINGS = '{}'
+
+
+@pytest.fixture
+def manifest(tmp_path):
+    manifest = FileManifest(tmp_path / 'manifest.sqlite')
+    yield manifest
+    manifest.close()
+
+
+def test_unchanged_touched_and_moved_files_are_reused(tmp_path, manifest):
+    path = tmp_path / 'a.txt'
+    path.write_text('Due 2024-03-01')
+    fingerprint, reused, _ = manifest.lookup(path, SETTINGS)
+    assert not reused
+    manifest.record(path, fingerprint, ['2024-03-01'], SETTINGS)
+
+    assert manifest.lookup(path, SETTINGS)[1:] == (True, ['2024-03-01'])
+
+    os.utime(path, ns=(0, 12345))   # touched, same content
+    assert manifest.lookup(path, SETTINGS)[1:] == (True, ['2024-03-01'])
+
+    copy = tmp_path / 'b.txt'
+    copy.write_text('Due 2024-03-01')
+    assert manifest.lookup(copy, SETTINGS)[1:] == (True, ['2024-03-01'])
+    assert manifest.moved == 1
+
+    assert not manifest.lookup(path, '{"other": 1}')[1]
+
+
+def test_modified_and_deleted(tmp_path, manifest):
+    path = tmp_path / 'a.txt'
+    path.write_text('Due 2024-03-01')
+    manifest.record(path, manifest.lookup(path, SETTINGS)[0], ['2024-03-01'], SETTINGS)
+    path.write_text('Due 2024-03-02 now')
+    assert not manifest.lookup(path, SETTINGS)[1]
+    assert manifest.modified == 1
+    path.unlink()
+    assert manifest.mark_deleted(tmp_path, []) == [str(path)]
+
+
+def test_skipped_files_are_not_deleted(tmp_path, manifest):
+    # A file the filter rules out this time (--exclude, --max-size, ...) is not seen, but still exists
+    path = tmp_path / 'a.txt'
+    path.write_text('Due 2024-03-01')
+    manifest.record(path, manifest.lookup(path, SETTINGS)[0], ['2024-03-01'], SETTINGS)
+    assert manifest.mark_deleted(tmp_path, []) == []
+    assert manifest.deleted == 0
+
+
+def test_failed_extraction_is_retried_next_run(tmp_path, manifest, monkeypatch):
+    path = tmp_path / 'notes.txt'
+    path.write_text('Due 2024-03-01')
+    real = DateExtractor.extract_from_text_file
+    monkeypatch.setattr(DateExtractor, 'extract_from_text_file',
+                        lambda self, p: FailedExtraction(reason='disk error'))
+
+    extractor = DateExtractor(output_file=None)
+    extractor.process_files([path], manifest=manifest)
+    assert extractor.extracted_dates == []
+    assert manifest.failed == 1
+
+    monkeypatch.setattr(DateExtractor, 'extract_from_text_file', real)
+    extractor = DateExtractor(output_file=None)
+    extractor.process_files([path], manifest=manifest)
+    assert extractor.extracted_dates[0]['dates'] == ['2024-03-01']
+
+    # A file that really has no dates is recorded and reused
+    empty = tmp_path / 'empty.txt'
+    empty.write_text('nothing to see')
+    DateExtractor(output_file=None).process_files([empty], manifest=manifest)
+    assert manifest.lookup(empty, DateExtractor(output_file=None).extraction_settings())[1]
+
+
+def test_failures_are_reported_apart_from_no_dates(tmp_path, monkeypatch):
+    extractor = DateExtractor(output_file=None)
+    assert type(extractor.extract_file(tmp_path / 'missing.txt')) is FailedExtraction
+
+    image = tmp_path / 'poster.png'
+    image.write_bytes(b'\x89PNG\r\n\x1a\n' + b'\0' * 64)
+    monkeypatch.setattr(dateExtractor, 'TESSERACT_CMD', str(tmp_path / 'no-tesseract'))
+    monkeypatch.setattr(dateExtractor, '_ocr_backends', {})
+    extractor.ocr_backend = 'subprocess'
+    assert type(extractor.extract_file(image)) is FailedExtraction
+
+    text = tmp_path / 'plain.txt'
+    text.write_text('no dates here')
+    assert type(extractor.extract_file(text)) is list
@@ -0,0 +1,86 @@
+import pytest
+
+from fileTypes import EMAIL, IMAGE, PDF, TEXT, FileFilter, parse_size, sniff
+
+MAIL = b'From: a@example.com\nTo: team@example.com\nSubject: hi\n\nbody\n'
+
+
+@pytest.mark.parametrize('header, extension, kind', [
+    (b'\xff\xd8\xff\xe0 jpeg', '.txt', IMAGE),
+    (b'\x89PNG\r\n\x1a\n....', '', IMAGE),
+    (b'BM' + b'\0' * 12 + (40).to_bytes(4, 'little'), '.bmp', IMAGE),
+    (b'BMW service notes 2024-03-01', '.txt', TEXT),
+    (b'%PDF-1.4\n', '.dat', PDF),
+    (b'PK\x03\x04rest', '.docx', None),
+    (b'SQLite format 3\x00', '.db', None),
+    (b'\x00\x01\x02binary', '.txt', None),
+    (MAIL, '', EMAIL),
+    (MAIL, '.log', EMAIL),
+    (b'plain text body', '.eml', EMAIL),
+    (b'Meeting on 2024-03-01\n', '', TEXT),
+    ('café 2024-03-01'.encode('latin-1'), '.txt', TEXT),
+])
+def test_sniff(header, extension, kind):
+    assert sniff(header, extension)[0] == kind
+
+
+@pytest.mark.parametrize('extension', ['.txt', '.text', '.md'])
+def test_text_files_starting_with_headers_stay_text(extension):
+    header = b'Date: 12 March 2026\nTo: team\n\nReview on 2026-03-14\n'
+    assert sniff(header, extension)[0] == TEXT
+
+
+def test_notes_txt_dates(tmp_path, extractor):
+    path = tmp_path / 'notes.txt'
+    text = 'Date: 12 March 2026\nTo: team\n\nReview on 2026-03-14\n'
+    path.write_text(text)
+    dates = extractor.extract_file(path)
+    assert sorted(dates) == ['2026-03-12', '2026-03-14']
+    assert dates == extractor.extract_dates_from_text(text)
+
+
+def test_parse_size():
+    assert parse_size('500k') == 500 * 1024
+    assert parse_size('2M') == 2 * 1024 ** 2
+    assert parse_size('1GB') == 1024 ** 3
+    assert parse_size(123) == 123
+
+
+def test_filter_walk(tmp_path):
+    (tmp_path / 'node_modules').mkdir()
+    (tmp_path / 'node_modules' / 'a.txt').write_text('2024-03-01')
+    (tmp_path / 'docs').mkdir()
+    (tmp_path / 'docs' / 'b.txt').write_text('2024-03-01')
+    (tmp_path / 'docs' / 'big.txt').write_text('x' * 2000)
+    (tmp_path / 'docs' / 'empty.txt').write_text('')
+    (tmp_path / 'docs' / 'c.zip').write_bytes(b'PK\x03\x04' + b'\0' * 20)
+    (tmp_path / 'skip.log').write_text('2024-03-01')
+
+    file_filter = FileFilter(exclude=['node_modules', '*.log'], max_size=1000)
+    assert [p.relative_to(tmp_path).as_posix() for p in file_filter.walk(tmp_path)] == ['docs/b.txt']
+    assert file_filter.skipped == {'excluded': 1, 'too large': 1, 'empty': 1, 'zip archive': 1}
+
+    file_filter = FileFilter(include=['docs/*.txt'])
+    assert [p.name for p in file_filter.walk(tmp_path)] == ['b.txt', 'big.txt']
+
+
+@pytest.mark.parametrize('jobs', [1, 2])
+def test_accepted_files_are_sniffed_once(tmp_path, monkeypatch, jobs):
+    import dateExtractor
+    import fileTypes
+
+    for i in range(3):
+        (tmp_path / f'{i}.txt').write_text(f'Due 2024-03-0{i + 1}')
+    calls = []
+    real = fileTypes.sniff_file
+
+    def counting_sniff(path):
+        calls.append(path)
+        return real(path)
+
+    monkeypatch.setattr(fileTypes, 'sniff_file', counting_sniff)
+    monkeypatch.setattr(dateExtractor, 'sniff_file', counting_sniff)
+    extractor = dateExtractor.DateExtractor(output_file=None)
+    extractor.process_directory(tmp_path, jobs=jobs)
+    assert len(calls) == 3
+    assert [e['dates'] for e in extractor.extracted_dates] == [['2024-03-01'], ['2024-03-02'], ['2024-03-03']]
@@ -0,0 +1,64 @@
+import pytest
+
+from instrumentation import NULL_STATS, Stats
+
+
+def _stats(ocr_seconds, ocr_calls, matches):
+    stats = Stats()
+    for _ in range(ocr_calls):
+        stats.add_time('ocr', ocr_seconds / ocr_calls)
+    stats.count('regex_matches', matches)
+    stats.count('ocr_calls', ocr_calls)
+    return stats
+
+
+def test_timer_adds_to_its_stage():
+    stats = Stats()
+    with stats.time('regex_scan'):
+        pass
+    with stats.time('regex_scan'):
+        pass
+    assert stats.calls == {'regex_scan': 2}
+    assert stats.seconds['regex_scan'] >= 0.0
+
+
+def test_merge_adds_timings_and_counters():
+    total = Stats()
+    total.merge(_stats(0.5, 2, 3))
+    total.merge(_stats(0.25, 1, 4).as_dict())   # pool workers send a dict
+    assert total.seconds == {'ocr': pytest.approx(0.75)}
+    assert total.calls == {'ocr': 3}
+    assert total.counters == {'regex_matches': 7, 'ocr_calls': 3}
+    assert Stats.from_dict(total.as_dict()).as_dict() == total.as_dict()
+
+
+def test_null_stats_records_nothing():
+    with NULL_STATS.time('ocr'):
+        NULL_STATS.count('ocr_calls')
+    NULL_STATS.merge(_stats(1.0, 1, 1))
+    assert not NULL_STATS.enabled and not hasattr(NULL_STATS, 'counters')
+
+
+def test_prometheus_export():
+    stats = _stats(0.5, 2, 3)
+    text = stats.to_prometheus()
+    lines = text.splitlines()
+    assert '# TYPE timely_stage_seconds_total counter' in lines
+    assert 'timely_stage_seconds_total{stage="ocr"} 0.500000' in lines
+    assert 'timely_stage_calls_total{stage="ocr"} 2' in lines
+    assert 'timely_events_total{event="regex_matches"} 3' in lines
+    assert 'timely_events_total{event="ocr_calls"} 2' in lines
+    assert text.endswith('\n')
+    assert 'bot_stage_calls_total{stage="ocr"} 2' in stats.to_prometheus(prefix='bot')
+
+
+def test_profiled_extraction_counts_its_stages(tmp_path):
+    from dateExtractor import DateExtractor
+
+    path = tmp_path / 'notes.txt'
+    path.write_text('Due 2026-01-05, then 7 March 2026\n')
+    extractor = DateExtractor(output_file=None, profile=True)
+    extractor.process_files([path, path])
+    assert extractor.stats.calls['total'] == 2
+    assert extractor.stats.counters['dates_found'] == 4
+    assert sum(file_stats.counters['dates_found'] for _, file_stats in extractor.file_stats) == 4
@@ -0,0 +1,45 @@
+from ocrCache import OcrCache
+
+
+def test_make_key_depends_on_data_version_and_config():
+    key = OcrCache.make_key(b'image', '5.3.0', 'eng')
+    assert key == OcrCache.make_key(b'image', '5.3.0', 'eng')
+    assert key != OcrCache.make_key(b'other', '5.3.0', 'eng')
+    assert key != OcrCache.make_key(b'image', '4.1.1', 'eng')
+    assert key != OcrCache.make_key(b'image', '5.3.0', 'deu')
+
+
+def test_hits_survive_reopening(tmp_path):
+    path = tmp_path / 'cache.sqlite'
+    cache = OcrCache(path)
+    assert cache.get('k') is None
+    cache.put('k', 'tsv text')
+    assert cache.get('k') == 'tsv text'
+    cache.close()
+
+    cache = OcrCache(path)
+    assert cache.get('k') == 'tsv text'
+    assert cache.stats()['hits_disk'] == 1
+    cache.close()
+
+
+def test_disk_tier_evicts_least_recently_used(tmp_path):
+    cache = OcrCache(tmp_path / 'cache.sqlite', memory_items=1, max_disk_bytes=10)
+    cache.put('a', 'aaaa')
+    cache.put('b', 'bbbb')
+    cache.get('a')          # a is now more recent than b
+    cache.put('c', 'cccc')  # 12 bytes > 10: b goes
+    assert cache.evictions == 1
+    cache._memory.clear()
+    assert cache.get('b') is None
+    assert cache.get('a') == 'aaaa'
+    assert cache.get('c') == 'cccc'
+    cache.close()
+
+
+def test_memory_only():
+    cache = OcrCache(None, memory_items=2)
+    for key in 'abc':
+        cache.put(key, key)
+    assert cache.get('a') is None
+    assert cache.get('c') == 'c'
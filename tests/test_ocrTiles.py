@@ -0,0 +1,49 @@
+import random
+
+from ocrTiles import TILE_MIN_HEIGHT, TILE_MIN_OVERLAP, merge_tiles, plan_tiles
+
+
+def test_small_image_is_one_band():
+    assert plan_tiles(TILE_MIN_HEIGHT * 2 - 1, 8) == [(0, TILE_MIN_HEIGHT * 2 - 1, 0, TILE_MIN_HEIGHT * 2 - 1)]
+
+
+def test_bands_cover_the_page_and_keep_areas_tile_it():
+    height = 5000
+    bands = plan_tiles(height, 4)
+    assert len(bands) == 4
+    assert bands[0][0] == 0 and bands[-1][1] == height
+    assert bands[0][2] == 0 and bands[-1][3] == height
+    for (_, bottom, _, keep_to), (top, _, keep_from, _) in zip(bands, bands[1:]):
+        assert keep_to == keep_from
+        assert top < keep_from < bottom
+
+
+def _word(text, top, height, key):
+    return {'text': text, 'left': 0, 'top': top, 'width': 10, 'height': height, 'conf': 90.0, 'key': key}
+
+
+def test_merge_keeps_every_line_exactly_once():
+    rng = random.Random(7)
+    height = 4000
+    lines = sorted(rng.sample(range(0, height - 60), 80))
+    bands = plan_tiles(height, 4)
+    tiles = []
+    for band in bands:
+        top, bottom = band[0], band[1]
+        words = [_word(f"line{y}", y - top, 40, (1, 1, i))
+                 for i, y in enumerate(lines) if y >= top and y + 40 <= bottom]
+        tiles.append((band, words))
+    merged = merge_tiles(tiles)
+    assert sorted(w['text'] for w in merged) == sorted(f"line{y}" for y in lines)
+    assert sorted(w['top'] for w in merged) == lines
+
+
+def test_tall_line_at_a_seam_is_whole_in_its_band():
+    # Every band reaches at least TILE_MIN_OVERLAP pixels past both ends of its share
+    height = TILE_MIN_HEIGHT * 4
+    bands = plan_tiles(height, 4)
+    for top, bottom, keep_from, keep_to in bands:
+        for centre in (keep_from, keep_to - 1):
+            line_top, line_bottom = centre - TILE_MIN_OVERLAP, centre + TILE_MIN_OVERLAP
+            if 0 <= line_top and line_bottom <= height:
+                assert top <= line_top and line_bottom <= bottom
@@ -0,0 +1,39 @@
+import time
+
+from resultCache import ResultCache
+
+RESULT = {'event_name': 'Fair', 'dates': ['2026-03-12']}
+
+
+def test_hit_counts_savings_and_survives_restart(tmp_path):
+    path = tmp_path / 'results.sqlite'
+    cache = ResultCache(path, settings='s')
+    assert cache.get('u1') is None
+    cache.put('u1', RESULT, file_size=2048, extract_seconds=1.5)
+    cache.close()
+
+    cache = ResultCache(path, settings='s')
+    assert cache.get('u1') == RESULT
+    assert cache.stats()['bytes_saved'] == 2048
+    assert cache.stats()['seconds_saved'] == 1.5
+    cache.close()
+
+
+def test_other_settings_miss(tmp_path):
+    path = tmp_path / 'results.sqlite'
+    ResultCache(path, settings='a').put('u1', RESULT)
+    assert ResultCache(path, settings='b').get('u1') is None
+
+
+def test_ttl_and_size_bound():
+    cache = ResultCache(':memory:', ttl=None, max_entries=2)
+    for key in ('a', 'b', 'c'):
+        cache.put(key, RESULT)
+        time.sleep(0.001)
+    assert len(cache) == 2 and cache.evictions == 1
+    assert cache.get('a') is None
+
+    cache.ttl = 0
+    time.sleep(0.001)
+    assert cache.get('c') is None
+    assert cache.expired == 1
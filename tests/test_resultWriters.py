@@ -0,0 +1,83 @@
+import csv
+import json
+
+import pytest
+
+from resultWriters import CsvWriter, IcsWriter, JsonlWriter, TextReportWriter, make_writer, parse_date
+
+EML = (
+    "From: events@example.com\n"
+    "To: team@example.com\n"
+    "Date: Thu, 12 Mar 2026 18:30:00 -0500\n"
+    "Subject: Fair moved to 2026-04-02\n"
+    "Content-Type: text/plain; charset=utf-8\n"
+    "\n"
+    "The fair now runs on 14 March 2026.\n"
+)
+
+
+@pytest.fixture
+def email_entry(tmp_path, extractor):
+    path = tmp_path / 'invite.eml'
+    path.write_text(EML, encoding='utf-8')
+    extractor.process_file(path)
+    [entry] = extractor.extracted_dates
+    return entry
+
+
+def test_parse_date():
+    assert parse_date('2024-01-15') == ('2024-01-15', None, None)
+    assert parse_date('2024-01-15 (page 3)') == ('2024-01-15', 3, None)
+    assert parse_date('Subject: 2024-01-15') == ('2024-01-15', None, 'email subject')
+    assert parse_date('Body: 2024-01-15') == ('2024-01-15', None, 'email body')
+    assert parse_date('Email Date: Thu, 12 Mar 2026 18:30:00 -0500') == ('2026-03-12', None, 'email date header')
+    assert parse_date('Email Date: not a date') == ('not a date', None, 'email date header')
+
+
+def test_csv_splits_email_labels(tmp_path, email_entry):
+    with CsvWriter(tmp_path / 'out.csv') as writer:
+        writer.write(email_entry)
+    with open(tmp_path / 'out.csv', newline='', encoding='utf-8') as f:
+        rows = list(csv.DictReader(f))
+    assert [(r['date'], r['source']) for r in rows] == [
+        ('2026-03-12', 'email date header'),
+        ('2026-04-02', 'email subject'),
+        ('2026-03-14', 'email body'),
+    ]
+
+
+def test_ics_keeps_email_dates(tmp_path, email_entry):
+    with IcsWriter(tmp_path / 'out.ics') as writer:
+        writer.write(email_entry)
+    assert writer.skipped == 0
+    text = (tmp_path / 'out.ics').read_bytes().decode('utf-8')
+    starts = [line.split(':')[1] for line in text.split('\r\n') if line.startswith('DTSTART')]
+    assert starts == ['20260312', '20260402', '20260314']
+    assert 'email subject' in text
+
+
+def test_ics_pages_and_unparsed_dates(tmp_path):
+    entry = {'file': 'scan.pdf', 'event_name': 'Budget; review', 'dates': ['2024-01-15 (page 3)', 'sometime']}
+    with IcsWriter(tmp_path / 'out.ics') as writer:
+        writer.write(entry)
+    text = (tmp_path / 'out.ics').read_bytes().decode('utf-8')
+    assert writer.skipped == 1
+    assert 'DTSTART;VALUE=DATE:20240115' in text
+    assert r'SUMMARY:Budget\; review' in text
+    assert 'page 3' in text
+    assert all(len(line.encode('utf-8')) <= 75 for line in text.split('\r\n'))
+
+
+def test_jsonl_and_text(tmp_path):
+    entry = {'file': 'a.txt', 'event_name': 'a', 'dates': ['2024-01-15']}
+    with JsonlWriter(tmp_path / 'out.jsonl') as writer:
+        writer.write(entry)
+    assert json.loads((tmp_path / 'out.jsonl').read_text(encoding='utf-8')) == entry
+    with TextReportWriter(tmp_path / 'out.txt') as writer:
+        writer.write(entry)
+    assert '  • 2024-01-15' in (tmp_path / 'out.txt').read_text(encoding='utf-8')
+
+
+def test_unknown_format(tmp_path):
+    with pytest.raises(ValueError):
+        make_writer('xml', tmp_path / 'out.xml')
@@ -0,0 +1,48 @@
+import json
+
+from savedDates import SavedDatesStore
+
+
+def _legacy_json(tmp_path):
+    path = tmp_path / 'saved_dates.json'
+    path.write_text(json.dumps([{'event_name': 'Old', 'date': '2025-12-01', 'saved_at': '2025-11-01T10:00:00'},
+                                {'event_name': 'Old', 'date': '2025-12-02'}]), encoding='utf-8')
+    return str(path)
+
+
+def test_dates_are_paged_per_user(tmp_path):
+    store = SavedDatesStore(tmp_path / 'saved.sqlite', legacy_json=None)
+    store.add_many(1, 'Fair', [f'2026-03-{day:02d}' for day in range(1, 6)])
+    store.add(2, 'Other', '2026-04-01')
+    assert store.count(1) == 5 and store.count(2) == 1
+    assert [item['date'] for item in store.page(1, page=2, page_size=2)] == ['2026-03-03', '2026-03-04']
+    assert [(item['event_name'], item['date']) for item in store.page(2)] == [('Other', '2026-04-01')]
+
+
+def test_clear_only_deletes_the_users_own_dates(tmp_path):
+    store = SavedDatesStore(tmp_path / 'saved.sqlite', legacy_json=_legacy_json(tmp_path))
+    store.add(1, 'Fair', '2026-03-01')
+    store.add(2, 'Other', '2026-04-01')
+    store.clear(1)
+    assert store.count(1) == 0 and store.count(2) == 1
+    store.close()
+    # The unassigned legacy dates survived and still go to their owner
+    store = SavedDatesStore(tmp_path / 'saved.sqlite', legacy_json=None, legacy_user_id=3)
+    assert store.count(3) == 2
+
+
+def test_legacy_dates_go_to_their_owner_once(tmp_path):
+    legacy = _legacy_json(tmp_path)
+    store = SavedDatesStore(tmp_path / 'saved.sqlite', legacy_json=legacy, legacy_user_id=7)
+    assert [(item['date'], item['saved_at']) for item in store.page(7)][0] == ('2025-12-01', '2025-11-01T10:00:00')
+    assert store.count(7) == 2 and store.count(8) == 0
+    assert not (tmp_path / 'saved_dates.json').exists() and (tmp_path / 'saved_dates.json.imported').exists()
+    store.close()
+
+    store = SavedDatesStore(tmp_path / 'saved.sqlite', legacy_json=legacy, legacy_user_id=7)
+    assert store.count(7) == 2
+
+
+def test_legacy_dates_without_an_owner_are_hidden(tmp_path):
+    store = SavedDatesStore(tmp_path / 'saved.sqlite', legacy_json=_legacy_json(tmp_path))
+    assert store.count(1) == 0 and store.page(1) == []
@@ -0,0 +1,87 @@
+import asyncio
+import json
+
+import pytest
+
+from dateExtractor import DateExtractor, FailedExtraction
+from service import ExtractionService, make_handler
+
+
+def request(svc, raw):
+    """Send one raw HTTP request to the service's handler; (status, headers, JSON body)"""
+    async def run():
+        server = await asyncio.start_server(make_handler(svc), '127.0.0.1', 0)
+        async with server:
+            port = server.sockets[0].getsockname()[1]
+            reader, writer = await asyncio.open_connection('127.0.0.1', port)
+            writer.write(raw)
+            await writer.drain()
+            response = await reader.read()
+            writer.close()
+            return response
+
+    head, _, body = asyncio.run(run()).partition(b'\r\n\r\n')
+    lines = head.decode('latin-1').split('\r\n')
+    headers = dict(line.split(': ', 1) for line in lines[1:])
+    return int(lines[0].split()[1]), headers, json.loads(body)
+
+
+def post(path, body=b''):
+    return f"POST {path} HTTP/1.1\r\nContent-Length: {len(body)}\r\n\r\n".encode() + body
+
+
+@pytest.fixture
+def svc():
+    s = ExtractionService(workers=1, queue_limit=2)
+    yield s
+    s.close()
+
+
+def test_job_returns_dates(svc):
+    status, _, payload = request(svc, post('/jobs?filename=notes.txt&wait=10', b'Due 2026-01-05'))
+    assert status == 200
+    assert payload['filename'] == 'notes.txt' and payload['dates'] == ['2026-01-05']
+
+
+@pytest.mark.parametrize('filename', ['..', '.', 'a/..', '/'])
+def test_upload_name_that_is_not_a_file_is_rejected(svc, filename):
+    status, _, payload = request(svc, post(f'/jobs?filename={filename}', b'x'))
+    assert status == 400 and 'not a file name' in payload['error']
+
+
+def test_upload_name_keeps_only_its_last_part(svc):
+    status, _, payload = request(svc, post('/jobs?filename=../../etc/notes.txt&wait=10', b'x'))
+    assert status == 200 and payload['filename'] == 'notes.txt'
+
+
+def test_text_is_refused_when_the_queue_is_full(svc):
+    svc.pending = svc.queue_limit
+    status, headers, _ = request(svc, post('/text', b'Due 2026-01-05'))
+    assert status == 503 and headers['Retry-After'] == '5'
+    svc.pending = 0
+    status, _, payload = request(svc, post('/text', b'Due 2026-01-05'))
+    assert status == 200 and payload == {'dates': ['2026-01-05']}
+    assert svc.pending == 0
+
+
+def test_unexpected_error_gets_a_500(svc, monkeypatch):
+    def broken():
+        raise RuntimeError("boom")
+
+    monkeypatch.setattr(svc, 'snapshot', broken)
+    status, _, payload = request(svc, b"GET /stats HTTP/1.1\r\n\r\n")
+    assert status == 500 and payload == {'error': 'boom'}
+
+
+def test_job_queue_full_gets_retry_after(svc):
+    svc.pending = svc.queue_limit
+    status, headers, _ = request(svc, post('/jobs?filename=notes.txt', b'x'))
+    assert status == 503 and headers['Retry-After'] == '5'
+
+
+def test_failed_extraction_is_a_failed_job(svc, monkeypatch):
+    monkeypatch.setattr(DateExtractor, 'extract_from_text_file', lambda self, path: FailedExtraction(reason='disk error'))
+    status, _, payload = request(svc, post('/jobs?filename=notes.txt&wait=10', b'Due 2026-01-05'))
+    assert status == 200
+    assert payload['status'] == 'failed' and payload['error'] == 'disk error'
+    assert 'dates' not in payload